@@ -1,13 +1,14 @@
 import streamlit as st
-from auth.auth_utils import init_db
 from components.login_page import show_login_page
+from core.profiler import begin_run
+from core.bootstrap import setup_process
+from components.theme_toggle import render_theme_toggle
 
 st.set_page_config(page_title="TalkHeal", page_icon="💬", layout="wide")
+begin_run("TalkHeal")
 
-# --- DB Initialization ---
-if "db_initialized" not in st.session_state:
-    init_db()
-    st.session_state["db_initialized"] = True
+# --- DB Initialization and Asset Cache Warm-up (once per process) ---
+setup_process()
 
 # --- Auth State Initialization ---
 if "authenticated" not in st.session_state:
@@ -26,11 +27,8 @@ if st.session_state.get("authenticated", False):
     with col_spacer:
         pass  # empty spacer to push buttons right
     with col_theme:
-        is_dark = st.session_state.get('dark_mode', False)
-        if st.button("🌙" if is_dark else "☀️", key="top_theme_toggle", help="Toggle Light/Dark Mode", use_container_width=True):
-            st.session_state.dark_mode = not is_dark
-            st.session_state.theme_changed = True
-            st.rerun()
+        # Switches theme in the browser; no rerun
+        render_theme_toggle()
     with col_logout:
         if st.button("Logout", key="logout_btn", use_container_width=True):
             for key in ["authenticated", "user_email", "user_name", "show_signup"]:
@@ -44,24 +42,17 @@ with header_col1:
     st.title(f"Welcome to TalkHeal, {st.session_state.user_name}! 💬")
     st.markdown("Navigate to other pages from the sidebar.")
 
-import google.generativeai as genai
+# Heavy, view-specific modules (Gemini SDK, pandas/plotly, pygame, geopy) are
+# imported where their view is rendered, not here; see test_import_time.py
 from core.utils import save_conversations, load_conversations
-from core.config import configure_gemini, PAGE_CONFIG
+from core.config import configure_gemini, get_tone_system_prompt, TONE_OPTIONS, DEFAULT_TONE
 from core.utils import get_current_time, create_new_conversation
+from core.titles import start_title_worker
 from css.styles import apply_custom_css
 from components.header import render_header
 from components.sidebar import render_sidebar
-from components.chat_interface import render_chat_interface, handle_chat_input
-
-from components.mood_dashboard import render_mood_dashboard
-# from components.emergency_page import render_emergency_page
-from components.focus_session import render_focus_session
-# from components.emergency_page import render_emergency_page
-from components.mood_dashboard import render_mood_dashboard
-from components.focus_session import render_focus_session
-
-from components.emergency_page import render_emergency_page
-from components.profile import apply_global_font_size
+from components.chat_interface import render_chat_view
+from components.profiler_panel import render_profiler_panel
 
 # --- 1. INITIALIZE SESSION STATE ---
 if "chat_history" not in st.session_state:
@@ -86,41 +77,52 @@ if "mental_disorders" not in st.session_state:
         "Sleep Disorders"
     ]
 if "selected_tone" not in st.session_state:
-    st.session_state.selected_tone = "Compassionate Listener"
-
-# --- 2. SET PAGE CONFIG ---
-apply_global_font_size()
+    st.session_state.selected_tone = DEFAULT_TONE
 
-# --- 3. APPLY STYLES & CONFIGURATIONS ---
+# --- 2. APPLY STYLES & CONFIGURATIONS ---
 apply_custom_css()
-model = configure_gemini()
 
-# --- 4. TONE SELECTION DROPDOWN IN SIDEBAR ---
-TONE_OPTIONS = {
-    "Compassionate Listener": "You are a compassionate listener — soft, empathetic, patient — like a therapist who listens without judgment.",
-    "Motivating Coach": "You are a motivating coach — energetic, encouraging, and action-focused — helping the user push through rough days.",
-    "Wise Friend": "You are a wise friend — thoughtful, poetic, and reflective — giving soulful responses and timeless advice.",
-    "Neutral Therapist": "You are a neutral therapist — balanced, logical, and non-intrusive — asking guiding questions using CBT techniques.",
-    "Mindfulness Guide": "You are a mindfulness guide — calm, slow, and grounding — focused on breathing, presence, and awareness."
-}
+@st.cache_resource
+def start_background_titles(_model):
+    # Once per server process: titles conversations in batches off the request path
+    return start_title_worker(_model)
 
+def get_model():
+    # Gemini is configured when the first message is sent: importing the SDK alone takes seconds
+    if st.session_state.get("gemini_model") is None:
+        st.session_state.gemini_model = configure_gemini()
+        if st.session_state.gemini_model:
+            start_background_titles(st.session_state.gemini_model)
+    return st.session_state.gemini_model
+
+# --- 3. TONE SELECTION DROPDOWN IN SIDEBAR ---
 with st.sidebar:
+    st.markdown("""
+        <style>
+            div[data-baseweb="select"] {
+                box-shadow: 0 4px 8px rgba(0, 0, 0, 0.15);
+                border-radius: 8px;
+            }
+        </style>
+    """, unsafe_allow_html=True)
     st.header("🧠 Choose Your AI Tone")
+    tone_names = list(TONE_OPTIONS.keys())
     selected_tone = st.selectbox(
         "Select a personality tone:",
-        options=list(TONE_OPTIONS.keys()),
-        index=0
+        options=tone_names,
+        index=tone_names.index(st.session_state.get("selected_tone", DEFAULT_TONE)),
+        key="tone_selector"
     )
     st.session_state.selected_tone = selected_tone
 
-# --- 5. DEFINE FUNCTION TO GET TONE PROMPT ---
+# --- 4. DEFINE FUNCTION TO GET TONE PROMPT ---
 def get_tone_prompt():
-    return TONE_OPTIONS.get(st.session_state.get("selected_tone", "Compassionate Listener"), TONE_OPTIONS["Compassionate Listener"])
+    return get_tone_system_prompt(st.session_state.get("selected_tone"))
 
-# --- 6. RENDER SIDEBAR ---
+# --- 5. RENDER SIDEBAR ---
 render_sidebar()
 
-# --- 7. PAGE ROUTING ---
+# --- 6. PAGE ROUTING ---
 main_area = st.container()
 
 if not st.session_state.conversations:
@@ -134,16 +136,18 @@ if not st.session_state.conversations:
         st.session_state.active_conversation = 0
     st.rerun()
 
-# --- 8. RENDER PAGE ---
+# --- 7. RENDER PAGE ---
 # if st.session_state.get("show_emergency_page"):
 #     with main_area:
 #         render_emergency_page()
 # else:
 if st.session_state.get("show_focus_session"):
     with main_area:
+        from components.focus_session import render_focus_session
         render_focus_session()
 elif st.session_state.get("show_mood_dashboard"):
     with main_area:
+        from components.mood_dashboard import render_mood_dashboard
         render_mood_dashboard()
 else:
     with main_area:
@@ -209,27 +213,32 @@ else:
             mood_value = st.components.v1.html(slider_html, height=100)
             return mood_value
 
-        # --- Mood Slider ---
-        st.subheader("😊 Track Your Mood")
-        mood_options = ['Very Sad', 'Sad', 'Neutral', 'Happy', 'Very Happy']
-        mood = st.slider(
-            'Select your mood',
-            min_value=1, max_value=5, value=3, step=1
-)
-        coping_tips = {
-    1: "It’s okay to feel this way. Try some deep breathing exercises to find calm.",
-    2: "Consider writing down your thoughts in the journal to process your feelings.",
-    3: "A short walk or some light stretching might help you feel balanced.",
-    4: "Great to hear you’re feeling happy! Share something positive in your journal.",
-    5: "You’re shining today! Keep spreading that positivity with a kind act."
-}
-        st.write(f"Selected mood: {mood_options[mood-1]}")
-        st.write(f"Coping tip: {coping_tips.get(mood, 'Let’s explore how you’re feeling.')}")
-        
-        render_chat_interface()
-        handle_chat_input(model, system_prompt=get_tone_prompt())
-
-# --- 9. SCROLL SCRIPT ---
+        # --- Mood Slider (a fragment: moving it reruns only this block) ---
+        @st.fragment
+        def mood_check_in():
+            st.subheader("😊 Track Your Mood")
+            mood_options = ['Very Sad', 'Sad', 'Neutral', 'Happy', 'Very Happy']
+            mood = st.slider(
+                'Select your mood',
+                min_value=1, max_value=5, value=3, step=1
+            )
+            coping_tips = {
+                1: "It’s okay to feel this way. Try some deep breathing exercises to find calm.",
+                2: "Consider writing down your thoughts in the journal to process your feelings.",
+                3: "A short walk or some light stretching might help you feel balanced.",
+                4: "Great to hear you’re feeling happy! Share something positive in your journal.",
+                5: "You’re shining today! Keep spreading that positivity with a kind act."
+            }
+            st.write(f"Selected mood: {mood_options[mood-1]}")
+            st.write(f"Coping tip: {coping_tips.get(mood, 'Let’s explore how you’re feeling.')}")
+
+        mood_check_in()
+
+        render_chat_view(get_model, system_prompt=get_tone_prompt())
+
+render_profiler_panel()
+
+# --- 8. SCROLL SCRIPT ---
 st.markdown("""
 <script>
     function scrollToBottom() {
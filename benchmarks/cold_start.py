@@ -0,0 +1,201 @@
+"""
+Benchmark: cold start, warm rerun latency and element counts per page/view.
+
+Each scenario runs in a fresh interpreter so "cold" includes every import the
+page triggers. The app is driven headlessly with Streamlit's AppTest; the
+Gemini model is replaced with a fake that answers instantly, so numbers never
+depend on the network or an API key. Each scenario runs in a temporary
+working directory that links to the code and assets but has its own empty
+data/, users.db and journals.db, so the real data is never touched.
+
+    python benchmarks/cold_start.py                      # print a table
+    python benchmarks/cold_start.py --output bench.json  # also save JSON
+    python benchmarks/cold_start.py --baseline bench.json
+    python benchmarks/cold_start.py --scenario chat --scenario login
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WARM_RERUNS = 5
+# Owner key used for every file the benchmark writes under data/
+BENCH_OWNER = "benchmark"
+# Runtime state the app writes relative to its working directory
+DATA_ENTRIES = {"data", "users.db", "journals.db"}
+
+AUTHENTICATED = {"authenticated": True, "user_name": "Bench", "user_email": "bench@example.com"}
+
+# name -> (script, extra session state, chat message to send)
+SCENARIOS = {
+    "login": ("TalkHeal.py", {}, None),
+    "chat": ("TalkHeal.py", AUTHENTICATED, None),
+    "chat_send": ("TalkHeal.py", AUTHENTICATED, "I have an exam tomorrow and can't sleep"),
+    "mood_dashboard": ("TalkHeal.py", {**AUTHENTICATED, "show_mood_dashboard": True}, None),
+    "focus_session": ("TalkHeal.py", {**AUTHENTICATED, "show_focus_session": True}, None),
+    "journaling": ("pages/Journaling.py", AUTHENTICATED, None),
+    "yoga": ("pages/Yoga.py", AUTHENTICATED, None),
+    "self_help_tools": ("pages/selfHelpTools.py", AUTHENTICATED, None),
+    "breathing_exercise": ("pages/Breathing_Exercise.py", AUTHENTICATED, None),
+    "about": ("pages/About.py", AUTHENTICATED, None),
+}
+
+
+class FakeModel:
+    """Stands in for genai.GenerativeModel."""
+
+    def generate_content(self, prompt):
+        class Response:
+            text = "That sounds hard. What usually helps you wind down before bed?"
+        return Response()
+
+
+def count_elements(node, counts=None):
+    """Leaf elements in an AppTest tree, by type."""
+    from streamlit.testing.v1.element_tree import Block
+
+    counts = {} if counts is None else counts
+    if isinstance(node, Block) or hasattr(node, "children") and isinstance(node.children, dict):
+        for child in node.children.values():
+            count_elements(child, counts)
+    else:
+        counts[node.type] = counts.get(node.type, 0) + 1
+    return counts
+
+
+@contextmanager
+def isolated_workdir():
+    """
+    Changes into a temporary copy of the repository layout: everything but
+    DATA_ENTRIES is a symlink, so the app's relative data paths (data/,
+    users.db, journals.db) resolve to fresh files that are removed afterwards.
+    """
+    with tempfile.TemporaryDirectory(prefix="talkheal-bench-") as workdir:
+        for entry in os.listdir(ROOT):
+            if entry not in DATA_ENTRIES:
+                os.symlink(os.path.join(ROOT, entry), os.path.join(workdir, entry))
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            yield workdir
+        finally:
+            os.chdir(cwd)
+
+
+def run_scenario(name):
+    """Runs one scenario in this process and returns its measurements."""
+    sys.path.insert(0, ROOT)
+    with isolated_workdir():
+        return _run_scenario(name)
+
+
+def _run_scenario(name):
+    from datetime import datetime
+    from streamlit.testing.v1 import AppTest
+
+    script, state, message = SCENARIOS[name]
+    start = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=120)
+    for key, value in state.items():
+        at.session_state[key] = value
+    at.session_state["cached_ip"] = BENCH_OWNER
+    at.session_state["ip_cache_time"] = datetime.now()
+    at.session_state["gemini_model"] = FakeModel()
+    at.run()
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    result = {
+        "script": script,
+        "cold_ms": round(cold_ms, 1),
+        "exceptions": [e.message for e in at.exception],
+    }
+    if result["exceptions"]:
+        return result
+
+    warm = []
+    for _ in range(WARM_RERUNS):
+        start = time.perf_counter()
+        at.run()
+        warm.append((time.perf_counter() - start) * 1000)
+    result["warm_ms"] = round(statistics.median(warm), 1)
+
+    if message:
+        at.text_input[0].input(message)
+        submit = [b for b in at.button if b.label == "Send"][0]
+        start = time.perf_counter()
+        submit.click().run()
+        result["send_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    counts = count_elements(at._tree)
+    result["elements"] = sum(counts.values())
+    result["element_types"] = dict(sorted(counts.items()))
+    return result
+
+
+def measure(name):
+    """Runs a scenario in a fresh interpreter (a true cold start)."""
+    proc = subprocess.run(
+        [sys.executable, "-W", "ignore", os.path.abspath(__file__), "--run-scenario", name],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        return {"script": SCENARIOS[name][0], "exceptions": proc.stderr.strip().splitlines()[-1:] or ["no output"]}
+    return json.loads(lines[-1])
+
+
+def compare(results, baseline):
+    print(f"\n{'scenario':<20} {'cold ms':>17} {'warm ms':>17} {'elements':>13}")
+    for name, result in results.items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base or "warm_ms" not in result or "warm_ms" not in base:
+            continue
+        cells = []
+        for key in ("cold_ms", "warm_ms", "elements"):
+            delta = result[key] - base[key]
+            pct = f"{delta / base[key] * 100:+.0f}%" if base[key] else "n/a"
+            cells.append(f"{result[key]:>8} ({pct:>5})" if key != "elements" else f"{result[key]:>5} ({delta:+d})")
+        print(f"{name:<20} {cells[0]:>17} {cells[1]:>17} {cells[2]:>13}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start / warm rerun benchmark for every page and view.")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="run only these scenarios")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    parser.add_argument("--run-scenario", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        print(json.dumps(run_scenario(args.run_scenario)))
+        return
+
+    results = {}
+    print(f"{'scenario':<20} {'cold ms':>9} {'warm ms':>9} {'send ms':>9} {'elements':>9}")
+    for name in args.scenario or SCENARIOS:
+        result = results[name] = measure(name)
+        if result.get("exceptions"):
+            print(f"{name:<20} failed: {result['exceptions'][0]}")
+            continue
+        print(f"{name:<20} {result['cold_ms']:>9} {result['warm_ms']:>9} "
+              f"{result.get('send_ms', ''):>9} {result['elements']:>9}")
+
+    report = {"python": sys.version.split()[0], "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "scenarios": results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
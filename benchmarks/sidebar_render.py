@@ -0,0 +1,76 @@
+"""
+Benchmark: sidebar render time vs. number of saved conversations.
+
+Renders `render_sidebar()` headlessly with Streamlit's AppTest for growing
+conversation counts, once with the paginated list (default page size) and
+once with every conversation expanded, and prints the median rerun time and
+the number of buttons created.
+
+    python benchmarks/sidebar_render.py
+
+Example run (medians of RERUNS reruns, one row per CONVERSATION_COUNTS entry):
+
+    conversations |  paged ms buttons |    all ms buttons
+               10 |      35.9      24 |      25.2      24
+              100 |      28.5      45 |     110.9     204
+              500 |      27.6      45 |     423.8    1004
+             1000 |      27.6      45 |     888.3    2004
+"""
+
+import os
+import statistics
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CONVERSATION_COUNTS = [10, 100, 500, 1000]
+RERUNS = 5
+
+
+def sidebar_app(count, show_all):
+    import streamlit as st
+    from components.sidebar import render_sidebar
+
+    if "conversations" not in st.session_state:
+        st.session_state.conversations = [
+            {
+                "id": f"bench-{i}",
+                "title": f"Benchmark conversation {i}",
+                "date": "January 01, 2025",
+                "messages": [{"sender": "user", "message": "hello", "time": "9:00 AM"}]
+            }
+            for i in range(count)
+        ]
+        st.session_state.active_conversation = 0
+        if show_all:
+            st.session_state.conversation_list_limit = count
+
+    render_sidebar()
+
+
+def measure(count, show_all):
+    at = AppTest.from_function(sidebar_app, args=(count, show_all), default_timeout=60)
+    at.run()
+    timings = []
+    for _ in range(RERUNS):
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, len(at.sidebar.button)
+
+
+def main():
+    os.chdir(ROOT)
+    print(f"{'conversations':>13} | {'paged ms':>9} {'buttons':>7} | {'all ms':>9} {'buttons':>7}")
+    for count in CONVERSATION_COUNTS:
+        paged_ms, paged_buttons = measure(count, show_all=False)
+        all_ms, all_buttons = measure(count, show_all=True)
+        print(f"{count:>13} | {paged_ms:>9.1f} {paged_buttons:>7} | {all_ms:>9.1f} {all_buttons:>7}")
+
+
+if __name__ == "__main__":
+    main()
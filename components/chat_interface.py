@@ -1,42 +1,60 @@
 import streamlit as st
-import streamlit.components.v1 as components
+from collections import deque
 from datetime import datetime
-from core.utils import get_current_time, get_ai_response, save_conversations
+from uuid import uuid4
+from core.utils import get_current_time, get_ai_response, save_conversations, index_conversation_message, ensure_conversation_loaded, touch_conversation, rerun_fragment
+from core.theme import get_current_theme
+from core.profiler import profiled
 import requests
 
-# Inject JS to get user's local time zone
-def set_user_time_in_session():
-    if "user_time_offset" not in st.session_state:
-        components.html("""
-            <script>
-            const offset = new Date().getTimezoneOffset(); 
-            const time = new Date().toLocaleString();      
-            const data = {offset: offset, time: time};
-            window.parent.postMessage({type: 'USER_TIME', data: data}, '*');
-            </script>
-        """, height=0)
-
-        st.markdown("""
-        <script>
-        window.addEventListener("message", (event) => {
-            if (event.data.type === "USER_TIME") {
-                const payload = JSON.stringify(event.data.data);
-                fetch("/", {
-                    method: "POST",
-                    headers: {"Content-Type": "application/json"},
-                    body: payload
-                }).then(() => location.reload());
-            }
-        });
-        </script>
-        """, unsafe_allow_html=True)
-
-set_user_time_in_session()
+# Messages shown per page in the chat view; older ones load on demand
+MESSAGE_PAGE_SIZE = 30
+# Recently used form nonces kept per session to spot repeat submissions
+CHAT_NONCE_HISTORY = 50
+
+def render_message_html(msg):
+    css_class = "user-message" if msg["sender"] == "user" else "bot-message"
+    return (
+        f'<div class="{css_class}">{msg["message"]}'
+        f'<div class="message-time">{msg["time"]}</div></div>'
+    )
+
+def message_key(msg):
+    """Identifies a message by its content, so an edited message is rendered again."""
+    return (msg["sender"], msg["message"], msg["time"])
+
+def get_messages_html(convo, start):
+    """
+    Returns the HTML for convo["messages"][start:] as one block. Each message
+    is rendered once, keyed by its content, and the joined block is only
+    rebuilt when the shown messages or the theme change. Only the shown
+    conversation's fragments are kept, so switching away from or deleting a
+    conversation drops its entries.
+    """
+    theme_name = get_current_theme()["name"]
+    cache = st.session_state.get("message_html_cache")
+    if cache is None or cache["theme"] != theme_name or cache["convo_id"] != convo["id"]:
+        cache = {"theme": theme_name, "convo_id": convo["id"], "fragments": {}, "keys": None, "block": ""}
+        st.session_state.message_html_cache = cache
+
+    messages = convo["messages"][start:]
+    keys = [message_key(msg) for msg in messages]
+    if cache["keys"] != keys:
+        old_fragments = cache["fragments"]
+        fragments = {}
+        for key, msg in zip(keys, messages):
+            fragments[key] = old_fragments.get(key) or render_message_html(msg)
+        cache["fragments"] = fragments
+        cache["block"] = "\n".join(fragments[key] for key in keys)
+        cache["keys"] = keys
+    return cache["block"]
 
 # Display chat messages
+@profiled
 def render_chat_interface():    
     if st.session_state.active_conversation >= 0:
         active_convo = st.session_state.conversations[st.session_state.active_conversation]
+        ensure_conversation_loaded(active_convo)
 
         if not active_convo["messages"]:
             st.markdown(f"""
@@ -47,28 +65,52 @@ def render_chat_interface():
             </div>
             """, unsafe_allow_html=True)
 
-        for msg in active_convo["messages"]:
-            css_class = "user-message" if msg["sender"] == "user" else "bot-message"
-            st.markdown(f"""
-            <div class="{css_class}">
-                {msg["message"]}
-                <div class="message-time">{msg["time"]}</div>
-            </div>
-            """, unsafe_allow_html=True)
+        messages = active_convo["messages"]
+        window_sizes = st.session_state.setdefault("message_window_sizes", {})
+        window = window_sizes.get(active_convo["id"], MESSAGE_PAGE_SIZE)
+        hidden = max(0, len(messages) - window)
+
+        if hidden:
+            if st.button(f"⬆️ Load earlier messages ({hidden} more)", key="load_earlier_messages", use_container_width=True):
+                window_sizes[active_convo["id"]] = window + MESSAGE_PAGE_SIZE
+                rerun_fragment()
+
+        if messages:
+            st.markdown(get_messages_html(active_convo, hidden), unsafe_allow_html=True)
+
+def claim_chat_nonce(nonce):
+    """
+    True the first time a form nonce is submitted, False for any repeat.
+    Only the last CHAT_NONCE_HISTORY nonces are remembered; older forms are
+    long gone from the page.
+    """
+    handled = st.session_state.setdefault("handled_chat_nonces", deque(maxlen=CHAT_NONCE_HISTORY))
+    if nonce in handled:
+        return False
+    handled.append(nonce)
+    return True
 
 # Handle chat input and generate AI response
-def handle_chat_input(model, system_prompt):
+@profiled
+def handle_chat_input(get_model, system_prompt):
+    """``get_model`` is called only when a message is actually sent."""
     if "pre_filled_chat_input" not in st.session_state:
         st.session_state.pre_filled_chat_input = ""
     initial_value = st.session_state.pre_filled_chat_input
     st.session_state.pre_filled_chat_input = ""
 
-    with st.form(key="chat_form", clear_on_submit=True):
+    # Each form instance carries its own nonce (in its widget keys), so a
+    # double-click or a rerun race re-submits a nonce that was already used
+    if "chat_form_nonce" not in st.session_state:
+        st.session_state.chat_form_nonce = uuid4().hex
+    nonce = st.session_state.chat_form_nonce
+
+    with st.form(key=f"chat_form_{nonce}", clear_on_submit=True):
         col1, col2 = st.columns([5, 1])
         with col1:
             user_input = st.text_input(
                 "Share your thoughts...",
-                key="message_input",
+                key=f"message_input_{nonce}",
                 label_visibility="collapsed",
                 placeholder="Type your message here...",
                 value=initial_value
@@ -79,24 +121,32 @@ def handle_chat_input(model, system_prompt):
     if (send_pressed or st.session_state.get("send_chat_message", False)) and user_input.strip():
         if 'send_chat_message' in st.session_state:
             st.session_state.send_chat_message = False
+        if not claim_chat_nonce(nonce):
+            return
+        st.session_state.chat_form_nonce = uuid4().hex
 
         if st.session_state.active_conversation >= 0:
             current_time = get_current_time()
             active_convo = st.session_state.conversations[st.session_state.active_conversation]
 
             # Save user message
-            active_convo["messages"].append({
+            user_msg = {
                 "sender": "user",
                 "message": user_input.strip(),
-                "time": current_time
-            })
+                "time": current_time,
+                "nonce": nonce
+            }
+            active_convo["messages"].append(user_msg)
+            touch_conversation(active_convo)
 
             # Set title if it's the first message
-            if len(active_convo["messages"]) == 1:
+            first_message = len(active_convo["messages"]) == 1
+            if first_message:
                 title = user_input[:30] + "..." if len(user_input) > 30 else user_input
                 active_convo["title"] = title
 
             save_conversations(st.session_state.conversations)
+            index_conversation_message(active_convo, user_msg)
 
             # Format memory
             def format_memory(convo_history, max_turns=10):
@@ -110,12 +160,13 @@ def handle_chat_input(model, system_prompt):
                 with st.spinner("TalkHeal is thinking..."):
                     memory = format_memory(active_convo["messages"])
                     prompt = f"{system_prompt}\n\n{memory}\nUser: {user_input.strip()}\nBot:"
-                    ai_response = get_ai_response(prompt, model)
+                    ai_response = get_ai_response(prompt, get_model())
 
                     active_convo["messages"].append({
                         "sender": "bot",
                         "message": ai_response,
-                        "time": get_current_time()
+                        "time": get_current_time(),
+                        "reply_to": nonce
                     })
 
             except ValueError as e:
@@ -123,22 +174,39 @@ def handle_chat_input(model, system_prompt):
                 active_convo["messages"].append({
                     "sender": "bot",
                     "message": "I'm having trouble understanding your message. Could you please rephrase it?",
-                    "time": get_current_time()
+                    "time": get_current_time(),
+                    "reply_to": nonce
                 })
             except requests.RequestException as e:
                 st.error("Network connection issue. Please check your internet connection.")
                 active_convo["messages"].append({
                     "sender": "bot",
                     "message": "I'm having trouble connecting to my services. Please check your internet connection and try again.",
-                    "time": get_current_time()
+                    "time": get_current_time(),
+                    "reply_to": nonce
                 })
             except Exception as e:
                 st.error(f"An unexpected error occurred. Please try again.")
                 active_convo["messages"].append({
                     "sender": "bot",
                     "message": "I'm having trouble responding right now. Please try again in a moment.",
-                    "time": get_current_time()
+                    "time": get_current_time(),
+                    "reply_to": nonce
                 })
 
             save_conversations(st.session_state.conversations)
-            st.rerun()
+            index_conversation_message(active_convo, active_convo["messages"][-1])
+            # The sidebar only needs redrawing when the new title must show up there
+            if first_message:
+                st.rerun()
+            rerun_fragment()
+
+@st.fragment
+def render_chat_view(get_model, system_prompt):
+    """
+    Message list and chat input as one fragment: sending a message or loading
+    earlier ones reruns only this region, not the sidebar, CSS and the rest
+    of the page.
+    """
+    render_chat_interface()
+    handle_chat_input(get_model, system_prompt)
@@ -0,0 +1,64 @@
+import streamlit as st
+
+from core.data_export import (
+    ImportValidationError, import_records, index_imported, iter_export_records, iter_import_records,
+    iter_ndjson_lines
+)
+from core.utils import cached_user_ip, get_memory_file, save_conversations
+
+
+def build_export():
+    """Called by the download button only when the user clicks it."""
+    records = iter_export_records(
+        get_memory_file(),
+        email=st.session_state.get("user_email"),
+        focus_logs=st.session_state.get("focus_session_logs", [])
+    )
+    return "".join(iter_ndjson_lines(records))
+
+
+def run_import(uploaded_file):
+    # Validate the whole file first so a bad line never leaves a half-merged history
+    total_records = max(sum(1 for _ in iter_import_records(uploaded_file)), 1)
+    uploaded_file.seek(0)
+
+    progress = st.progress(0.0, text="Importing...")
+
+    known_conversations = len(st.session_state.conversations)
+    focus_logs = st.session_state.setdefault("focus_session_logs", [])
+    counts = import_records(
+        iter_import_records(uploaded_file),
+        st.session_state.conversations,
+        email=st.session_state.get("user_email"),
+        focus_logs=focus_logs,
+        progress_callback=lambda n: progress.progress(min(n / total_records, 1.0), text=f"Imported {n} records")
+    )
+
+    save_conversations(st.session_state.conversations)
+    # Only the imported conversations are new to the search index
+    index_imported(cached_user_ip(), st.session_state.conversations, known_conversations)
+    progress.empty()
+    return counts
+
+
+def render_data_portability():
+    with st.expander("📦 Export / Import Your Data"):
+        st.download_button(
+            "⬇️ Download my data (NDJSON)",
+            data=build_export,
+            file_name="talkheal_export.ndjson",
+            mime="application/x-ndjson",
+            use_container_width=True
+        )
+
+        uploaded_file = st.file_uploader("Import a TalkHeal export", type=["ndjson", "jsonl"], key="data_import_file")
+        if uploaded_file and st.button("⬆️ Import", key="data_import_button", use_container_width=True):
+            try:
+                counts = run_import(uploaded_file)
+            except ImportValidationError as e:
+                st.error(f"Import failed: {e}")
+            else:
+                st.success(
+                    f"Imported {counts['conversation']} conversations, "
+                    f"{counts['journal_entry']} journal entries and {counts['focus_log']} focus sessions."
+                )
@@ -2,10 +2,11 @@ import streamlit as st
 import time
 from datetime import datetime, timedelta
 import random
-import pygame
 import requests
 import os
 import threading
+from core.utils import rerun_fragment
+from core.profiler import profiled
 
 # Focus session configurations
 FOCUS_DURATIONS = [
@@ -32,8 +33,9 @@ MOTIVATIONAL_QUOTES = [
 
 # Audio management
 AUDIO_FILES_DIR = "audio_files"
-if not os.path.exists(AUDIO_FILES_DIR):
-    os.makedirs(AUDIO_FILES_DIR)
+# Set TALKHEAL_SERVER_AUDIO=0 to never touch the server's audio device
+# (headless deployments); playback then falls back to the info message.
+SERVER_AUDIO_ENABLED = os.environ.get("TALKHEAL_SERVER_AUDIO", "1") != "0"
 
 # Updated Audio URLs for 5 calming music types
 AUDIO_URLS = {
@@ -44,11 +46,29 @@ AUDIO_URLS = {
     "tibetan_bowls": "https://www.soundjay.com/misc/sounds/white-noise-1.mp3"
 }
 
-# Initialize pygame mixer
-try:
-    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-except:
-    st.warning("Audio playback may not work properly. Please ensure pygame is installed.")
+_mixer = None
+_mixer_failed = False
+_mixer_lock = threading.Lock()
+
+def get_mixer(init=True):
+    """
+    Returns pygame's mixer, importing pygame and initializing SDL audio the
+    first time playback actually starts. Returns None in no-server-audio mode,
+    if initialization failed, or if ``init`` is False and it never ran.
+    """
+    global _mixer, _mixer_failed
+    if _mixer is not None or not init or _mixer_failed or not SERVER_AUDIO_ENABLED:
+        return _mixer
+    with _mixer_lock:
+        if _mixer is None and not _mixer_failed:
+            try:
+                import pygame
+                pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+                _mixer = pygame.mixer
+            except Exception:
+                _mixer_failed = True
+                st.warning("Audio playback may not work properly. Please ensure pygame is installed.")
+    return _mixer
 
 # Updated calming background options with 7 music types
 BACKGROUND_OPTIONS = [
@@ -71,6 +91,7 @@ def create_sample_audio_files():
         "tibetan_bowls.mp3": "Sample Tibetan singing bowl sounds"
     }
     
+    os.makedirs(AUDIO_FILES_DIR, exist_ok=True)
     for filename, description in sample_files.items():
         filepath = os.path.join(AUDIO_FILES_DIR, filename)
         if not os.path.exists(filepath):
@@ -106,6 +127,7 @@ def download_audio_file(audio_type):
             response = requests.get(AUDIO_URLS[audio_type], stream=True, timeout=10)
             response.raise_for_status()
             
+            os.makedirs(AUDIO_FILES_DIR, exist_ok=True)
             with open(mp3_filepath, 'wb') as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     f.write(chunk)
@@ -123,16 +145,17 @@ def play_audio(audio_type):
     if not audio_type:
         return
     
-    filepath = download_audio_file(audio_type)
+    mixer = get_mixer()
+    filepath = download_audio_file(audio_type) if mixer else None
     if not filepath:
         st.info(f"🎵 {audio_type.replace('_', ' ').title()} music would play here")
         st.session_state.audio_playing = True
         return
     
     try:
-        pygame.mixer.music.load(filepath)
-        pygame.mixer.music.set_volume(0.3)
-        pygame.mixer.music.play(-1)  # -1 means loop indefinitely
+        mixer.music.load(filepath)
+        mixer.music.set_volume(0.3)
+        mixer.music.play(-1)  # -1 means loop indefinitely
         st.session_state.audio_playing = True
         st.success(f"🎵 Now playing: {audio_type.replace('_', ' ').title()} background music")
     except Exception as e:
@@ -140,35 +163,37 @@ def play_audio(audio_type):
         st.info(f"🎵 {audio_type.replace('_', ' ').title()} music would play here")
         st.session_state.audio_playing = True
 
+def _control_music(action):
+    """
+    Calls ``mixer.music.<action>()`` if playback was ever started. Mixer
+    errors (e.g. nothing loaded) are ignored; the UI state is updated anyway.
+    """
+    mixer = get_mixer(init=False)
+    if mixer is None:
+        return
+    import pygame  # already imported by get_mixer()
+    try:
+        getattr(mixer.music, action)()
+    except pygame.error:
+        pass
+
 def stop_audio():
     """Stop audio playback"""
-    try:
-        pygame.mixer.music.stop()
-        st.session_state.audio_playing = False
-        st.info("🔇 Audio stopped")
-    except Exception as e:
-        st.session_state.audio_playing = False
-        st.info("🔇 Audio stopped")
+    _control_music("stop")
+    st.session_state.audio_playing = False
+    st.info("🔇 Audio stopped")
 
 def pause_audio():
     """Pause audio playback"""
-    try:
-        pygame.mixer.music.pause()
-        st.session_state.audio_playing = False
-        st.info("⏸️ Audio paused")
-    except Exception as e:
-        st.session_state.audio_playing = False
-        st.info("⏸️ Audio paused")
+    _control_music("pause")
+    st.session_state.audio_playing = False
+    st.info("⏸️ Audio paused")
 
 def unpause_audio():
     """Unpause audio playback"""
-    try:
-        pygame.mixer.music.unpause()
-        st.session_state.audio_playing = True
-        st.success("▶️ Audio resumed")
-    except Exception as e:
-        st.session_state.audio_playing = True
-        st.success("▶️ Audio resumed")
+    _control_music("unpause")
+    st.session_state.audio_playing = True
+    st.success("▶️ Audio resumed")
 
 def initialize_focus_state():
     """Initialize focus session state variables"""
@@ -273,7 +298,7 @@ def render_audio_controls(audio_type, auto_play=False):
     if auto_play and not st.session_state.get("audio_auto_played", False):
         play_audio(audio_type)
         st.session_state.audio_auto_played = True
-        st.rerun()
+        rerun_fragment()
     
     # Audio control buttons
     col1, col2, col3, col4 = st.columns(4)
@@ -281,22 +306,22 @@ def render_audio_controls(audio_type, auto_play=False):
     with col1:
         if st.button("🔊 Play", use_container_width=True, type="primary"):
             play_audio(audio_type)
-            st.rerun()
+            rerun_fragment()
     
     with col2:
         if st.button("⏸️ Pause", use_container_width=True, type="secondary"):
             pause_audio()
-            st.rerun()
+            rerun_fragment()
     
     with col3:
         if st.button("▶️ Resume", use_container_width=True, type="secondary"):
             unpause_audio()
-            st.rerun()
+            rerun_fragment()
     
     with col4:
         if st.button("🔇 Stop", use_container_width=True, type="secondary"):
             stop_audio()
-            st.rerun()
+            rerun_fragment()
     
     # Show current audio status (only if audio is playing)
     if st.session_state.get("audio_playing", False):
@@ -337,7 +362,7 @@ def render_focus_setup():
                     st.session_state.focus_duration = duration
                     st.session_state.focus_session_active = True
                     st.session_state.focus_start_time = datetime.now()
-                    st.rerun()
+                    rerun_fragment()
     
     # Custom time input
     if st.session_state.get("show_custom_time_input", False):
@@ -383,12 +408,12 @@ def render_focus_setup():
                     st.session_state.focus_session_active = True
                     st.session_state.focus_start_time = datetime.now()
                     st.session_state.show_custom_time_input = False
-                    st.rerun()
+                    rerun_fragment()
             
             with col2:
                 if st.button("❌ Cancel", use_container_width=True, type="secondary"):
                     st.session_state.show_custom_time_input = False
-                    st.rerun()
+                    rerun_fragment()
     
     # Background selection
     st.subheader("🎵 Choose Your Background Music (Optional)")
@@ -454,7 +479,7 @@ def render_active_session():
     # Check if session is complete
     if remaining_seconds <= 0:
         complete_session()
-        st.rerun()  # Force page refresh to show completion screen
+        rerun_fragment()  # Force page refresh to show completion screen
         return
     
     # Session header
@@ -511,7 +536,7 @@ def render_active_session():
                 # Pause audio if it's playing
                 if st.session_state.get("audio_playing", False):
                     pause_audio()
-            st.rerun()
+            rerun_fragment()
     
     with col2:
         if st.button("⏹️ End Session", use_container_width=True, type="primary"):
@@ -522,7 +547,7 @@ def render_active_session():
             st.session_state.audio_auto_played = False
             st.session_state.audio_was_playing_before_pause = False
             st.session_state.focus_session_active = False
-            st.rerun()
+            rerun_fragment()
     
     with col3:
         if st.button("🔄 Restart", use_container_width=True, type="secondary"):
@@ -535,7 +560,7 @@ def render_active_session():
             st.session_state.focus_start_time = datetime.now()
             st.session_state.focus_paused = False
             st.session_state.focus_pause_start = None
-            st.rerun()
+            rerun_fragment()
     
     # Handle background audio or silence
     if st.session_state.selected_background:
@@ -544,7 +569,7 @@ def render_active_session():
             if not st.session_state.get("audio_auto_played", False):
                 play_audio(st.session_state.selected_background['audio_type'])
                 st.session_state.audio_auto_played = True
-                st.rerun()
+                rerun_fragment()
             
             # Show simple audio status and stop button
             if st.session_state.get("audio_playing", False):
@@ -555,7 +580,7 @@ def render_active_session():
                 with col2:
                     if st.button("🔇 Stop Music", use_container_width=True, type="secondary"):
                         stop_audio()
-                        st.rerun()
+                        rerun_fragment()
         else:
             # No music mode
             st.info("🔇 **No Music Mode** - Enjoy pure focus without any background audio")
@@ -659,7 +684,7 @@ def render_completion_screen():
     with col2:
         if st.button("🧘 Another Session", use_container_width=True):
             st.session_state.focus_session_completed = False
-            st.rerun()
+            rerun_fragment()
     
     with col3:
         if st.button("🏠 Back to Chat", use_container_width=True):
@@ -670,8 +695,13 @@ def render_completion_screen():
     # Breathing exercise reminder
     st.info("💡 **Tip**: Take a few deep breaths to carry this calm feeling forward into your day.")
 
+@st.fragment
+@profiled
 def render_focus_session():
-    """Main function to render the focus session feature"""
+    """
+    Main function to render the focus session feature. Runs as a fragment so
+    timer and audio controls rerun only this view, not the whole app.
+    """
     initialize_focus_state()
     
     if st.session_state.get("focus_session_completed", False):
@@ -1,14 +1,14 @@
 import streamlit as st
 from auth.auth_utils import register_user, authenticate_user
+from core.fonts import font_assets_html
 
 def show_login_page():
     """Renders the login/signup page with the modern dark theme."""
+    # Self-hosted fonts (Google Fonts for any face not in static/fonts/ yet)
+    st.markdown(font_assets_html(), unsafe_allow_html=True)
     st.markdown(
         """
         <style>
-        /* --- Import Google Font --- */
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;800&display=swap');
-
         /* --- Animation Keyframes --- */
         @keyframes fadeIn {
             from {
@@ -26,7 +26,7 @@ def show_login_page():
             height: 100%;
             min-height: 100vh;
             background-color: #121212;
-            font-family: 'Inter', sans-serif;
+            font-family: var(--font-body);
         }
 
         [data-testid="stSidebar"] { display: none; }
@@ -3,58 +3,84 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import json
-import os
 from collections import Counter, defaultdict
+from core.mood_store import MOOD_DATA_FILE, load_mood_entries, save_mood_entries
+from core.profiler import profiled
+
+MOOD_LEVELS = ["very_low", "low", "okay", "good", "great"]
+MOOD_NUMERIC = {level: i for i, level in enumerate(MOOD_LEVELS, start=1)}
+MOOD_LABELS = {
+    "very_low": "😔 Very Low",
+    "low": "😐 Low",
+    "okay": "😊 Okay",
+    "good": "😄 Good",
+    "great": "🌟 Great"
+}
+
+
+def build_mood_frame(entries):
+    """
+    Typed DataFrame of mood entries, sorted by a datetime64 index: the
+    mood level as a categorical, precomputed numeric mood and label, and
+    the hour and weekday (Monday = 0) as small ints.
+    """
+    df = pd.DataFrame(entries, columns=None if entries else ["timestamp", "mood_level"])
+    # One unit for every frame, so appended rows and the cutoff in get_mood_dataframe compare losslessly
+    df.index = pd.DatetimeIndex(pd.to_datetime(df['timestamp'], format="ISO8601"), name='datetime').as_unit("us")
+    df = df.sort_index(kind='stable')
+    levels = df['mood_level']
+    extra_levels = sorted(set(levels.dropna()) - set(MOOD_LEVELS))
+    df['mood_level'] = pd.Categorical(levels, categories=MOOD_LEVELS + extra_levels)
+    df['mood_numeric'] = levels.map(MOOD_NUMERIC).fillna(3).astype('int8')
+    df['mood_label'] = levels.map(MOOD_LABELS).fillna(levels)
+    df['datetime'] = df.index
+    df['date'] = df.index.normalize()
+    df['day_of_week'] = df.index.day_name()
+    df['hour'] = df.index.hour.astype('int8')
+    df['weekday'] = df.index.weekday.astype('int8')
+    return df
+
 
 class MoodTracker:
     def __init__(self):
-        self.data_file = "data/mood_data.json"
-        self.ensure_data_directory()
+        self.data_file = MOOD_DATA_FILE
+        self._frame = None
+        self._frame_source = None
+        # Why the file could not be read; saving is refused while this is set
+        self.load_error = None
         self.load_mood_data()
     
-    def ensure_data_directory(self):
-        """Ensure the data directory exists"""
-        os.makedirs("data", exist_ok=True)
-    
+    @profiled
     def load_mood_data(self):
-        """Load mood data from JSON file"""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    st.session_state.mood_data = json.load(f)
-                # Migrate existing data to include new fields
-                self.migrate_old_data()
-            except:
-                st.session_state.mood_data = []
-        else:
+        """Load mood data from JSON file (read-only unless the file needs migrating)"""
+        try:
+            st.session_state.mood_data = load_mood_entries(self.data_file)
+            self.load_error = None
+        except (OSError, ValueError) as e:
+            # Corrupt or newer-schema file: show nothing, and never overwrite it
             st.session_state.mood_data = []
+            self.load_error = str(e)
     
-    def migrate_old_data(self):
-        """Migrate old mood data to include new fields"""
-        for entry in st.session_state.mood_data:
-            # Add context_reason if missing
-            if 'context_reason' not in entry:
-                entry['context_reason'] = "No specific reason"
-            
-            # Add activities if missing
-            if 'activities' not in entry:
-                entry['activities'] = []
-            
-            # Ensure activities is a list
-            if not isinstance(entry['activities'], list):
-                entry['activities'] = []
-        
-        # Save migrated data
-        self.save_mood_data()
+    def show_load_error(self):
+        st.error(f"❌ Your mood history could not be read, so new entries are not being saved. ({self.load_error})")
     
+    @profiled
     def save_mood_data(self):
-        """Save mood data to JSON file"""
-        with open(self.data_file, 'w') as f:
-            json.dump(st.session_state.mood_data, f, indent=2)
+        """Save mood data to JSON file; returns False if the file is unreadable and was left alone"""
+        if self.load_error is not None:
+            return False
+        save_mood_entries(st.session_state.mood_data, self.data_file)
+        return True
     
     def add_mood_entry(self, mood_level, notes="", context_reason="", activities=None, timestamp=None):
-        """Add a new mood entry with enhanced context"""
+        """Add a new mood entry with enhanced context; returns False if it could not be saved"""
+        if self.load_error is not None:
+            # The file may have been fixed since; only save once it reads cleanly
+            self.load_mood_data()
+            if self.load_error is not None:
+                self.show_load_error()
+                return False
+        
         if timestamp is None:
             timestamp = datetime.now().isoformat()
         
@@ -72,50 +98,50 @@ class MoodTracker:
             "day_of_week": datetime.fromisoformat(timestamp).strftime("%A")
         }
         
+        frame = self.get_mood_frame()
         st.session_state.mood_data.append(entry)
         self.save_mood_data()
+        
+        # Append the new row instead of rebuilding the cached frame
+        row = build_mood_frame([entry])
+        if entry["mood_level"] in frame['mood_level'].cat.categories:
+            row['mood_level'] = row['mood_level'].cat.set_categories(frame['mood_level'].cat.categories)
+            updated = pd.concat([frame, row]) if len(frame) else row
+            if len(frame) and row.index[0] < frame.index[-1]:
+                updated = updated.sort_index(kind='stable')
+            self._frame = updated
+            self._frame_source = (id(st.session_state.mood_data), len(st.session_state.mood_data))
+        return True
+    
+    def get_mood_frame(self):
+        """
+        All entries as a typed DataFrame (see build_mood_frame), cached on the
+        tracker and rebuilt only when mood_data is replaced or changed outside
+        add_mood_entry. Shared between callers: do not modify it in place.
+        """
+        source = (id(st.session_state.mood_data), len(st.session_state.mood_data))
+        if self._frame is None or self._frame_source != source:
+            self._frame = build_mood_frame(st.session_state.mood_data)
+            self._frame_source = source
+        return self._frame
     
     def get_mood_dataframe(self, days=30):
         """Get mood data as pandas DataFrame for the last N days"""
-        if not st.session_state.mood_data:
-            return pd.DataFrame()
-        
-        cutoff_date = datetime.now() - timedelta(days=days)
-        recent_data = [
-            entry for entry in st.session_state.mood_data
-            if datetime.fromisoformat(entry["timestamp"]) >= cutoff_date
-        ]
-        
-        if not recent_data:
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(recent_data)
-        df['datetime'] = pd.to_datetime(df['timestamp'])
-        df['date'] = pd.to_datetime(df['date'])
-        return df.sort_values('datetime')
+        frame = self.get_mood_frame()
+        if frame.empty:
+            return frame
+        cutoff_date = pd.Timestamp(datetime.now() - timedelta(days=days)).as_unit(frame.index.unit)
+        return frame.iloc[frame.index.searchsorted(cutoff_date, side='left'):]
     
     def get_mood_numeric(self, mood_level):
         """Convert mood level to numeric value for analysis"""
-        mood_mapping = {
-            "very_low": 1,
-            "low": 2,
-            "okay": 3,
-            "good": 4,
-            "great": 5
-        }
-        return mood_mapping.get(mood_level, 3)
+        return MOOD_NUMERIC.get(mood_level, 3)
     
     def get_mood_label(self, mood_level):
         """Convert mood level to display label"""
-        mood_labels = {
-            "very_low": "😔 Very Low",
-            "low": "😐 Low",
-            "okay": "😊 Okay",
-            "good": "😄 Good",
-            "great": "🌟 Great"
-        }
-        return mood_labels.get(mood_level, mood_level)
+        return MOOD_LABELS.get(mood_level, mood_level)
 
+@profiled
 def render_mood_dashboard():
     """Render the main mood tracking dashboard"""
     # Add custom CSS for black text
@@ -151,17 +177,19 @@ def render_mood_dashboard():
         st.session_state.mood_tracker = MoodTracker()
     
     tracker = st.session_state.mood_tracker
+    if tracker.load_error is not None:
+        tracker.show_load_error()
     
     # Check if there's a new mood entry to save
     if "current_mood_val" in st.session_state and "mood_journal_area" in st.session_state:
         if st.session_state.get("save_mood_entry_clicked", False):
             mood_level = st.session_state.current_mood_val
             notes = st.session_state.get("mood_journal_area", "")
-            tracker.add_mood_entry(mood_level, notes)
             st.session_state.save_mood_entry_clicked = False
-            st.success("✅ Mood entry saved successfully!")
+            if tracker.add_mood_entry(mood_level, notes):
+                st.success("✅ Mood entry saved successfully!")
     
-    # Dashboard tabs
+    # Dashboard tabs; each tab renders as a fragment so its filters rerun only that tab
     tab1, tab2, tab3 = st.tabs(["📈 Mood History", "📊 Analytics", "💡 Insights"])
     
     with tab1:
@@ -173,6 +201,7 @@ def render_mood_dashboard():
     with tab3:
         render_mood_insights(tracker)
 
+@st.fragment
 def render_mood_history(tracker):
     """Render mood history with charts and filters"""
     st.markdown("### 📈 Mood History View")
@@ -212,10 +241,6 @@ def render_mood_history(tracker):
         st.markdown(f'<div style="color: black;">No {mood_filter.lower()} mood entries found for the selected period.</div>', unsafe_allow_html=True)
         return
     
-    # Add numeric mood values for charts
-    df['mood_numeric'] = df['mood_level'].apply(tracker.get_mood_numeric)
-    df['mood_label'] = df['mood_level'].apply(tracker.get_mood_label)
-    
     # Line chart for mood over time
     st.markdown("#### 📈 Mood Trend Over Time")
     fig_line = px.line(
@@ -362,6 +387,7 @@ def render_mood_history(tracker):
                 else:
                     st.markdown('<div style="color: black;"><strong>Activities:</strong> None recorded</div>', unsafe_allow_html=True)
 
+@st.fragment
 def render_mood_analytics(tracker):
     """Render mood analytics and statistics"""
     st.markdown("### 📊 Mood Analytics")
@@ -372,8 +398,6 @@ def render_mood_analytics(tracker):
         st.info("No mood data available for analytics.")
         return
     
-    df['mood_numeric'] = df['mood_level'].apply(tracker.get_mood_numeric)
-    
     # Key statistics
     col1, col2, col3, col4 = st.columns(4)
     
@@ -449,7 +473,6 @@ def render_mood_analytics(tracker):
     
     # Mood heatmap by time
     st.markdown("#### 🕐 Mood by Time of Day")
-    df['hour'] = pd.to_datetime(df['time']).dt.hour
     hour_mood = df.groupby('hour')['mood_numeric'].mean()
     
     fig_hour = px.bar(
@@ -580,6 +603,7 @@ def render_mood_analytics(tracker):
                 st.plotly_chart(fig_context, use_container_width=True)
                 st.markdown("</div>", unsafe_allow_html=True)
 
+@st.fragment
 def render_mood_insights(tracker):
     """Render mood insights and reflections"""
     st.markdown("### 💡 Mood Insights & Reflections")
@@ -590,8 +614,6 @@ def render_mood_insights(tracker):
         st.info("No mood data available for insights.")
         return
     
-    df['mood_numeric'] = df['mood_level'].apply(tracker.get_mood_numeric)
-    
     # Most frequent mood
     st.markdown("#### 🎯 Most Frequent Mood")
     mood_counts = df['mood_level'].value_counts()
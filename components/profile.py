@@ -12,21 +12,27 @@ Version: 1.0
 """
 
 import streamlit as st
-import base64
 from datetime import datetime
-from io import BytesIO
-from PIL import Image
+
+from components.data_portability import render_data_portability
+from core.avatars import AVATAR_SIZES, avatar_img_html, avatar_url, has_avatar, store_avatar
+from core.profiles import default_profile, load_profile, save_profile
 
 
 def initialize_profile_state():
-    """Initialize profile data in session state if not exists"""
-    if "user_profile" not in st.session_state:
-        st.session_state.user_profile = {
-            "name": "",
-            "profile_picture": None,
-            "join_date": datetime.now().strftime("%B %Y"),
-            "font_size": "Medium"
-        }
+    """Load the signed-in user's stored profile into session state"""
+    owner = st.session_state.get("user_email")
+    if "user_profile" not in st.session_state or st.session_state.get("user_profile_owner") != owner:
+        st.session_state.user_profile = load_profile(owner) if owner else default_profile()
+        st.session_state.user_profile_owner = owner
+        st.session_state.global_font_size = st.session_state.user_profile["font_size"]
+
+
+def persist_profile():
+    """Write the session's profile back to the profile store"""
+    owner = st.session_state.get("user_profile_owner")
+    if owner:
+        save_profile(owner, st.session_state.user_profile)
 
 
 def get_greeting():
@@ -72,20 +78,15 @@ def create_default_avatar(initials, size=80):
 def handle_profile_picture_upload(uploaded_file):
     """Handle profile picture upload and processing"""
     if uploaded_file is not None:
+        # The file stays in the uploader across reruns; only process it once
+        if st.session_state.get("processed_upload_id") == uploaded_file.file_id:
+            return False
         try:
-            # Process and resize image to medium size
-            image = Image.open(uploaded_file)
-            # Resize to medium size (200x200) while maintaining aspect ratio
-            image.thumbnail((200, 200), Image.Resampling.LANCZOS)
-            
-            # Convert to base64 for storage
-            buffered = BytesIO()
-            image.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode()
-            
-            # Save to session state
-            st.session_state.user_profile["profile_picture"] = f"data:image/png;base64,{img_str}"
-            
+            # Cropped, resized and stored once per distinct picture
+            st.session_state.user_profile["avatar"] = store_avatar(uploaded_file.getvalue())
+            st.session_state.processed_upload_id = uploaded_file.file_id
+            persist_profile()
+
             st.success("✅ Profile picture uploaded successfully!")
             return True
             
@@ -108,7 +109,8 @@ def render_profile_header():
     col1, col2 = st.columns([1, 2])
     
     with col1:
-        if profile_data["profile_picture"]:
+        avatar_img = avatar_img_html(profile_data["avatar"])
+        if avatar_img:
             # Display uploaded profile picture with circular shape and medium size
             st.markdown(f"""
             <div style="
@@ -123,9 +125,7 @@ def render_profile_header():
                 margin-bottom: 10px;
                 box-shadow: 0 2px 8px rgba(0,0,0,0.1);
             ">
-                <img src="{profile_data['profile_picture']}" 
-                     style="width: 100%; height: 100%; object-fit: cover;" 
-                     alt="Profile Picture"/>
+                {avatar_img}
             </div>
             """, unsafe_allow_html=True)
         else:
@@ -213,8 +213,9 @@ def render_profile_settings():
                 profile_data["name"] = new_name.strip()
                 profile_data["font_size"] = font_size
                 
-                # Save to session state
+                # Save to session state and the profile store
                 st.session_state.user_profile = profile_data
+                persist_profile()
                 
                 # Apply font size globally (you can implement this in your main app)
                 st.session_state.global_font_size = font_size
@@ -241,12 +242,8 @@ def render_profile_settings():
             with col_confirm:
                 if st.button("✅ Yes, Reset", key="confirm_reset", use_container_width=True, type="primary"):
                     # Reset to default values
-                    st.session_state.user_profile = {
-                        "name": "",
-                        "profile_picture": None,
-                        "join_date": datetime.now().strftime("%B %Y"),
-                        "font_size": "Medium"
-                    }
+                    st.session_state.user_profile = default_profile()
+                    persist_profile()
                     # Reset global font size
                     st.session_state.global_font_size = "Medium"
                     st.session_state.show_reset_confirmation = False
@@ -286,6 +283,7 @@ def render_profile_section():
     render_profile_header()
     render_profile_settings()
     render_profile_stats()
+    render_data_portability()
     
     # Add separator
     st.markdown("---")
@@ -308,46 +306,10 @@ def get_user_font_size():
     return "Medium"
 
 
-def apply_global_font_size():
-    """
-    Apply the user's font size preference globally across the application.
-    Call this function in your main app to apply font size changes.
-    """
-    font_size = get_user_font_size()
-    
-    # Font size mappings
-    font_sizes = {
-        "Small": "14px",
-        "Medium": "16px", 
-        "Large": "18px"
-    }
-    
-    selected_size = font_sizes.get(font_size, "16px")
-    
-    # Apply CSS to change font size globally
-    st.markdown(f"""
-    <style>
-    .stApp {{
-        font-size: {selected_size};
-    }}
-    .stMarkdown, .stText, p, div, span {{
-        font-size: {selected_size} !important;
-    }}
-    .stSelectbox label, .stTextInput label, .stTextArea label {{
-        font-size: {selected_size} !important;
-    }}
-    .stButton button {{
-        font-size: {selected_size} !important;
-    }}
-    .stRadio label, .stCheckbox label {{
-        font-size: {selected_size} !important;
-    }}
-    </style>
-    """, unsafe_allow_html=True)
-
-
-def get_user_profile_picture():
-    """Get the current user's profile picture"""
+def get_user_profile_picture(size=AVATAR_SIZES[0]):
+    """Get the URL of the current user's profile picture"""
     if "user_profile" in st.session_state:
-        return st.session_state.user_profile.get("profile_picture", None)
-    return None
\ No newline at end of file
+        avatar = st.session_state.user_profile.get("avatar")
+        if avatar and has_avatar(avatar):
+            return avatar_url(avatar, size)
+    return None
@@ -0,0 +1,52 @@
+import json
+
+import streamlit as st
+
+from core.profiler import PROFILER_PANEL_ENABLED, clear_runs, get_runs
+
+
+def render_profiler_panel():
+    """
+    Admin panel; only exists when the server runs with TALKHEAL_PROFILER=1
+    and is shown when the app is opened with ?debug=profiler.
+    """
+    if not PROFILER_PANEL_ENABLED or st.query_params.get("debug") != "profiler":
+        return
+
+    with st.sidebar.expander("⏱️ Rerun profiler", expanded=True):
+        st.toggle("Record rerun timings", key="profiling_enabled")
+        runs = get_runs()
+        if not runs:
+            st.caption("No reruns recorded yet.")
+            return
+
+        for run in reversed(runs[-5:]):
+            elements = "" if run["elements"] is None else f" · {run['elements']} elements"
+            st.markdown(f"**{run['label']}** · {run['total_ms']} ms{elements}")
+            st.dataframe(
+                [
+                    {
+                        "span": "  " * span["depth"] + span["name"],
+                        "ms": span.get("ms"),
+                        "elements": span.get("elements"),
+                        "bytes": span.get("bytes"),
+                    }
+                    for span in run["spans"]
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                "Export JSON",
+                data=json.dumps(runs, indent=2),
+                file_name="talkheal_profile.json",
+                mime="application/json",
+                use_container_width=True
+            )
+        with col2:
+            if st.button("Clear", key="profiler_clear", use_container_width=True):
+                clear_runs()
+                st.rerun()
@@ -1,155 +1,116 @@
 import streamlit as st
-import webbrowser
-from datetime import datetime
-from core.utils import create_new_conversation, get_current_time
-from core.theme import get_current_theme, toggle_theme, set_palette, PALETTES
-from components.mood_dashboard import render_mood_dashboard_button, MoodTracker
+from datetime import datetime, timedelta
+from core.utils import create_new_conversation, get_current_time, cached_user_ip, get_conversation_titles, rerun_fragment
+from core.search import search_messages
+from core.titles import get_display_title
+from core.profiler import profiled
+from components.theme_toggle import render_theme_settings
 from components.profile import initialize_profile_state, render_profile_section
-from streamlit_js_eval import streamlit_js_eval
-import requests
-
-# --- Structured Emergency Resources ---
-GLOBAL_RESOURCES = [
-    {"name": "Befrienders Worldwide", "desc": "Emotional support to prevent suicide worldwide.",
-        "url": "https://www.befrienders.org/"},
-    {"name": "International Association for Suicide Prevention (IASP)", "desc": "Find a crisis center anywhere in the world.",
-     "url": "https://www.iasp.info/resources/Crisis_Centres/"},
-    {"name": "Crisis Text Line", "desc": "Text-based support available in the US, UK, Canada, and Ireland.",
-     "url": "https://www.crisistextline.org/"},
-    {"name": "The Trevor Project", "desc": "Crisis intervention and suicide prevention for LGBTQ young people.",
-     "url": "https://www.thetrevorproject.org/"},
-    {"name": "Child Helpline International", "desc": "A global network of child helplines for young people in need of help.",
-     "url": "https://www.childhelplineinternational.org/"}
-]
-
-
-def get_country_from_coords(lat, lon):
-    try:
-        url = f"https://geocode.maps.co/reverse?lat={lat}&lon={lon}"
-        resp = requests.get(url, timeout=5)
-        if resp.status_code == 200:
-            data = resp.json()
-            return data.get("address", {}).get("country_code", "").upper()
-    except:
-        pass
-    return None
-
-def get_user_country():
-    # 1. Try to get user's actual browser location (via JS)
-    coords = streamlit_js_eval(
-        js_expressions="""
-            new Promise((resolve, reject) => {
-                navigator.geolocation.getCurrentPosition(
-                    position => resolve({
-                        latitude: position.coords.latitude,
-                        longitude: position.coords.longitude
-                    }),
-                    error => resolve(null)
-                );
-            });
-        """,
-        key="get_coords"
-    )
-
-    if coords and "latitude" in coords and "longitude" in coords:
-        country = get_country_from_coords(coords["latitude"], coords["longitude"])
-        if country:
-            return country
-
-    # 2. Fallback to IP-based location using ipapi.co (no key required)
+
+# Conversations shown per "Load more" page in the sidebar
+CONVERSATION_PAGE_SIZE = 20
+
+
+def render_search_results(query):
+    """Lists ranked message snippets for the query; clicking one opens its conversation."""
+    results = search_messages(cached_user_ip(), query)
+    if not results:
+        st.caption("No messages match your search.")
+        return
+
+    titles = get_conversation_titles()
+    convo_index = {str(convo["id"]): i for i, convo in enumerate(st.session_state.conversations)}
+    for n, result in enumerate(results):
+        i = convo_index.get(result["convo_id"])
+        if i is None:
+            continue
+        convo = st.session_state.conversations[i]
+        speaker = "You" if result["sender"] == "user" else "TalkHeal"
+        if st.button(f"💬 {get_display_title(convo, titles)[:22]}", key=f"search_hit_{n}", use_container_width=True):
+            st.session_state.active_conversation = i
+            st.rerun()
+        st.caption(f"{speaker}: {result['snippet']}")
+    st.markdown("---")
+
+
+def get_date_group_label(date_str, today=None):
+    """Groups conversation dates as Today / Yesterday / the date itself."""
+    today = today or datetime.now().date()
     try:
-        resp = requests.get("https://ipapi.co/json/", timeout=3)
-        if resp.status_code == 200:
-            return resp.json().get("country_code", "").upper()
-    except:
-        pass
-
-    return None  # final fallback if everything fails
-
-country_helplines = {
-    "US": [
-        "National Suicide Prevention Lifeline: 988",
-        "Crisis Text Line: Text HOME to 741741",
-        "SAMHSA National Helpline: 1-800-662-4357"
-    ],
-    "IN": [
-        "AASRA: 9152987821",
-        "Sneha Foundation: 044-24640050"
-    ],
-    "GB": [
-        "Samaritans: 116 123"
-    ],
-    "AU": [
-        "Lifeline: 13 11 14"
-    ]
-}
-IASP_LINK = "https://findahelpline.com/"
-
-mental_health_resources_full = {
-    "Depression & Mood Disorders": {
-        "description": "Information on understanding and coping with depression, persistent depressive disorder, and other mood-related challenges.",
-        "links": [
-            {"label": "NIMH - Depression",
-                "url": "https://www.nimh.nih.gov/health/topics/depression"},
-            {"label": "Mayo Clinic - Depression",
-                "url": "https://www.mayoclinic.org/diseases-conditions/depression/symptoms-causes/syc-20356007"}
-        ]
-    },
-    "Anxiety & Panic Disorders": {
-        "description": "Guidance on managing generalized anxiety, social anxiety, panic attacks, and phobias.",
-        "links": [
-            {"label": "ADAA - Anxiety & Depression", "url": "https://adaa.org/"},
-            {"label": "NIMH - Anxiety Disorders",
-                "url": "https://www.nimh.nih.gov/health/topics/anxiety-disorders"}
-        ]
-    },
-    "Bipolar Disorder": {
-        "description": "Understanding the complexities of bipolar disorder, including mood swings and treatment options.",
-        "links": [
-            {"label": "NIMH - Bipolar Disorder",
-                "url": "https://www.nimh.nih.gov/health/topics/bipolar-disorder"}
-        ]
-    },
-    "PTSD & Trauma": {
-        "description": "Resources for individuals experiencing post-traumatic stress disorder and other trauma-related conditions.",
-        "links": [
-            {"label": "PTSD: National Center", "url": "https://www.ptsd.va.gov/"}
-        ]
-    },
-    "OCD & Related Disorders": {
-        "description": "Support and information for obsessive-compulsive disorder, body dysmorphic disorder, and hoarding disorder.",
-        "links": [
-            {"label": "IOCDF - OCD", "url": "https://iocdf.org/"}
-        ]
-    },
-    "Coping Skills & Self-Care": {
-        "description": "Practical strategies and techniques for stress management, emotional regulation, and daily well-being.",
-        "links": [
-            {"label": "HelpGuide - Stress Management",
-                "url": "https://www.helpguide.org/articles/stress/stress-management.htm"}
-        ]
-    },
-    "Therapy & Treatment Options": {
-        "description": "Overview of various therapeutic approaches, including CBT, DBT, and finding a therapist.",
-        "links": [
-            {"label": "APA - Finding a Therapist",
-                "url": "https://www.apa.org/helpcenter/choose-therapist"}
-        ]
-    }
-}
+        day = datetime.strptime(date_str, "%B %d, %Y").date()
+    except (TypeError, ValueError):
+        return "Earlier"
+    if day == today:
+        return "Today"
+    if day == today - timedelta(days=1):
+        return "Yesterday"
+    return date_str
+
+
+@st.fragment
+def render_conversation_list():
+    """
+    Renders only the first `conversation_list_limit` conversations (newest
+    first) grouped by date, with a "Load more" button for the rest. Widget
+    count per rerun stays bounded by the page size, not the history length.
+    Runs as a fragment: paging reruns only the list, while opening or
+    deleting a conversation reruns the app.
+    """
+    if "conversation_list_limit" not in st.session_state:
+        st.session_state.conversation_list_limit = CONVERSATION_PAGE_SIZE
+
+    conversations = st.session_state.conversations
+    visible = conversations[:st.session_state.conversation_list_limit]
+    titles = get_conversation_titles()
+
+    current_group = None
+    for i, convo in enumerate(visible):
+        group = get_date_group_label(convo.get("date"))
+        if group != current_group:
+            st.caption(group)
+            current_group = group
+
+        is_active = i == st.session_state.active_conversation
+        button_style_icon = "🟢" if is_active else "📝"
+
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            if st.button(
+                f"{button_style_icon} {get_display_title(convo, titles)[:22]}...",
+                key=f"convo_{i}",
+                help=f"Started: {convo['date']}",
+                use_container_width=True
+            ):
+                st.session_state.active_conversation = i
+                st.rerun()
+        with col2:
+            if convo["messages"] or convo.get("archived"):
+                if st.button("🗑️", key=f"delete_{i}", type="primary", use_container_width=True):
+                    st.session_state.delete_candidate = i
+                    st.rerun()
+            else:
+                st.button(
+                    "🗑️",
+                    key=f"delete_{i}",
+                    type="primary",
+                    use_container_width=True,
+                    disabled=True  # Disable if it's a new/empty conversation
+                )
+
+    remaining = len(conversations) - len(visible)
+    if remaining > 0:
+        if st.button(f"Load more ({remaining} older)", key="load_more_conversations", use_container_width=True):
+            st.session_state.conversation_list_limit += CONVERSATION_PAGE_SIZE
+            rerun_fragment()
 
 
+@profiled
 def render_sidebar():
     """Renders the left and right sidebars."""
     
     with st.sidebar:
         render_profile_section()
 
-        # st.markdown("### 📂 Explore")
-        # st.page_link("pages/Journaling.py", label="📝 Journaling", use_container_width=True)
-        # st.page_link("pages/Yoga.py", label="🧘 Yoga", use_container_width=True)
-        # st.markdown("---")
-
         st.markdown("### 💬 Conversations")
 
         if "show_quick_start_prompts" not in st.session_state:
@@ -184,37 +145,18 @@ def render_sidebar():
 
             st.markdown("---")
 
+        search_query = st.text_input(
+            "Search conversations",
+            key="conversation_search",
+            placeholder="🔍 Search past chats...",
+            label_visibility="collapsed"
+        )
+        if search_query.strip():
+            render_search_results(search_query)
 
         if st.session_state.conversations:
             if "delete_candidate" not in st.session_state:
-                for i, convo in enumerate(st.session_state.conversations):
-                    is_active = i == st.session_state.active_conversation
-                    button_style_icon = "🟢" if is_active else "📝"
-
-                    col1, col2 = st.columns([5, 1])
-                    with col1:
-                        if st.button(
-                            f"{button_style_icon} {convo['title'][:22]}...",
-                            key=f"convo_{i}",
-                            help=f"Started: {convo['date']}",
-                            use_container_width=True
-                        ):
-                            st.session_state.active_conversation = i
-                            st.rerun()
-                    with col2:
-                        if convo["messages"]:
-                            if st.button("🗑️", key=f"delete_{i}", type="primary", use_container_width=True):
-                                st.session_state.delete_candidate = i
-                                st.rerun()
-                        else:
-                                st.button(
-                                "🗑️",
-                                key=f"delete_{i}",
-                                type="primary",
-                                use_container_width=True,
-                                disabled=not convo["messages"]  # Disable if it's a new/empty conversation
-                            )
-
+                render_conversation_list()
 
             else:
                 st.warning(
@@ -222,10 +164,12 @@ def render_sidebar():
                 col_confirm, col_cancel = st.columns(2)
 
                 if col_confirm.button("Yes, delete", key="confirm_delete"):
-                    del st.session_state.conversations[st.session_state.delete_candidate]
+                    deleted = st.session_state.conversations.pop(st.session_state.delete_candidate)
 
-                    from core.utils import save_conversations
+                    from core.utils import save_conversations, unindex_conversation, discard_conversation_archive
                     save_conversations(st.session_state.conversations)
+                    unindex_conversation(deleted)
+                    discard_conversation_archive(deleted)
 
                     del st.session_state.delete_candidate
                     st.session_state.active_conversation = -1
@@ -252,301 +196,7 @@ def render_sidebar():
             st.session_state.show_emergency_page = True
             st.rerun()
 
-        # # --- FOCUS SESSION BUTTON ---
-        # if st.button("🧘 Focus Session", use_container_width=True, type="secondary", key="focus_session_button"):
-        #     st.session_state.show_focus_session = True
-        #     st.rerun()
-
-        # # --- MOOD DASHBOARD BUTTON ---
-        # render_mood_dashboard_button()
-
-        # --- 3. Dynamic Mood Tracker & Micro-Journal (Fixed Tip & New Button) ---
-        # with st.expander("🧠 Mental Health Check"):
-        #     st.markdown("**How are you feeling today?**")
-
-        #     mood_options_map = {
-        #         "😔 Very Low": "very_low",
-        #         "😐 Low": "low",
-        #         "😊 Okay": "okay",
-        #         "😄 Good": "good",
-        #         "🌟 Great": "great"
-        #     }
-        #     mood_labels = list(mood_options_map.keys())
-
-        #     selected_mood_label = st.radio(
-        #         "Mood Scale",
-        #         options=mood_labels,
-        #         index=mood_labels.index(
-        #             "😊 Okay") if "😊 Okay" in mood_labels else 2,
-        #         key="mood_selector_radio",
-        #         horizontal=True,
-        #         label_visibility="collapsed"
-        #     )
-
-        #     st.session_state.current_mood_val = mood_options_map[selected_mood_label]
-        #     if st.session_state.current_mood_val:
-        #         st.markdown("")
-        #         journal_prompt_text = {
-        #             "very_low": "What's weighing on your mind today?",
-        #             "low": "What are your thoughts right now?",
-        #             "okay": "Anything specific on your mind today?",
-        #             "good": "What made you feel good today?",
-        #             "great": "What's making you shine today?"
-        #         }.get(st.session_state.current_mood_val, "Reflect on your mood:")
-
-        #         # Initialize journal entry for the current session
-        #         if "mood_journal_entry" not in st.session_state:
-        #             st.session_state.mood_journal_entry = ""
-        #         # Initialize state for displaying tips and status
-        #         if "mood_tip_display" not in st.session_state:
-        #             st.session_state.mood_tip_display = ""
-        #         if "mood_entry_status" not in st.session_state:
-        #             st.session_state.mood_entry_status = ""
-
-        #         st.text_area(
-        #             f"✏️ {journal_prompt_text}",
-        #             key="mood_journal_area",
-        #             value=st.session_state.mood_journal_entry,
-        #             height=70
-        #         )
-
-        #         # Context reason dropdown
-        #         st.markdown("**Why are you feeling this way?**")
-        #         context_reasons = ["No specific reason", "Work", "Family", "Health", "Relationships", "Financial", "Social", "Personal goals", "Weather", "Other"]
-        #         selected_reason = st.selectbox(
-        #             "Select a reason (optional):",
-        #             options=context_reasons,
-        #             key="mood_context_reason",
-        #             label_visibility="collapsed"
-        #         )
-
-        #         # Activity checkboxes
-        #         st.markdown("**What did you do today?** (optional)")
-        #         activities = []
-        #         col1, col2 = st.columns(2)
-        #         with col1:
-        #             if st.checkbox("✅ Exercise", key="activity_exercise"):
-        #                 activities.append("Exercise")
-        #             if st.checkbox("✅ Socialized", key="activity_socialized"):
-        #                 activities.append("Socialized")
-        #         with col2:
-        #             if st.checkbox("✅ Ate healthy", key="activity_healthy_eating"):
-        #                 activities.append("Ate healthy")
-        #             if st.checkbox("✅ Slept well", key="activity_slept_well"):
-        #                 activities.append("Slept well")
-
-        #         tips_for_mood = {
-        #             "very_low": "Remember, it's okay not to be okay. Consider connecting with a professional.",
-        #             "low": "Even small steps help. Try a brief mindful moment or gentle activity.",
-        #             "okay": "Keep nurturing your well-being. What's one thing you can do to maintain this?",
-        #             "good": "That's wonderful! Savor this feeling and perhaps share your positivity.",
-        #             "great": "Fantastic! How can you carry this energy forward into your day?"
-        #         }.get(st.session_state.current_mood_val, "A general tip for your mood.")
-
-        #         st.markdown("")
-        #         col_tip_save, col_ask_TalkHeal = st.columns(2)
-
-        #         with col_tip_save:
-        #             if st.button("Get Tip & Save Entry", key="save_mood_entry", use_container_width=True):
-        #                 # Save to mood dashboard
-        #                 if "mood_tracker" not in st.session_state:
-        #                     st.session_state.mood_tracker = MoodTracker()
-                        
-        #                 mood_level = st.session_state.current_mood_val
-        #                 notes = st.session_state.get("mood_journal_area", "")
-        #                 context_reason = st.session_state.get("mood_context_reason", "No specific reason")
-        #                 activities = []
-        #                 if st.session_state.get("activity_exercise", False):
-        #                     activities.append("Exercise")
-        #                 if st.session_state.get("activity_socialized", False):
-        #                     activities.append("Socialized")
-        #                 if st.session_state.get("activity_healthy_eating", False):
-        #                     activities.append("Ate healthy")
-        #                 if st.session_state.get("activity_slept_well", False):
-        #                     activities.append("Slept well")
-                        
-        #                 st.session_state.mood_tracker.add_mood_entry(mood_level, notes, context_reason, activities)
-                        
-        #                 st.session_state.mood_tip_display = tips_for_mood
-        #                 st.session_state.mood_entry_status = f"Your mood entry for '{selected_mood_label}' has been saved to your dashboard!"
-        #                 st.session_state.mood_journal_entry = ""
-
-        #         with col_ask_TalkHeal:
-        #             if st.button("Ask TalkHeal", key="ask_peace_pulse_from_mood", use_container_width=True):
-        #                 if st.session_state.mood_journal_area.strip():
-        #                     st.session_state.pre_filled_chat_input = st.session_state.mood_journal_area
-        #                     st.session_state.send_chat_message = True
-        #                     st.session_state.mood_journal_entry = ""
-        #                     st.session_state.mood_tip_display = ""
-        #                     st.session_state.mood_entry_status = ""
-        #                     st.rerun()
-        #                 else:
-        #                     st.warning(
-        #                         "Please enter your thoughts before asking TalkHeal.")
-
-        #         if st.session_state.mood_tip_display:
-        #             st.success(st.session_state.mood_tip_display)
-        #             st.session_state.mood_tip_display = ""
-        #         if st.session_state.mood_entry_status:
-        #             st.info(st.session_state.mood_entry_status)
-        #             st.session_state.mood_entry_status = ""
-
-        # # --- 4. Resource Hub with Categories & Search ---
-        # with st.expander("📚 Resources & Knowledge Base"):
-        #     st.markdown("**Explore topics or search for help:**")
-
-        #     resource_search_query = st.text_input(
-        #         "Search resources...", key="resource_search", placeholder="e.g., 'anxiety tips', 'therapy'", label_visibility="collapsed")
-
-        #     if resource_search_query:
-        #         filtered_topics = [
-        #             topic for topic in mental_health_resources_full
-        #             if resource_search_query.lower() in topic.lower() or
-        #             any(resource_search_query.lower() in link['label'].lower() for link in mental_health_resources_full[topic]['links']) or
-        #             resource_search_query.lower(
-        #             ) in mental_health_resources_full[topic]['description'].lower()
-        #         ]
-
-        #         if not filtered_topics:
-        #             st.info("No resources found matching your search.")
-        #         else:
-        #             st.markdown("---")
-        #             st.markdown("**Matching Resources:**")
-        #             for topic in filtered_topics:
-        #                 st.markdown(f"**{topic}**")
-        #                 st.info(
-        #                     mental_health_resources_full[topic]['description'])
-        #                 for link in mental_health_resources_full[topic]['links']:
-        #                     st.markdown(f"• [{link['label']}]({link['url']})")
-        #                 st.markdown("---")
-        #     else:
-        #         resource_tabs = st.tabs(
-        #             list(mental_health_resources_full.keys()))
-
-        #         for i, tab_title in enumerate(mental_health_resources_full.keys()):
-        #             with resource_tabs[i]:
-        #                 topic_data = mental_health_resources_full[tab_title]
-        #                 st.markdown(f"**{tab_title}**")
-        #                 st.info(topic_data['description'])
-        #                 for link in topic_data['links']:
-        #                     st.markdown(f"• [{link['label']}]({link['url']})")
-        #                 st.markdown("---")
-
-        # with st.expander("☎️ Crisis Support"):
-        #     st.markdown("**24/7 Crisis Hotlines:**")
-        #     for resource in GLOBAL_RESOURCES:
-        #         st.markdown(
-        #             f"**{resource['name']}**: {resource['desc']} [Visit Website]({resource['url']})")
-            
-        #     # Provide localized helplines based on user's country
-        #     user_country = get_user_country()
-        #     country_label = user_country if user_country else "your country"
-        #     st.markdown("### 🚨 Emergency Help")
-        #     if user_country and user_country in country_helplines:
-        #         st.markdown(f"**Helplines for {country_label}:**")
-        #         for line in country_helplines[user_country]:
-        #             st.markdown(f"• {line}")
-        #     else:
-        #         st.markdown(
-        #             f"Couldn't detect a local helpline for {country_label}. [Find help worldwide via IASP]({IASP_LINK})"
-        #         )
-
-        #     st.markdown("---")
-
         # Theme toggle in sidebar
         with st.expander("🎨 Theme Settings"):
-            current_theme = get_current_theme()
-            is_dark = current_theme["name"] == "Dark"
-
-            # Palette selector (only for light mode)
-            if not is_dark:
-                palette_names = [p["name"] for p in PALETTES]
-                selected_palette = st.selectbox(
-                    "Choose a soothing color palette:",
-                    palette_names,
-                    index=palette_names.index(
-                        st.session_state.get("palette_name", "Light")),
-                    key="palette_selector",
-                )
-                if selected_palette != st.session_state.get("palette_name", "Light"):
-                    set_palette(selected_palette)
-
-            # Current theme display with better styling
-            st.markdown("""
-            <div class="theme-info-box">
-                <strong>Current Theme:</strong><br>
-                <span>{} Mode</span>
-            </div>
-            """.format(current_theme['name']), unsafe_allow_html=True)
-
-            # Theme toggle button with better styling
-            button_text = "🌙 Dark Mode" if not is_dark else "☀️ Light Mode"
-            button_color = "primary" if not is_dark else "secondary"
-
-            if st.button(
-                button_text,
-                key="sidebar_theme_toggle",
-                use_container_width=True,
-                type=button_color
-            ):
-                toggle_theme()
-
-#         # Quizzes expander (no longer contains nested expander)
-#         with st.expander("🧪 Take PsyToolkit Verified Quizzes"):
-#             st.markdown("""
-#             Explore scientifically backed quizzes to better understand your mental well-being. These tools are for **self-awareness** and not clinical diagnosis.
-#             """)
-
-#             quizzes = [
-#                 {
-#                     "name": "GAD-7 (Anxiety Assessment)",
-#                     "desc": "Measures severity of generalized anxiety symptoms.",
-#                     "url": "https://www.psytoolkit.org/cgi-bin/3.6.0/survey?s=u8bAf",
-#                     "score_info": """
-#                     Score Interpretation:
-#                     GAD-7 score runs from 0 to 21
-#                     - 0–4: Minimal anxiety  
-#                     - 5–9: Mild anxiety  
-#                     - 10–14: Moderate anxiety  
-#                     - 15–21: Severe anxiety
-#                     """
-#                 },
-#                 {
-#                     "name": "PHQ-9 (Depression Assessment)",
-#                     "desc": "Screens for presence and severity of depression.",
-#                     "url": "https://www.psytoolkit.org/cgi-bin/3.6.0/survey?s=Hj32b",
-#                     "score_info": """
-#                     Score Interpretation:
-#                     - 0–4: Mild depression  
-#                     - 5–9: Moderate depression  
-#                     - 10–14: Moderately severe depression  
-#                     - 15–19: Severe depression 
-#                     """
-#                 },
-#                 {
-#                     "name": "The WHO-5 Well-Being Index",
-#                     "desc": "Five simple non-intrusive questions to assess well-being. Score ranges from 0 (poor) to 100 (excellent).",
-#                     "url": "https://www.psytoolkit.org/cgi-bin/3.6.0/survey?s=POqLJ",
-#                     "score_info": """
-#                     Score Interpretation:
-#                     -if your score is 50 or lower you should consider 
-#                     -further checks on whether you suffer 
-#                     -from clinical depression
-#                     """
-#                 },
-#                {
-#     "name": "Depression Anxiety Stress Scales (DASS)",
-#     "desc": "Measures depression, anxiety, and stress using one combined questionnaire.",
-#     "url": "https://www.psytoolkit.org/cgi-bin/3.6.0/survey?s=HvfDY",
-#     "score_info": "**Score Interpretation (per subscale):**\n\n- **Normal, Mild, Moderate, Severe, Extremely Severe**\n\n|          | Depression | Anxiety | Stress  |\n|----------|------------|---------|---------|\n| Normal   | 0-9        | 0-7     | 0-14    |\n| Mild     | 10-13      | 8-9     | 15-18   |\n| Moderate | 14-20      | 10-14   | 19-25   |\n| Severe   | 21-27      | 15-19   | 26-33   |\n| Extremely Severe | 28+ | 20+ | 34+ |"
-# }
-#             ]
-
-#             for quiz in quizzes:
-#                 st.markdown(f"""
-#                 **{quiz['name']}**  
-#                 *{quiz['desc']}*  
-#                 [🔗 Take Quiz]({quiz['url']})  
-#                 {quiz['score_info']}
-#                 """)
-
+            # Palette swatches and light/dark toggle, applied in the browser without a rerun
+            render_theme_settings()
@@ -1,68 +1,156 @@
+"""
+Client-side theme switching.
+
+The compiled stylesheet (css/styles.py) already holds every theme's CSS
+variables and background, keyed by a ``data-theme`` attribute on <html>.
+The switcher flips that attribute in the browser, so a new palette or dark
+mode shows up instantly with nothing rebuilt or resent. The choice is then
+reported to the server as a trigger, which only reruns the switcher's own
+fragment to persist it in session state for the next full rerun.
+"""
+
+from functools import lru_cache
+
 import streamlit as st
-from core.theme import toggle_theme, get_current_theme
 
-def render_theme_toggle():
-    """Render the theme toggle button in the top right corner."""
-    current_theme = get_current_theme()
-    is_dark = current_theme["name"] == "Dark"
-    
-    # Create a container for the theme toggle
-    with st.container():
-        # Use columns to position the toggle on the right
-        col1, col2, col3 = st.columns([0.7, 0.2, 0.1])
-        
-        with col3:
-            # Theme toggle button
-            button_text = "🌙 Dark Mode" if is_dark else "☀️ Light Mode"
-            button_color = "primary" if is_dark else "secondary"
-            
-            if st.button(
-                button_text,
-                key="theme_toggle",
-                help="Toggle Light/Dark Mode",
-                use_container_width=True,
-                type=button_color
-            ):
-                toggle_theme()
-        
-        # Add some custom CSS to style the toggle button
-        st.markdown("""
-        <style>
-        /* Theme toggle button styling - consistent with sidebar */
-        [data-testid="stButton"] > button[key="theme_toggle"] {
-            background: var(--light-transparent-bg) !important;
-            color: var(--text-primary) !important;
-            border: 1px solid var(--light-transparent-border) !important;
-            border-radius: var(--radius) !important;
-            padding: 12px 16px !important;
-            font-weight: 600 !important;
-            transition: all 0.2s ease !important;
-            font-family: 'Inter', sans-serif !important;
-            box-shadow: 0 2px 8px var(--shadow) !important;
-            backdrop-filter: blur(5px) !important;
-            white-space: nowrap !important;
-            text-overflow: ellipsis !important;
-            overflow: hidden !important;
-            min-height: 44px !important;
-            display: flex !important;
-            align-items: center !important;
-            justify-content: center !important;
-            font-size: 0.9em !important;
-            line-height: 1.2 !important;
-            word-break: keep-all !important;
-        }
-        
-        [data-testid="stButton"] > button[key="theme_toggle"]:hover {
-            background: var(--light-transparent-bg-hover) !important;
-            transform: translateY(-1px) !important;
-            box-shadow: 0 4px 12px var(--shadow-lg) !important;
-        }
-        
-        /* Ensure button text doesn't wrap */
-        [data-testid="stButton"] > button[key="theme_toggle"] span {
-            white-space: nowrap !important;
-            overflow: hidden !important;
-            text-overflow: ellipsis !important;
+from core.theme import PALETTES, get_current_theme, get_theme_key, initialize_theme_state
+
+THEME_SWITCHER_CSS = """
+.theme-switcher { display: flex; flex-direction: column; gap: 10px; font-family: var(--font-body, sans-serif); }
+.theme-switcher button {
+    background: var(--light-transparent-bg, rgba(255,255,255,0.4));
+    color: var(--st-text-color);
+    border: 1px solid var(--light-transparent-border, rgba(255,255,255,0.5));
+    border-radius: 12px;
+    padding: 8px 14px;
+    min-height: 40px;
+    font-weight: 600;
+    white-space: nowrap;
+    cursor: pointer;
+    transition: all 0.2s ease;
+}
+.theme-switcher button:hover { transform: translateY(-1px); box-shadow: 0 4px 12px rgba(0,0,0,0.15); }
+.theme-switcher .swatches { display: flex; flex-wrap: wrap; gap: 8px; }
+.theme-switcher .swatches[hidden] { display: none; }
+.theme-switcher .swatch { width: 34px; min-height: 34px; padding: 0; border-radius: 50%; }
+.theme-switcher .swatch[aria-pressed="true"] { outline: 3px solid var(--st-primary-color); outline-offset: 2px; }
+.theme-switcher .theme-info { font-size: 0.9em; color: var(--st-text-color); }
+"""
+
+THEME_SWITCHER_JS = """
+export default function(component) {
+    const { data, parentElement, setTriggerValue } = component;
+    const root = document.documentElement;
+
+    // The server's choice wins on mount; afterwards only clicks change it
+    root.dataset.palette = data.palette;
+    root.dataset.theme = data.dark_mode ? "dark" : data.palette;
+
+    let container = parentElement.querySelector(".theme-switcher");
+    if (container) {
+        container.remove();
+    }
+    container = document.createElement("div");
+    container.className = "theme-switcher";
+    parentElement.appendChild(container);
+
+    const choose = (dark, palette) => {
+        root.dataset.palette = palette;
+        root.dataset.theme = dark ? "dark" : palette;
+        setTriggerValue("theme", { dark_mode: dark, palette: palette });
+    };
+
+    const toggle = document.createElement("button");
+    toggle.title = "Toggle Light/Dark Mode";
+    toggle.onclick = () => choose(root.dataset.theme !== "dark", root.dataset.palette);
+
+    let info = null;
+    let swatches = null;
+    if (data.variant === "settings") {
+        swatches = document.createElement("div");
+        swatches.className = "swatches";
+        data.palettes.forEach((palette) => {
+            const swatch = document.createElement("button");
+            swatch.className = "swatch";
+            swatch.title = palette.name;
+            swatch.dataset.palette = palette.key;
+            swatch.style.background = palette.swatch;
+            swatch.onclick = () => choose(false, palette.key);
+            swatches.appendChild(swatch);
+        });
+        info = document.createElement("div");
+        info.className = "theme-info";
+        container.append(swatches, info, toggle);
+    } else {
+        container.append(toggle);
+    }
+
+    const update = () => {
+        const dark = root.dataset.theme === "dark";
+        if (data.variant === "settings") {
+            toggle.textContent = dark ? "☀️ Light Mode" : "🌙 Dark Mode";
+            // Palettes only apply in light mode
+            swatches.hidden = dark;
+            swatches.querySelectorAll(".swatch").forEach((swatch) => {
+                swatch.setAttribute("aria-pressed", String(swatch.dataset.palette === root.dataset.palette));
+            });
+            const palette = data.palettes.find((p) => p.key === root.dataset.palette);
+            info.textContent = `Current Theme: ${dark ? "Dark" : (palette ? palette.name : "Light")} Mode`;
+        } else {
+            toggle.textContent = dark ? "🌙" : "☀️";
         }
-        </style>
-        """, unsafe_allow_html=True) 
\ No newline at end of file
+    };
+    update();
+
+    // Keeps every switcher on the page in sync with the one that was clicked
+    const observer = new MutationObserver(update);
+    observer.observe(root, { attributes: true, attributeFilter: ["data-theme", "data-palette"] });
+    return () => observer.disconnect();
+}
+"""
+
+
+@lru_cache(maxsize=1)
+def _theme_switcher():
+    return st.components.v2.component("theme_switcher", css=THEME_SWITCHER_CSS, js=THEME_SWITCHER_JS)
+
+
+def _switcher_data(variant):
+    current = get_current_theme()
+    palette_name = st.session_state.get("palette_name", "Light")
+    return {
+        "variant": variant,
+        "dark_mode": current["name"] == "Dark",
+        "palette": next((get_theme_key(p) for p in PALETTES if p["name"] == palette_name), "light"),
+        "palettes": [
+            {"key": get_theme_key(p), "name": p["name"], "swatch": p.get("background_gradient") or p["primary"]}
+            for p in PALETTES
+        ],
+    }
+
+
+def persist_theme_choice(choice):
+    """Stores a choice reported by the switcher; the browser has already applied it."""
+    palette_names = {get_theme_key(p): p["name"] for p in PALETTES}
+    st.session_state.dark_mode = bool(choice.get("dark_mode"))
+    if choice.get("palette") in palette_names:
+        st.session_state.palette_name = palette_names[choice["palette"]]
+
+
+def _render_switcher(variant, key):
+    initialize_theme_state()
+    result = _theme_switcher()(key=key, data=_switcher_data(variant), on_theme_change=lambda: None)
+    if result.get("theme"):
+        persist_theme_choice(result["theme"])
+
+
+@st.fragment
+def render_theme_toggle():
+    """Compact light/dark toggle for the top bar."""
+    _render_switcher("toggle", "theme_toggle")
+
+
+@st.fragment
+def render_theme_settings():
+    """Palette swatches, current theme and a light/dark toggle for the sidebar."""
+    _render_switcher("settings", "theme_settings")
@@ -0,0 +1,158 @@
+"""
+Retention tiers for saved conversations.
+
+Conversations nobody has touched for a while are moved out of the hot
+``data/conversations_<owner>.json`` file into gzip-compressed archive files.
+The hot file keeps a small stub (id, title, date) so the conversation still
+shows up in the sidebar; its messages are restored the first time it is
+opened again. The archive file is only deleted once the restored
+conversation has been saved back to the hot file.
+
+Run ``python -m core.archive --days 30`` to archive in bulk.
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+ARCHIVE_DIR = "data/archive"
+CONVERSATION_FILE_PATTERN = "data/conversations_*.json"
+DEFAULT_RETENTION_DAYS = 30
+
+
+def get_archive_dir(memory_file):
+    name = os.path.splitext(os.path.basename(memory_file))[0]
+    return os.path.join(ARCHIVE_DIR, name)
+
+
+def get_archive_file(memory_file, convo_id):
+    return os.path.join(get_archive_dir(memory_file), f"{convo_id}.json.gz")
+
+
+def last_activity(convo):
+    """When the conversation was last written to (falls back to its start date)."""
+    if convo.get("updated_at"):
+        return datetime.fromisoformat(convo["updated_at"])
+    try:
+        return datetime.strptime(convo["date"], "%B %d, %Y")
+    except (KeyError, ValueError):
+        return datetime.now()
+
+
+def make_stub(convo):
+    return {
+        "id": convo["id"],
+        "title": convo["title"],
+        "date": convo["date"],
+        "updated_at": last_activity(convo).isoformat(),
+        "archived": True,
+        "message_count": len(convo["messages"]),
+        "messages": []
+    }
+
+
+def archive_conversation(memory_file, convo):
+    """Writes the full conversation to its archive file and returns the stub."""
+    path = get_archive_file(memory_file, convo["id"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, 'wt', encoding="utf-8") as f:
+        json.dump(convo, f)
+    return make_stub(convo)
+
+
+def read_archive(memory_file, convo_id):
+    """Returns the archived conversation, or None if there is no archive file."""
+    path = get_archive_file(memory_file, convo_id)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, 'rt', encoding="utf-8") as f:
+        return json.load(f)
+
+
+def restore_conversation(memory_file, convo):
+    """
+    Loads an archived conversation's messages back into ``convo`` in place.
+    Returns False if the archive file is missing. The archive file is left
+    alone: call delete_archive() only after the hot file has been saved, so
+    a crash in between never loses the conversation.
+    """
+    archived = read_archive(memory_file, convo["id"])
+    if archived is None:
+        return False
+    convo.update(archived)
+    convo.pop("archived", None)
+    convo.pop("message_count", None)
+    return True
+
+
+def delete_archive(memory_file, convo_id):
+    path = get_archive_file(memory_file, convo_id)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def archive_stale_conversations(memory_file, days=DEFAULT_RETENTION_DAYS, now=None):
+    """
+    Archives every conversation in ``memory_file`` untouched for ``days`` days.
+    Returns a report dict: archived count, hot file size before/after and the
+    compressed size written to the archive.
+    """
+    cutoff = (now or datetime.now()) - timedelta(days=days)
+    hot_before = os.path.getsize(memory_file)
+    with open(memory_file, 'r', encoding="utf-8") as f:
+        conversations = json.load(f)
+
+    archived = 0
+    archive_bytes = 0
+    for i, convo in enumerate(conversations):
+        if convo.get("archived") or not convo.get("messages"):
+            continue
+        if last_activity(convo) >= cutoff:
+            continue
+        conversations[i] = archive_conversation(memory_file, convo)
+        archive_bytes += os.path.getsize(get_archive_file(memory_file, convo["id"]))
+        archived += 1
+
+    if archived:
+        tmp_path = f"{memory_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding="utf-8") as f:
+            json.dump(conversations, f, indent=4)
+        os.replace(tmp_path, memory_file)
+
+    return {
+        "file": memory_file,
+        "archived": archived,
+        "hot_bytes_before": hot_before,
+        "hot_bytes_after": os.path.getsize(memory_file),
+        "archive_bytes": archive_bytes
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive conversations untouched for N days.")
+    parser.add_argument("--days", type=int, default=DEFAULT_RETENTION_DAYS,
+                        help=f"retention window in days (default {DEFAULT_RETENTION_DAYS})")
+    parser.add_argument("--pattern", default=CONVERSATION_FILE_PATTERN,
+                        help="conversation files to process")
+    args = parser.parse_args()
+
+    totals = {"archived": 0, "hot_bytes_before": 0, "hot_bytes_after": 0, "archive_bytes": 0}
+    for memory_file in sorted(glob.glob(args.pattern)):
+        report = archive_stale_conversations(memory_file, args.days)
+        for key in totals:
+            totals[key] += report[key]
+        print(f"{memory_file}: archived {report['archived']} conversations, "
+              f"{report['hot_bytes_before']} -> {report['hot_bytes_after']} bytes "
+              f"(+{report['archive_bytes']} compressed)")
+
+    reclaimed = totals["hot_bytes_before"] - totals["hot_bytes_after"] - totals["archive_bytes"]
+    print(f"Archived {totals['archived']} conversations. "
+          f"Hot storage: {totals['hot_bytes_before']} -> {totals['hot_bytes_after']} bytes, "
+          f"archive: {totals['archive_bytes']} bytes, reclaimed {reclaimed} bytes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+URLs for files served from ``static/``.
+
+Streamlit serves ``static/`` at ``app/static/`` (``enableStaticServing`` in
+``.streamlit/config.toml``). Pages reference images there by URL, so the
+browser downloads each one once and caches it instead of receiving a base64
+copy inlined into the page on every rerun. URLs carry a content fingerprint
+(``?v=<hash>``) so a changed file is never served stale.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+STATIC_URL = "app/static"
+
+
+def get_static_path(filename):
+    return os.path.join(STATIC_DIR, filename)
+
+
+@lru_cache(maxsize=64)
+def _fingerprint(path, mtime):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:10]
+
+
+def static_url(filename, base=STATIC_URL):
+    """
+    Fingerprinted URL for a file in static/, or None if it does not exist.
+    ``base`` is where static/ is served relative to the referring document
+    (``..`` for stylesheets that are themselves served from a static/ subdirectory).
+    """
+    path = get_static_path(filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    return f"{base}/{filename}?v={_fingerprint(path, mtime)}"
+
+
+def css_url(filename, base=STATIC_URL):
+    """``url("...")`` for use in a stylesheet; ``none`` if the file is missing."""
+    url = static_url(filename, base)
+    return f'url("{url}")' if url else "none"
+
+
+# ---------- Optimized variants (see optimize_images.py) ----------
+OPTIMIZED_DIR = os.path.join(STATIC_DIR, "optimized")
+MANIFEST_PATH = os.path.join(OPTIMIZED_DIR, "manifest.json")
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+
+
+@lru_cache(maxsize=4)
+def _read_manifest(path, mtime):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """The image manifest written by optimize_images.py; empty if it was never run."""
+    try:
+        return _read_manifest(path, os.path.getmtime(path))
+    except (OSError, ValueError):
+        return {"images": {}}
+
+
+def _variant_url(variant, base=STATIC_URL):
+    return f"{base}/{variant['file']}?v={variant['hash']}"
+
+
+def get_variant_path(filename, width, fmt, manifest=None):
+    """
+    Filesystem path of the smallest optimized variant of ``filename`` at least
+    ``width`` pixels wide in ``fmt``, or None if the manifest has none.
+    """
+    entry = (manifest or load_manifest())["images"].get(filename)
+    if not entry:
+        return None
+    candidates = sorted((v for v in entry["variants"] if v["format"] == fmt), key=lambda v: v["width"])
+    for variant in candidates:
+        if variant["width"] >= width or variant is candidates[-1]:
+            return os.path.join(STATIC_DIR, variant["file"])
+    return None
+
+
+def background_image_css(selector, filename, manifest=None, base=STATIC_URL):
+    """
+    CSS rules setting ``filename`` as the background of ``selector``.
+
+    With optimized variants in the manifest, every width gets an
+    ``image-set()`` offering AVIF, WebP and the JPEG/PNG fallback, and media
+    queries hand narrow screens the smaller widths. Browsers without
+    ``image-set()`` keep the plain fallback URL declared before it.
+    """
+    entry = (manifest or load_manifest())["images"].get(filename)
+    if not entry or not entry["variants"]:
+        return f"{selector} {{ background-image: {css_url(filename, base)}; }}"
+
+    by_width = {}
+    for variant in entry["variants"]:
+        by_width.setdefault(variant["width"], []).append(variant)
+
+    rules = []
+    widths = sorted(by_width, reverse=True)
+    for i, width in enumerate(widths):
+        variants = sorted(by_width[width], key=lambda v: entry["formats"].index(v["format"]))
+        fallback = variants[-1]
+        image_set = ", ".join(
+            f'url("{_variant_url(v, base)}") type("{MIME_TYPES[v["format"]]}")' for v in variants
+        )
+        rule = (f'{selector} {{ background-image: url("{_variant_url(fallback, base)}"); '
+                f'background-image: image-set({image_set}); }}')
+        # The widest variant is the default; each narrower one applies up to its own width
+        rules.append(rule if i == 0 else f"@media (max-width: {width}px) {{ {rule} }}")
+    return "\n".join(rules)
+
+
+# ---------- Cached file loading ----------
+# Files are read and parsed once per process and served from memory after
+# that; the cache key includes the mtime, so an edited file is picked up on
+# the next call. Callers share the returned objects and must not mutate them.
+ROOT_DIR = os.path.dirname(STATIC_DIR)
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+
+# Loaded by preload_assets() when the app starts
+PRELOAD_LOTTIES = ["yoga_animation.json"]
+
+# Decimal places kept for Lottie numbers; sub-pixel/sub-frame precision
+# beyond this is invisible on screen
+LOTTIE_PRECISION = 3
+# Editor metadata the player never reads
+LOTTIE_EDITOR_KEYS = {"meta", "mn"}
+
+
+def get_asset_path(filename):
+    return os.path.join(ASSETS_DIR, filename)
+
+
+@lru_cache(maxsize=32)
+def _read_bytes(path, mtime):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def load_bytes(path):
+    """Contents of ``path``, or None if it cannot be read."""
+    try:
+        return _read_bytes(path, os.path.getmtime(path))
+    except OSError:
+        return None
+
+
+def minify_lottie(data, precision=LOTTIE_PRECISION):
+    """Copy of a Lottie animation with rounded numbers and no editor metadata."""
+    if isinstance(data, dict):
+        return {k: minify_lottie(v, precision) for k, v in data.items() if k not in LOTTIE_EDITOR_KEYS}
+    if isinstance(data, list):
+        return [minify_lottie(v, precision) for v in data]
+    if isinstance(data, float):
+        value = round(data, precision)
+        return int(value) if value.is_integer() else value
+    return data
+
+
+@lru_cache(maxsize=32)
+def _parse_json(path, mtime, lottie):
+    data = json.loads(_read_bytes(path, mtime))
+    return minify_lottie(data) if lottie else data
+
+
+def load_json(path):
+    """Parsed JSON from ``path``, or None if it is missing or invalid."""
+    try:
+        return _parse_json(path, os.path.getmtime(path), False)
+    except (OSError, ValueError):
+        return None
+
+
+def load_lottie(filename):
+    """Minified Lottie animation from assets/, or None if it is missing or invalid."""
+    path = get_asset_path(filename)
+    try:
+        return _parse_json(path, os.path.getmtime(path), True)
+    except (OSError, ValueError):
+        return None
+
+
+def preload_assets():
+    """
+    Warms the caches with the assets pages load on first render, so the first
+    visit to a page does not pay for reading and parsing them. Cheap to call
+    again: already cached files cost one stat each.
+    """
+    load_manifest()
+    for filename in PRELOAD_LOTTIES:
+        load_lottie(filename)
@@ -0,0 +1,71 @@
+"""
+Content-addressed profile picture store.
+
+An uploaded picture is cropped to a square and saved once per content hash
+as WebP in two sizes under ``static/avatars/``, which Streamlit serves at
+``app/static/avatars/``. Pages reference avatars by URL, so the browser
+caches them instead of receiving a base64 copy on every rerun. Uploading the
+same picture again finds the existing files and does no image work. The
+hash is what a profile stores (see core/profiles.py).
+"""
+
+import hashlib
+import io
+import os
+
+from PIL import Image, ImageOps
+
+from core.assets import STATIC_DIR, STATIC_URL
+
+AVATAR_DIR = os.path.join(STATIC_DIR, "avatars")
+# Rendered at 80 CSS px: the small size covers 1x screens, the large one 2x
+AVATAR_SIZES = [96, 192]
+WEBP_QUALITY = 80
+
+
+def avatar_hash(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def get_avatar_path(digest, size, avatar_dir=AVATAR_DIR):
+    return os.path.join(avatar_dir, f"{digest}-{size}.webp")
+
+
+def has_avatar(digest, avatar_dir=AVATAR_DIR):
+    return all(os.path.exists(get_avatar_path(digest, size, avatar_dir)) for size in AVATAR_SIZES)
+
+
+def store_avatar(data, avatar_dir=AVATAR_DIR):
+    """
+    Stores an uploaded picture and returns its hash. Raises OSError (from
+    Pillow) if ``data`` is not a readable image.
+    """
+    digest = avatar_hash(data)
+    if has_avatar(digest, avatar_dir):
+        return digest
+
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+    os.makedirs(avatar_dir, exist_ok=True)
+    for size in AVATAR_SIZES:
+        square = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        path = get_avatar_path(digest, size, avatar_dir)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        square.save(tmp_path, format="WEBP", quality=WEBP_QUALITY, method=6)
+        os.replace(tmp_path, path)
+    return digest
+
+
+def avatar_url(digest, size):
+    # Content-addressed, so the URL never needs a cache-busting query
+    return f"{STATIC_URL}/avatars/{digest}-{size}.webp"
+
+
+def avatar_img_html(digest, alt="Profile Picture", style="width: 100%; height: 100%; object-fit: cover;"):
+    """``<img>`` with a srcset over both sizes, or "" if the files are gone."""
+    if not digest or not has_avatar(digest):
+        return ""
+    small, large = AVATAR_SIZES
+    return (f'<img src="{avatar_url(digest, small)}" '
+            f'srcset="{avatar_url(digest, small)} 1x, {avatar_url(digest, large)} 2x" '
+            f'style="{style}" alt="{alt}"/>')
@@ -0,0 +1,122 @@
+"""
+Shared setup for the scripts in ``pages/``.
+
+Every page starts with ``bootstrap_page()``, which sets the page config,
+runs the process-wide setup (database tables, asset cache warm-up) the
+first time any page is opened, gates login-only pages and emits the shared
+page CSS: self-hosted fonts plus, for pages with a background image, the
+background and translucent sidebar/header. That CSS is built once per
+process, so switching pages only runs the page's own code. Shared data
+such as the support resources lives in core/resources.py.
+"""
+
+import os
+from functools import lru_cache
+
+import streamlit as st
+
+from core.assets import MANIFEST_PATH, background_image_css, preload_assets
+from core.fonts import font_assets_html
+from core.profiler import begin_run
+
+LOGIN_REQUIRED_MESSAGE = "⚠️ Please login from the main page to access this page."
+
+PAGE_BACKGROUND_SELECTOR = 'html, body, [data-testid="stApp"]'
+
+PAGE_CHROME_CSS = """
+        html, body, [data-testid="stApp"] {
+            background-size: cover;
+            background-position: center;
+            background-repeat: no-repeat;
+            background-attachment: fixed;
+        }
+
+        /* Main content transparency */
+        .block-container {
+            background-color: rgba(255, 255, 255, 0);
+        }
+
+        /* Sidebar: brighter translucent background */
+        [data-testid="stSidebar"] {
+            background-color: rgba(255, 255, 255, 0.6);  /* Brighter and translucent */
+            color: black;  /* Adjusted for light background */
+        }
+
+        /* Header bar: fully transparent */
+        [data-testid="stHeader"] {
+            background-color: rgba(0, 0, 0, 0);
+        }
+
+        /* Hide left/right arrow at sidebar bottom */
+        button[title="Close sidebar"],
+        button[title="Open sidebar"] {
+            display: none !important;
+        }
+"""
+
+PAGE_FONT_CSS = """
+        [data-testid="stApp"] { font-family: var(--font-body); }
+        h1, h2, h3, h4 { font-family: var(--font-heading); }
+"""
+
+# Setup steps already run in this process, by name
+_completed_setup = set()
+
+
+def run_once(name, setup):
+    """Runs ``setup()`` the first time ``name`` is seen in this process."""
+    if name not in _completed_setup:
+        setup()
+        _completed_setup.add(name)
+
+
+def _init_users_db():
+    from auth.auth_utils import init_db
+    init_db()
+
+
+def setup_process():
+    """Process-wide setup shared by the main app and every page."""
+    run_once("users_db", _init_users_db)
+    run_once("assets", preload_assets)
+
+
+def _manifest_mtime():
+    try:
+        return os.path.getmtime(MANIFEST_PATH)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=32)
+def _background_css(selector, filename, manifest_mtime):
+    return background_image_css(selector, filename)
+
+
+def page_background_css(selector, filename):
+    """background_image_css(), built once per process until optimize_images.py rewrites the manifest."""
+    return _background_css(selector, filename, _manifest_mtime())
+
+
+@lru_cache(maxsize=16)
+def _page_css(background, manifest_mtime):
+    css = PAGE_FONT_CSS
+    if background:
+        css += _background_css(PAGE_BACKGROUND_SELECTOR, background, manifest_mtime) + PAGE_CHROME_CSS
+    return f"{font_assets_html()}<style>{css}</style>"
+
+
+def bootstrap_page(title, background=None, layout="centered", require_login=False):
+    """
+    Common top of a page script. Must be the first Streamlit call on the
+    page. With ``require_login`` the page stops after a warning unless the
+    user signed in on the main page.
+    """
+    st.set_page_config(page_title=title, layout=layout)
+    begin_run(title)
+    setup_process()
+    st.markdown(_page_css(background, _manifest_mtime()), unsafe_allow_html=True)
+
+    if require_login and not st.session_state.get("user_email"):
+        st.warning(LOGIN_REQUIRED_MESSAGE)
+        st.stop()
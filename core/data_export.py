@@ -0,0 +1,334 @@
+"""
+Streaming export/import of a user's history as NDJSON.
+
+Every line of an export is one JSON record with a ``type`` field:
+
+    {"type": "header", "format": "talkheal-export", "version": 1, ...}
+    {"type": "conversation", "id": ..., "title": ..., "date": ..., "updated_at": ...}
+    {"type": "message", "conversation_id": ..., "sender": ..., "message": ..., "time": ...}
+    {"type": "journal_entry", "id": ..., "entry": ..., "sentiment": ..., "date": ...}
+    {"type": "focus_log", "date": ..., "duration": ..., "completed": ...}
+
+Exports are produced by generators one record at a time, so memory use does
+not grow with the size of the history. Imports check the type of every
+field and insert in batches; records already present are skipped, so
+re-importing an export does not duplicate anything.
+
+Mood entries live in one file shared by every user (core/mood_store.py),
+so they are neither exported nor imported until that store is per-user.
+``mood_entry`` lines in older exports are validated and skipped.
+
+    python -m core.data_export export OUT.ndjson --owner <ip> --email <email>
+    python -m core.data_export import IN.ndjson --owner <ip> --email <email>
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+from datetime import datetime
+from uuid import uuid4
+
+from core.archive import read_archive
+from core.search import index_messages
+from core.utils import save_conversations
+
+EXPORT_FORMAT = "talkheal-export"
+EXPORT_VERSION = 1
+JOURNAL_DB_PATH = "journals.db"
+IMPORT_BATCH_SIZE = 1000
+
+# record type -> {field: accepted types}
+REQUIRED_FIELDS = {
+    "header": {"format": str, "version": int},
+    "conversation": {"id": (str, int), "title": str, "date": str},
+    "message": {"conversation_id": (str, int), "sender": str, "message": str, "time": str},
+    "mood_entry": {"timestamp": str, "mood_level": str},
+    "journal_entry": {"entry": str, "sentiment": str, "date": str},
+    "focus_log": {"date": str, "duration": (int, float)},
+}
+OPTIONAL_FIELDS = {
+    "conversation": {"updated_at": (str, type(None))},
+    "journal_entry": {"id": str},
+    "focus_log": {"completed": bool},
+}
+# Parsed with datetime.fromisoformat() once imported
+ISO_TIMESTAMP_FIELDS = {"conversation": "updated_at", "mood_entry": "timestamp"}
+
+
+class ImportValidationError(ValueError):
+    """Raised when a line of an import file is not a valid export record."""
+
+    def __init__(self, line_number, reason):
+        super().__init__(f"Line {line_number}: {reason}")
+        self.line_number = line_number
+
+
+def get_memory_file_for(owner):
+    return f"data/conversations_{owner}.json"
+
+
+# ---------- Export ----------
+
+def iter_conversation_records(memory_file):
+    if not os.path.exists(memory_file):
+        return
+    with open(memory_file, 'r', encoding="utf-8") as f:
+        conversations = json.load(f)
+    for convo in conversations:
+        if convo.get("archived"):
+            convo = read_archive(memory_file, convo["id"]) or convo
+        yield {
+            "type": "conversation",
+            "id": convo["id"],
+            "title": convo["title"],
+            "date": convo["date"],
+            "updated_at": convo.get("updated_at"),
+        }
+        for msg in convo.get("messages", []):
+            yield {
+                "type": "message",
+                "conversation_id": convo["id"],
+                "sender": msg["sender"],
+                "message": msg["message"],
+                "time": msg.get("time", ""),
+            }
+
+
+def iter_journal_records(email, db_path=JOURNAL_DB_PATH):
+    if not email or not os.path.exists(db_path):
+        return
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.execute(
+            "SELECT id, entry, sentiment, date FROM journal_entries WHERE email = ? ORDER BY date",
+            (email,)
+        )
+        for entry_id, entry, sentiment, date in cursor:
+            yield {"type": "journal_entry", "id": entry_id, "entry": entry, "sentiment": sentiment, "date": date}
+    except sqlite3.OperationalError:
+        return
+    finally:
+        conn.close()
+
+
+def iter_export_records(memory_file, email=None, focus_logs=(), journal_db=JOURNAL_DB_PATH):
+    """Yields every record of a user's history, header first."""
+    yield {
+        "type": "header",
+        "format": EXPORT_FORMAT,
+        "version": EXPORT_VERSION,
+        "exported_at": datetime.now().isoformat(),
+    }
+    yield from iter_conversation_records(memory_file)
+    yield from iter_journal_records(email, journal_db)
+    for log in focus_logs:
+        yield {"type": "focus_log", **log}
+
+
+def iter_ndjson_lines(records):
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def write_export(path, records):
+    """Streams records to ``path`` as NDJSON. Returns the number of records written."""
+    count = 0
+    with open(path, 'w', encoding="utf-8") as f:
+        for line in iter_ndjson_lines(records):
+            f.write(line)
+            count += 1
+    return count
+
+
+# ---------- Import ----------
+
+def _has_type(value, types):
+    # bool is an int subclass, but True is not a valid duration or version
+    if isinstance(value, bool) and bool not in (types if isinstance(types, tuple) else (types,)):
+        return False
+    return isinstance(value, types)
+
+
+def validate_record(record, line_number):
+    """Raises ImportValidationError unless every known field has the expected type."""
+    record_type = record.get("type")
+    if record_type not in REQUIRED_FIELDS:
+        raise ImportValidationError(line_number, f"unknown record type {record_type!r}")
+    fields = REQUIRED_FIELDS[record_type]
+    missing = [field for field in fields if field not in record]
+    if missing:
+        raise ImportValidationError(line_number, f"{record_type} is missing {', '.join(missing)}")
+
+    fields = {**fields, **OPTIONAL_FIELDS.get(record_type, {})}
+    for field, types in fields.items():
+        if field in record and not _has_type(record[field], types):
+            raise ImportValidationError(line_number, f"{record_type} has an invalid {field}")
+    timestamp_field = ISO_TIMESTAMP_FIELDS.get(record_type)
+    if isinstance(record.get(timestamp_field), str):
+        try:
+            datetime.fromisoformat(record[timestamp_field])
+        except ValueError:
+            raise ImportValidationError(line_number, f"{record_type} has an invalid {timestamp_field}")
+
+
+def iter_import_records(lines):
+    """Parses and validates NDJSON lines, yielding records (header excluded)."""
+    seen_header = False
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ImportValidationError(line_number, f"invalid JSON ({e.msg})")
+        if not isinstance(record, dict):
+            raise ImportValidationError(line_number, "record is not an object")
+
+        validate_record(record, line_number)
+        if record["type"] == "header":
+            if record["format"] != EXPORT_FORMAT or record["version"] > EXPORT_VERSION:
+                raise ImportValidationError(line_number, "not a supported TalkHeal export")
+            seen_header = True
+            continue
+        if not seen_header:
+            raise ImportValidationError(line_number, "export header missing")
+        yield record
+
+
+def import_records(records, conversations, email=None, focus_logs=None,
+                   journal_db=JOURNAL_DB_PATH, progress_callback=None):
+    """
+    Merges imported records into the in-memory ``conversations`` list (and
+    ``focus_logs`` if given) and batch-inserts journal entries for ``email``.
+    Conversations and journal entries that already exist are skipped, as are
+    focus logs with a known (date, duration); mood entries are skipped.
+    ``progress_callback(processed)`` is called after every batch.
+    Returns a dict of counts per record type.
+    """
+    counts = {record_type: 0 for record_type in REQUIRED_FIELDS if record_type not in ("header", "mood_entry")}
+    existing_ids = {str(convo["id"]) for convo in conversations}
+    focus_keys = {(log.get("date"), log.get("duration")) for log in focus_logs or ()}
+    imported_convos = {}
+    journal_batch = []
+
+    conn = sqlite3.connect(journal_db) if email else None
+    if conn is not None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS journal_entries (
+                id TEXT PRIMARY KEY,
+                email TEXT,
+                entry TEXT,
+                sentiment TEXT,
+                date TEXT
+            )
+        """)
+
+    def flush_journal():
+        if conn is not None and journal_batch:
+            conn.executemany(
+                "INSERT OR IGNORE INTO journal_entries (id, email, entry, sentiment, date) VALUES (?, ?, ?, ?, ?)",
+                journal_batch
+            )
+            conn.commit()
+        journal_batch.clear()
+
+    processed = 0
+    try:
+        for record in records:
+            record_type = record.pop("type")
+            if record_type == "conversation":
+                if str(record["id"]) in existing_ids:
+                    continue
+                convo = {
+                    "id": record["id"],
+                    "title": record["title"],
+                    "date": record["date"],
+                    "updated_at": record.get("updated_at") or datetime.now().isoformat(),
+                    "messages": []
+                }
+                imported_convos[str(record["id"])] = convo
+                conversations.append(convo)
+            elif record_type == "message":
+                convo = imported_convos.get(str(record["conversation_id"]))
+                if convo is None:
+                    continue
+                convo["messages"].append({
+                    "sender": record["sender"],
+                    "message": record["message"],
+                    "time": record["time"]
+                })
+            elif record_type == "mood_entry":
+                continue
+            elif record_type == "journal_entry":
+                if conn is None:
+                    continue
+                journal_batch.append((
+                    record.get("id") or str(uuid4()), email, record["entry"], record["sentiment"], record["date"]
+                ))
+                if len(journal_batch) >= IMPORT_BATCH_SIZE:
+                    flush_journal()
+            elif record_type == "focus_log":
+                if focus_logs is None or (record["date"], record["duration"]) in focus_keys:
+                    continue
+                focus_keys.add((record["date"], record["duration"]))
+                focus_logs.append(record)
+
+            counts[record_type] += 1
+            processed += 1
+            if progress_callback and processed % IMPORT_BATCH_SIZE == 0:
+                progress_callback(processed)
+        flush_journal()
+    finally:
+        if conn is not None:
+            conn.close()
+
+    if progress_callback:
+        progress_callback(processed)
+    return counts
+
+
+# ---------- CLI ----------
+
+def index_imported(owner, conversations, known_conversations):
+    """Adds the messages of the conversations appended by import_records to the search index."""
+    for convo in conversations[known_conversations:]:
+        index_messages(owner, convo, convo["messages"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import a user's TalkHeal history as NDJSON.")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path")
+    parser.add_argument("--owner", required=True, help="conversation owner key (data/conversations_<owner>.json)")
+    parser.add_argument("--email", help="account email for journal entries")
+    args = parser.parse_args()
+
+    memory_file = get_memory_file_for(args.owner)
+    if args.command == "export":
+        count = write_export(args.path, iter_export_records(memory_file, args.email))
+        print(f"Exported {count} records to {args.path}")
+        return
+
+    conversations = []
+    if os.path.exists(memory_file):
+        with open(memory_file, 'r', encoding="utf-8") as f:
+            conversations = json.load(f)
+    known_conversations = len(conversations)
+
+    with open(args.path, 'r', encoding="utf-8") as f:
+        counts = import_records(
+            iter_import_records(f), conversations, email=args.email,
+            progress_callback=lambda n: print(f"  {n} records processed", end="\r")
+        )
+    print()
+
+    os.makedirs("data", exist_ok=True)
+    save_conversations(conversations, memory_file)
+    index_imported(args.owner, conversations, known_conversations)
+    print("Imported " + ", ".join(f"{n} {record_type}s" for record_type, n in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Self-hosted web fonts.
+
+Fonts are Latin-subsetted WOFF2 files in ``static/fonts/`` (built by
+subset_fonts.py) served by Streamlit's static file server, so first paint
+never waits on a third-party stylesheet and the app works without internet
+access. Every face uses ``font-display: swap``: text renders immediately in
+the fallback stack and swaps once the font arrives. Faces whose file is
+missing (e.g. subset_fonts.py has not been run yet) are still loaded from
+Google Fonts, so the app looks the same either way.
+
+The font set is picked with the TALKHEAL_FONT_SET environment variable
+(one of FONT_SETS; "system" loads no web fonts at all).
+"""
+
+import os
+
+from core.assets import STATIC_URL, static_url
+
+SYSTEM_SANS = '-apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif'
+
+# role -> (family, weights); None means the system stack
+FONT_SETS = {
+    "default": {"body": ("Inter", [300, 400, 600, 700, 800]), "heading": ("Poppins", [500, 600, 700])},
+    "inter": {"body": ("Inter", [300, 400, 600, 700, 800]), "heading": ("Inter", [600, 700])},
+    "system": {"body": None, "heading": None},
+}
+FONT_SET = os.environ.get("TALKHEAL_FONT_SET", "default")
+
+# Preloaded: the faces every page renders above the fold
+PRELOAD_WEIGHTS = {"body": 400, "heading": 600}
+
+# Same range Google Fonts serves as its "latin" subset
+REMOTE_FONT_CSS = "https://fonts.googleapis.com/css2?family={family}:wght@{weights}&display=swap"
+
+LATIN_UNICODE_RANGE = ("U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+02C6, U+02DA, U+02DC, "
+                       "U+0304, U+0308, U+0329, U+2000-206F, U+20AC, U+2122, U+2191, U+2193, "
+                       "U+2212, U+2215, U+FEFF, U+FFFD")
+
+
+def get_font_set(name=None):
+    return FONT_SETS.get(name or FONT_SET, FONT_SETS["default"])
+
+
+def font_file(family, weight):
+    """Path of a face relative to static/."""
+    return f"fonts/{family.lower()}-{weight}-latin.woff2"
+
+
+def font_stack(role, font_set=None):
+    """``font-family`` value for "body" or "heading" text."""
+    font = get_font_set(font_set)[role]
+    return f"'{font[0]}', {SYSTEM_SANS}" if font else SYSTEM_SANS
+
+
+def iter_faces(font_set=None):
+    """(family, weight) for every face in the set, without duplicates."""
+    seen = set()
+    for font in get_font_set(font_set).values():
+        if not font:
+            continue
+        family, weights = font
+        for weight in weights:
+            if (family, weight) not in seen:
+                seen.add((family, weight))
+                yield family, weight
+
+
+def remote_font_imports(font_set=None):
+    """@import rules pulling the faces without a file in static/fonts/ from Google Fonts."""
+    missing = {}
+    for family, weight in iter_faces(font_set):
+        if not static_url(font_file(family, weight)):
+            missing.setdefault(family, []).append(weight)
+    return [
+        f"@import url('{REMOTE_FONT_CSS.format(family=family, weights=';'.join(map(str, sorted(weights))))}');"
+        for family, weights in missing.items()
+    ]
+
+
+def font_face_css(font_set=None, base=STATIC_URL):
+    """
+    @font-face rules for every face in the set that has a file in
+    static/fonts/, preceded by remote_font_imports() for the rest. Must go
+    at the very top of a stylesheet, where @import is allowed.
+    """
+    rules = remote_font_imports(font_set)
+    for family, weight in iter_faces(font_set):
+        url = static_url(font_file(family, weight), base)
+        if not url:
+            continue
+        rules.append(
+            f"@font-face {{ font-family: '{family}'; font-style: normal; font-weight: {weight}; "
+            f"font-display: swap; src: url(\"{url}\") format(\"woff2\"); "
+            f"unicode-range: {LATIN_UNICODE_RANGE}; }}"
+        )
+    return "\n".join(rules)
+
+
+def preload_links(font_set=None):
+    """<link rel="preload"> tags for the body and heading faces used above the fold."""
+    links = []
+    for role, font in get_font_set(font_set).items():
+        if not font:
+            continue
+        url = static_url(font_file(font[0], PRELOAD_WEIGHTS[role]))
+        if url and url not in links:
+            links.append(url)
+    return "".join(
+        f'<link rel="preload" href="{url}" as="font" type="font/woff2" crossorigin>' for url in links
+    )
+
+
+def font_assets_html(font_set=None):
+    """
+    Preload hints, @font-face rules and the --font-body/--font-heading
+    variables as one snippet, for pages that don't use the compiled theme
+    stylesheet (css/styles.py), such as the login page.
+    """
+    return (f"{preload_links(font_set)}<style>{font_face_css(font_set)}\n"
+            f":root {{ --font-body: {font_stack('body', font_set)}; "
+            f"--font-heading: {font_stack('heading', font_set)}; }}</style>")
@@ -0,0 +1,110 @@
+"""
+Versioned storage for mood entries.
+
+``data/mood_data.json`` holds a small header and the entries:
+
+    {"schema_version": 1, "entries": [{"timestamp": ..., "mood_level": ..., ...}]}
+
+Files written before the header existed (a bare list) are schema version 0.
+Loading a file at the current version only reads it. An older file is
+brought up to date by running each pending step in MIGRATIONS and is
+written back once, so migrations run exactly once per file. To migrate
+ahead of time:
+
+    python -m core.mood_store migrate
+"""
+
+import argparse
+import json
+import os
+
+MOOD_DATA_FILE = "data/mood_data.json"
+
+
+class MoodStoreVersionError(ValueError):
+    """Raised for a mood file written by a newer version of the app."""
+
+
+def _add_context_fields(entries):
+    """v0 -> v1: every entry has a context_reason and an activities list."""
+    for entry in entries:
+        entry.setdefault('context_reason', "No specific reason")
+        if not isinstance(entry.get('activities'), list):
+            entry['activities'] = []
+    return entries
+
+
+# MIGRATIONS[n] upgrades entries from schema version n to n + 1
+MIGRATIONS = [
+    _add_context_fields,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def read_mood_file(path=MOOD_DATA_FILE):
+    """
+    (schema_version, entries) exactly as stored, without migrating. A
+    missing file is an empty store at the current version; an unreadable
+    one raises ValueError (or OSError).
+    """
+    if not os.path.exists(path):
+        return SCHEMA_VERSION, []
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return 0, data
+    if not isinstance(data, dict) or not isinstance(data.get("entries"), list) \
+            or not isinstance(data.get("schema_version"), int):
+        raise ValueError(f"{path} is not a mood data file")
+    return data["schema_version"], data["entries"]
+
+
+def migrate(entries, version):
+    """Applies the migrations after ``version``, in order."""
+    for step in MIGRATIONS[version:]:
+        entries = step(entries)
+    return entries
+
+
+def load_mood_entries(path=MOOD_DATA_FILE, persist_migration=True):
+    """
+    Entries at the current schema version. An out-of-date file is migrated
+    and, unless ``persist_migration`` is False, saved back so later loads
+    skip the migration.
+    """
+    version, entries = read_mood_file(path)
+    if version > SCHEMA_VERSION:
+        raise MoodStoreVersionError(
+            f"{path} has mood schema version {version}; this version of TalkHeal reads up to {SCHEMA_VERSION}"
+        )
+    if version < SCHEMA_VERSION:
+        entries = migrate(entries, version)
+        if persist_migration:
+            save_mood_entries(entries, path)
+    return entries
+
+
+def save_mood_entries(entries, path=MOOD_DATA_FILE):
+    """Writes the entries with the current version header, replacing the file atomically."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"schema_version": SCHEMA_VERSION, "entries": entries}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mood data store maintenance.")
+    parser.add_argument("command", choices=["migrate"])
+    parser.add_argument("--path", default=MOOD_DATA_FILE)
+    args = parser.parse_args()
+
+    version, _ = read_mood_file(args.path)
+    entries = load_mood_entries(args.path)
+    print(f"{args.path}: schema version {version} -> {SCHEMA_VERSION} ({len(entries)} entries)")
+
+
+if __name__ == "__main__":
+    main()
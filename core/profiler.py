@@ -0,0 +1,144 @@
+"""
+Opt-in rerun profiler.
+
+Wrap a function with ``@profiled`` (or a block with ``profile_span(name)``)
+and, while profiling is on, every call records its wall time and the number
+of elements (Streamlit deltas) and bytes it sent to the browser. Spans are
+grouped per rerun; fragment reruns get their own record. The last
+MAX_RUNS records live in session state, are shown in the admin panel
+(components/profiler_panel.py) and can be exported as JSON.
+
+Profiling is off by default and then costs one check per call. The admin
+panel only exists when the server runs with TALKHEAL_PROFILER=1 (then open
+the app with ``?debug=profiler`` and turn recording on there); visitors
+can't enable it otherwise. TALKHEAL_PROFILE=1 records every session.
+
+Element and byte counts rely on a private Streamlit hook; if a Streamlit
+release drops it, spans are timed only and their counts are None.
+"""
+
+import functools
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+PROFILER_PANEL_ENABLED = os.environ.get("TALKHEAL_PROFILER") == "1"
+PROFILE_ALL_SESSIONS = os.environ.get("TALKHEAL_PROFILE") == "1"
+MAX_RUNS = 50
+
+
+def profiling_enabled():
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return False
+    if PROFILE_ALL_SESSIONS:
+        return True
+    return PROFILER_PANEL_ENABLED and st.session_state.get("profiling_enabled", False)
+
+
+def _delta_counter(ctx):
+    """
+    [elements, bytes] sent by this session so far. Counted by wrapping the
+    context's enqueue callback once per session (Streamlit has no public
+    hook). None if this Streamlit version has no such callback.
+    """
+    counter = getattr(ctx, "_profiler_counter", None)
+    if counter is None:
+        if not callable(getattr(ctx, "_enqueue", None)):
+            return None
+        counter = [0, 0]
+        enqueue = ctx._enqueue
+
+        def counting_enqueue(msg):
+            if msg.HasField("delta"):
+                counter[0] += 1
+                counter[1] += msg.ByteSize()
+            enqueue(msg)
+
+        ctx._enqueue = counting_enqueue
+        ctx._profiler_counter = counter
+    return counter
+
+
+def _new_run(label, key=None):
+    runs = st.session_state.setdefault("profiler_runs", [])
+    run = {"label": label, "started_at": datetime.now().isoformat(timespec="milliseconds"),
+           "key": key, "spans": [], "depth": 0}
+    runs.append(run)
+    del runs[:-MAX_RUNS]
+    return run
+
+
+def _current_run(ctx):
+    runs = st.session_state.get("profiler_runs")
+    fragment_ids = ctx.fragment_ids_this_run
+    if fragment_ids:
+        # One record per fragment rerun; the id list object is unique to the run
+        if not runs or runs[-1]["key"] != id(fragment_ids):
+            return _new_run("fragment rerun", key=id(fragment_ids))
+    elif not runs:
+        return _new_run("rerun")
+    return runs[-1]
+
+
+def begin_run(label):
+    """Starts a new rerun record; call once at the top of a page script."""
+    if profiling_enabled():
+        _new_run(label)
+
+
+@contextmanager
+def profile_span(name):
+    if not profiling_enabled():
+        yield
+        return
+
+    ctx = get_script_run_ctx()
+    counter = _delta_counter(ctx)
+    run = _current_run(ctx)
+    span = {"name": name, "depth": run["depth"]}
+    run["spans"].append(span)
+    run["depth"] += 1
+    elements, sent_bytes = counter or (None, None)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        span["ms"] = round((time.perf_counter() - start) * 1000, 2)
+        span["elements"] = counter[0] - elements if counter else None
+        span["bytes"] = counter[1] - sent_bytes if counter else None
+        run["depth"] -= 1
+
+
+def profiled(fn):
+    """Decorator form of profile_span, named after the function."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not profiling_enabled():
+            return fn(*args, **kwargs)
+        with profile_span(fn.__qualname__):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def get_runs():
+    """Recorded runs, newest last, with totals over their top-level spans."""
+    runs = []
+    for run in st.session_state.get("profiler_runs", []):
+        top_level = [span for span in run["spans"] if span["depth"] == 0 and "ms" in span]
+        elements = [span["elements"] for span in top_level]
+        runs.append({
+            "label": run["label"],
+            "started_at": run["started_at"],
+            "total_ms": round(sum(span["ms"] for span in top_level), 2),
+            "elements": None if None in elements else sum(elements),
+            "spans": run["spans"],
+        })
+    return runs
+
+
+def clear_runs():
+    st.session_state.profiler_runs = []
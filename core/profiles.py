@@ -0,0 +1,68 @@
+"""
+Per-user profile storage.
+
+Profiles (display name, join date, font size and avatar hash) are kept in a
+small SQLite table keyed by the login email, so they survive logout and new
+sessions instead of living only in session state. Avatars themselves are
+files in the content-addressed store (core/avatars.py).
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+
+PROFILES_DB = "data/profiles.db"
+
+PROFILE_FIELDS = ["name", "join_date", "font_size", "avatar"]
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS profiles (
+        email TEXT PRIMARY KEY,
+        name TEXT NOT NULL DEFAULT '',
+        join_date TEXT NOT NULL,
+        font_size TEXT NOT NULL DEFAULT 'Medium',
+        avatar TEXT,
+        updated_at TEXT NOT NULL
+    )
+"""
+
+
+def default_profile():
+    return {
+        "name": "",
+        "join_date": datetime.now().strftime("%B %Y"),
+        "font_size": "Medium",
+        "avatar": None
+    }
+
+
+def _connect(db_path):
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def load_profile(email, db_path=PROFILES_DB):
+    """The stored profile for ``email``, or a fresh default one."""
+    conn = _connect(db_path)
+    row = conn.execute(
+        f"SELECT {', '.join(PROFILE_FIELDS)} FROM profiles WHERE email = ?", (email,)
+    ).fetchone()
+    conn.close()
+    if row is None:
+        return default_profile()
+    return dict(zip(PROFILE_FIELDS, row))
+
+
+def save_profile(email, profile, db_path=PROFILES_DB):
+    conn = _connect(db_path)
+    conn.execute(
+        f"INSERT OR REPLACE INTO profiles (email, {', '.join(PROFILE_FIELDS)}, updated_at) "
+        f"VALUES (?, {', '.join('?' for _ in PROFILE_FIELDS)}, ?)",
+        (email, *[profile.get(field) for field in PROFILE_FIELDS], datetime.now().isoformat())
+    )
+    conn.commit()
+    conn.close()
@@ -0,0 +1,164 @@
+"""
+Shared support resources: crisis lines, helplines by country and the
+mental health knowledge base, plus the visitor's country lookup used to
+pick a helpline. Defined once here for the emergency page and
+pages/selfHelpTools.py.
+"""
+
+from functools import lru_cache
+
+import requests
+import streamlit as st
+from streamlit_js_eval import streamlit_js_eval
+
+# --- Structured Emergency Resources ---
+GLOBAL_RESOURCES = [
+    {"name": "Befrienders Worldwide", "desc": "Emotional support to prevent suicide worldwide.",
+        "url": "https://www.befrienders.org/"},
+    {"name": "International Association for Suicide Prevention (IASP)", "desc": "Find a crisis center anywhere in the world.",
+     "url": "https://www.iasp.info/resources/Crisis_Centres/"},
+    {"name": "Crisis Text Line", "desc": "Text-based support available in the US, UK, Canada, and Ireland.",
+     "url": "https://www.crisistextline.org/"},
+    {"name": "The Trevor Project", "desc": "Crisis intervention and suicide prevention for LGBTQ young people.",
+     "url": "https://www.thetrevorproject.org/"},
+    {"name": "Child Helpline International", "desc": "A global network of child helplines for young people in need of help.",
+     "url": "https://www.childhelplineinternational.org/"}
+]
+
+
+# Failed lookups raise, so only answers are cached and errors are retried
+@lru_cache(maxsize=256)
+def _country_from_coords(lat, lon):
+    resp = requests.get(f"https://geocode.maps.co/reverse?lat={lat}&lon={lon}", timeout=5)
+    resp.raise_for_status()
+    return resp.json().get("address", {}).get("country_code", "").upper()
+
+
+@lru_cache(maxsize=1)
+def _country_from_ip():
+    # Looked up from the server, so the answer is the same for every session
+    resp = requests.get("https://ipapi.co/json/", timeout=3)
+    resp.raise_for_status()
+    return resp.json().get("country_code", "").upper()
+
+
+def get_country_from_coords(lat, lon):
+    try:
+        return _country_from_coords(lat, lon) or None
+    except Exception:
+        return None
+
+
+def get_ip_country():
+    try:
+        return _country_from_ip() or None
+    except Exception:
+        return None
+
+
+def get_user_country():
+    """
+    Country code for the visitor: browser geolocation (remembered for the
+    session once it resolves), else the IP-based fallback.
+    """
+    if st.session_state.get("user_country"):
+        return st.session_state.user_country
+
+    # 1. Try to get user's actual browser location (via JS)
+    coords = streamlit_js_eval(
+        js_expressions="""
+            new Promise((resolve, reject) => {
+                navigator.geolocation.getCurrentPosition(
+                    position => resolve({
+                        latitude: position.coords.latitude,
+                        longitude: position.coords.longitude
+                    }),
+                    error => resolve(null)
+                );
+            });
+        """,
+        key="get_coords"
+    )
+
+    if coords and "latitude" in coords and "longitude" in coords:
+        # Rounded so nearby positions share a cached lookup
+        country = get_country_from_coords(round(coords["latitude"], 2), round(coords["longitude"], 2))
+        if country:
+            st.session_state.user_country = country
+            return country
+
+    # 2. Fallback to IP-based location using ipapi.co (no key required)
+    return get_ip_country()  # None if everything fails
+
+
+country_helplines = {
+    "US": [
+        "National Suicide Prevention Lifeline: 988",
+        "Crisis Text Line: Text HOME to 741741",
+        "SAMHSA National Helpline: 1-800-662-4357"
+    ],
+    "IN": [
+        "AASRA: 9152987821",
+        "Sneha Foundation: 044-24640050"
+    ],
+    "GB": [
+        "Samaritans: 116 123"
+    ],
+    "AU": [
+        "Lifeline: 13 11 14"
+    ]
+}
+IASP_LINK = "https://findahelpline.com/"
+
+mental_health_resources_full = {
+    "Depression & Mood Disorders": {
+        "description": "Information on understanding and coping with depression, persistent depressive disorder, and other mood-related challenges.",
+        "links": [
+            {"label": "NIMH - Depression",
+                "url": "https://www.nimh.nih.gov/health/topics/depression"},
+            {"label": "Mayo Clinic - Depression",
+                "url": "https://www.mayoclinic.org/diseases-conditions/depression/symptoms-causes/syc-20356007"}
+        ]
+    },
+    "Anxiety & Panic Disorders": {
+        "description": "Guidance on managing generalized anxiety, social anxiety, panic attacks, and phobias.",
+        "links": [
+            {"label": "ADAA - Anxiety & Depression", "url": "https://adaa.org/"},
+            {"label": "NIMH - Anxiety Disorders",
+                "url": "https://www.nimh.nih.gov/health/topics/anxiety-disorders"}
+        ]
+    },
+    "Bipolar Disorder": {
+        "description": "Understanding the complexities of bipolar disorder, including mood swings and treatment options.",
+        "links": [
+            {"label": "NIMH - Bipolar Disorder",
+                "url": "https://www.nimh.nih.gov/health/topics/bipolar-disorder"}
+        ]
+    },
+    "PTSD & Trauma": {
+        "description": "Resources for individuals experiencing post-traumatic stress disorder and other trauma-related conditions.",
+        "links": [
+            {"label": "PTSD: National Center", "url": "https://www.ptsd.va.gov/"}
+        ]
+    },
+    "OCD & Related Disorders": {
+        "description": "Support and information for obsessive-compulsive disorder, body dysmorphic disorder, and hoarding disorder.",
+        "links": [
+            {"label": "IOCDF - OCD", "url": "https://iocdf.org/"}
+        ]
+    },
+    "Coping Skills & Self-Care": {
+        "description": "Practical strategies and techniques for stress management, emotional regulation, and daily well-being.",
+        "links": [
+            {"label": "HelpGuide - Stress Management",
+                "url": "https://www.helpguide.org/articles/stress/stress-management.htm"}
+        ]
+    },
+    "Therapy & Treatment Options": {
+        "description": "Overview of various therapeutic approaches, including CBT, DBT, and finding a therapist.",
+        "links": [
+            {"label": "APA - Finding a Therapist",
+                "url": "https://www.apa.org/helpcenter/choose-therapist"}
+        ]
+    }
+}
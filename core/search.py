@@ -0,0 +1,228 @@
+"""
+Full-text search over saved conversations.
+
+Messages are mirrored into a SQLite FTS5 index as they are added, so the
+sidebar can look up past chats without loading every conversation file.
+Each owner gets their own index file next to their conversation file,
+mirroring the ``data/conversations_<owner>.json`` layout.
+
+Run ``python -m core.search rebuild`` to (re)index existing JSON files.
+"""
+
+import glob
+import json
+import os
+import re
+import sqlite3
+import sys
+
+from core.archive import read_archive
+
+SEARCH_DIR = "data/search"
+CONVERSATION_FILE_PATTERN = "data/conversations_*.json"
+
+# Only the most recent RANK_WINDOW matches are ranked with BM25. This keeps
+# lookups bounded (a few ms) however long a user's history grows.
+RANK_WINDOW = 500
+# A term matching more than this share of recent messages (e.g. "feel") is
+# treated as common: BM25 gives it no weight and scoring it is the slow part.
+COMMON_MATCH_DENSITY = 0.5
+
+_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS message_index USING fts5(
+        message,
+        convo_id UNINDEXED,
+        sender UNINDEXED,
+        time UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+"""
+
+
+def get_index_file(owner):
+    return os.path.join(SEARCH_DIR, f"conversations_{owner}.db")
+
+
+def _connect(owner):
+    os.makedirs(SEARCH_DIR, exist_ok=True)
+    conn = sqlite3.connect(get_index_file(owner))
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def query_terms(query):
+    """Lowercased, de-duplicated search terms in the order they were typed."""
+    return list(dict.fromkeys(re.findall(r"\w+", (query or "").lower())))
+
+
+def build_match_query(terms):
+    """Quote each term so user input can never be parsed as FTS5 syntax."""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def _message_row(convo, msg):
+    return (msg["message"], str(convo["id"]), msg["sender"], msg.get("time", ""))
+
+
+def index_message(owner, convo, msg):
+    """Add a single message of a conversation to the owner's index."""
+    index_messages(owner, convo, [msg])
+
+
+def index_messages(owner, convo, messages):
+    """
+    Add several messages of a conversation to the owner's index in one
+    transaction. Without FTS5 support in SQLite the messages are simply not
+    indexed, so saving a chat never fails because of search.
+    """
+    try:
+        conn = _connect(owner)
+    except sqlite3.OperationalError:
+        return
+    try:
+        conn.executemany(
+            "INSERT INTO message_index (message, convo_id, sender, time) VALUES (?, ?, ?, ?)",
+            [_message_row(convo, msg) for msg in messages]
+        )
+        conn.commit()
+    except sqlite3.OperationalError:
+        pass
+    finally:
+        conn.close()
+
+
+def remove_conversation(owner, convo_id):
+    """Drop every indexed message of a conversation."""
+    try:
+        conn = _connect(owner)
+    except sqlite3.OperationalError:
+        return
+    try:
+        conn.execute("DELETE FROM message_index WHERE convo_id = ?", (str(convo_id),))
+        conn.commit()
+    except sqlite3.OperationalError:
+        pass
+    finally:
+        conn.close()
+
+
+def _window_floor(conn, match):
+    """Lowest rowid among the RANK_WINDOW most recent matches (0 if fewer)."""
+    row = conn.execute(
+        "SELECT rowid FROM message_index WHERE message_index MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+        (match, RANK_WINDOW - 1)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def _is_common(conn, term, newest):
+    floor = _window_floor(conn, build_match_query([term]))
+    return bool(floor) and RANK_WINDOW / (newest - floor + 1) > COMMON_MATCH_DENSITY
+
+
+def search_messages(owner, query, limit=10):
+    """
+    Return the best matching messages for ``owner`` as a list of dicts with
+    ``convo_id``, ``sender``, ``time`` and a highlighted ``snippet``.
+
+    Messages must contain every term. Ranking uses BM25 over the distinctive
+    terms only; if every term is common the newest matches come first.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+
+    try:
+        conn = _connect(owner)
+    except sqlite3.OperationalError:
+        return []
+    try:
+        newest = conn.execute("SELECT max(rowid) FROM message_index").fetchone()[0] or 0
+        match = build_match_query(terms)
+        floor = _window_floor(conn, match)
+        rare_terms = [term for term in terms if not _is_common(conn, term, newest)]
+
+        if not rare_terms:
+            rows = conn.execute("""
+                SELECT convo_id, sender, time,
+                       snippet(message_index, 0, '**', '**', '…', 12)
+                FROM message_index
+                WHERE message_index MATCH ? AND rowid >= ?
+                ORDER BY rowid DESC
+                LIMIT ?
+            """, (match, floor, limit)).fetchall()
+        else:
+            hits = {rowid for (rowid,) in conn.execute(
+                "SELECT rowid FROM message_index WHERE message_index MATCH ? AND rowid >= ?",
+                (match, floor)
+            )}
+            ranked = conn.execute("""
+                SELECT rowid, convo_id, sender, time,
+                       snippet(message_index, 0, '**', '**', '…', 12)
+                FROM message_index
+                WHERE message_index MATCH ? AND rowid >= ?
+                ORDER BY rank
+            """, (build_match_query(rare_terms), floor))
+            rows = []
+            for rowid, *row in ranked:
+                if rowid in hits:
+                    rows.append(row)
+                    if len(rows) == limit:
+                        break
+    except sqlite3.OperationalError:
+        rows = []
+    finally:
+        conn.close()
+
+    return [
+        {"convo_id": convo_id, "sender": sender, "time": time, "snippet": snippet}
+        for convo_id, sender, time, snippet in rows
+    ]
+
+
+def owner_from_memory_file(path):
+    """``data/conversations_<owner>.json`` -> ``<owner>``"""
+    name = os.path.basename(path)
+    return name[len("conversations_"):-len(".json")]
+
+
+def _conversation_messages(memory_file, convo):
+    """Messages of a conversation, read from its archive file if the hot file only has a stub."""
+    if convo.get("archived"):
+        archived = read_archive(memory_file, convo["id"])
+        return archived.get("messages", []) if archived else []
+    return convo.get("messages", [])
+
+
+def rebuild_index(pattern=CONVERSATION_FILE_PATTERN):
+    """Re-index every conversation file matching ``pattern``. Returns the message count."""
+    total = 0
+    for path in sorted(glob.glob(pattern)):
+        owner = owner_from_memory_file(path)
+        with open(path, 'r', encoding="utf-8") as f:
+            conversations = json.load(f)
+        rows = [
+            _message_row(convo, msg)
+            for convo in conversations
+            for msg in _conversation_messages(path, convo)
+        ]
+
+        conn = _connect(owner)
+        conn.execute("DELETE FROM message_index")
+        conn.executemany(
+            "INSERT INTO message_index (message, convo_id, sender, time) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        conn.execute("INSERT INTO message_index (message_index) VALUES ('optimize')")
+        conn.commit()
+        conn.close()
+        total += len(rows)
+    return total
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rebuild"]:
+        print("Usage: python -m core.search rebuild")
+        sys.exit(1)
+    count = rebuild_index()
+    print(f"Indexed {count} messages into {SEARCH_DIR}/")
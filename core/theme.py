@@ -215,6 +215,12 @@ PALETTES = [
 ]
 
 PALETTE_NAME_TO_CONFIG = {p["name"]: p for p in PALETTES}
+THEMES = PALETTES + [DARK_THEME]
+
+
+def get_theme_key(theme: Dict[str, Any]) -> str:
+    """Value of the ``data-theme`` attribute the stylesheet uses for ``theme``."""
+    return theme["name"].lower().replace(" ", "-")
 
 
 def initialize_theme_state():
@@ -0,0 +1,185 @@
+"""
+AI-generated conversation titles.
+
+New conversations are titled with the first 30 characters of the first
+message. A background job later collects untitled conversations across all
+users and asks the model for titles in batches (one prompt per
+TITLE_BATCH_SIZE conversations), off the chat request path.
+
+Generated titles live in ``data/titles/conversations_<owner>.json`` (id ->
+title) rather than in the conversation file itself, so the job never races
+with the app saving a session's conversations.
+
+Run ``python -m core.titles`` to title everything once (needs GEMINI_API_KEY).
+"""
+
+import glob
+import json
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+TITLES_DIR = "data/titles"
+CONVERSATION_FILE_PATTERN = "data/conversations_*.json"
+TITLE_BATCH_SIZE = 20
+TITLE_INTERVAL_SECONDS = 300
+MAX_TITLE_LENGTH = 40
+# Only the opening of a conversation is sent to the model
+EXCERPT_MESSAGES = 4
+EXCERPT_CHARS = 300
+
+# path -> (mtime, titles); avoids re-reading the titles file on every rerun
+_titles_cache = {}
+
+
+def get_titles_file(memory_file):
+    return os.path.join(TITLES_DIR, os.path.basename(memory_file))
+
+
+def load_titles(memory_file):
+    """Generated titles for a conversation file, as {conversation id: title}."""
+    path = get_titles_file(memory_file)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    cached = _titles_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'r', encoding="utf-8") as f:
+        titles = json.load(f)
+    _titles_cache[path] = (mtime, titles)
+    return titles
+
+
+def save_titles(memory_file, new_titles):
+    titles = dict(load_titles(memory_file))
+    titles.update(new_titles)
+    path = get_titles_file(memory_file)
+    os.makedirs(TITLES_DIR, exist_ok=True)
+    # Unique per process and thread, so concurrent writers never share a tmp file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding="utf-8") as f:
+        json.dump(titles, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def get_display_title(convo, titles):
+    return titles.get(str(convo["id"]), convo["title"])
+
+
+def conversation_excerpt(convo):
+    lines = []
+    for msg in convo["messages"][:EXCERPT_MESSAGES]:
+        sender = "User" if msg["sender"] == "user" else "Bot"
+        lines.append(f"{sender}: {msg['message'][:EXCERPT_CHARS]}")
+    return "\n".join(lines)
+
+
+def collect_untitled(pattern=CONVERSATION_FILE_PATTERN):
+    """
+    Returns (memory_file, convo_id, excerpt) for every conversation that has
+    at least one exchange and no generated title yet.
+    """
+    pending = []
+    for memory_file in sorted(glob.glob(pattern)):
+        titles = load_titles(memory_file)
+        try:
+            with open(memory_file, 'r', encoding="utf-8") as f:
+                conversations = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for convo in conversations:
+            if str(convo["id"]) in titles or convo.get("archived"):
+                continue
+            if len(convo.get("messages", [])) < 2:
+                continue
+            pending.append((memory_file, str(convo["id"]), conversation_excerpt(convo)))
+    return pending
+
+
+def build_title_prompt(excerpts):
+    parts = [
+        "Write a short, gentle title (at most 6 words) for each of the following "
+        "conversations from a mental health support app. Reply with JSON only: "
+        'an object mapping each conversation number to its title, e.g. {"1": "Exam stress"}.'
+    ]
+    for n, excerpt in enumerate(excerpts, start=1):
+        parts.append(f"### Conversation {n}\n{excerpt}")
+    return "\n\n".join(parts)
+
+
+def parse_titles(text, count):
+    """Maps the model's JSON reply back to a list of titles (None where missing)."""
+    match = re.search(r"\{.*\}", text or "", re.DOTALL)
+    if not match:
+        return [None] * count
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return [None] * count
+
+    titles = []
+    for n in range(1, count + 1):
+        title = data.get(str(n))
+        if isinstance(title, str) and title.strip():
+            titles.append(title.strip().strip('"')[:MAX_TITLE_LENGTH])
+        else:
+            titles.append(None)
+    return titles
+
+
+def generate_titles(model, pattern=CONVERSATION_FILE_PATTERN, batch_size=TITLE_BATCH_SIZE):
+    """Titles every untitled conversation, batch_size per model call. Returns the number titled."""
+    pending = collect_untitled(pattern)
+    titled = 0
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        try:
+            response = model.generate_content(build_title_prompt([excerpt for _, _, excerpt in batch]))
+            titles = parse_titles(response.text, len(batch))
+        except Exception:
+            logger.exception("Title generation failed for a batch of %d conversations", len(batch))
+            continue
+
+        by_file = {}
+        for (memory_file, convo_id, _), title in zip(batch, titles):
+            if title:
+                by_file.setdefault(memory_file, {})[convo_id] = title
+        for memory_file, new_titles in by_file.items():
+            save_titles(memory_file, new_titles)
+            titled += len(new_titles)
+    return titled
+
+
+def start_title_worker(model, interval=TITLE_INTERVAL_SECONDS, stop_event=None):
+    """
+    Starts a daemon thread that runs generate_titles every ``interval``
+    seconds until ``stop_event`` (if given) is set. A failed pass (bad file,
+    API error) is logged and retried at the next interval rather than ending
+    the thread.
+    """
+    stop_event = stop_event or threading.Event()
+
+    def run():
+        while not stop_event.is_set():
+            try:
+                generate_titles(model)
+            except Exception:
+                logger.exception("Conversation title pass failed")
+            stop_event.wait(interval)
+
+    thread = threading.Thread(target=run, name="title-worker", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    import google.generativeai as genai
+
+    genai.configure(api_key=os.environ["GEMINI_API_KEY"])
+    count = generate_titles(genai.GenerativeModel('gemini-2.0-flash'))
+    print(f"Generated {count} conversation titles")
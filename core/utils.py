@@ -1,14 +1,29 @@
 from datetime import datetime, timedelta, timezone
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 import re
 import json
 import os
 import requests
-import google.generativeai
+from uuid import uuid4
+from core.search import index_message, index_messages, remove_conversation
+from core.archive import archive_conversation, delete_archive, read_archive, restore_conversation
+from core.titles import load_titles, save_titles
+from core.profiler import profiled
+
+def get_user_time_offset():
+    """
+    The browser's UTC offset in minutes (JS getTimezoneOffset convention),
+    read once per session from st.context. The browser sends it with the
+    initial connection, so no script injection or page reload is needed.
+    """
+    if "user_time_offset" not in st.session_state:
+        st.session_state.user_time_offset = st.context.timezone_offset
+    return st.session_state.user_time_offset
 
 def get_current_time():
     """Returns the user's local time formatted as HH:MM AM/PM."""
-    tz_offset = st.context.timezone_offset
+    tz_offset = get_user_time_offset()
 
     if tz_offset is None:
         # Default to UTC if timezone is not available (e.g., on Streamlit Cloud)
@@ -20,6 +35,16 @@ def get_current_time():
     return now.strftime("%I:%M %p").lstrip("0")
 
 
+def rerun_fragment():
+    """
+    Reruns just the enclosing st.fragment. Streamlit only allows that during a
+    fragment rerun; when the fragment is being drawn as part of a full app
+    run, the whole app is rerun instead.
+    """
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
 
 def create_new_conversation(initial_message=None):
     """
@@ -28,9 +53,10 @@ def create_new_conversation(initial_message=None):
     Returns the index of the newly created conversation.
     """
     new_convo = {
-        "id": len(st.session_state.conversations),
+        "id": uuid4().hex,
         "title": initial_message[:30] + "..." if initial_message and len(initial_message) > 30 else "New Conversation",
         "date": datetime.now().strftime("%B %d, %Y"),
+        "updated_at": datetime.now().isoformat(),
         "messages": []
     }
     
@@ -58,6 +84,8 @@ def clean_ai_response(response_text):
     return response_text
 
 def get_ai_response(user_message, model):
+    import google.generativeai
+
     if model is None:
         return "I'm sorry, I can't connect right now. Please check the API configuration."
 
@@ -142,14 +170,91 @@ def get_memory_file():
     os.makedirs("data", exist_ok=True)
     return f"data/conversations_{ip}.json"
 
-def save_conversations(conversations):
-    memory_file = get_memory_file()
-    with open(memory_file, 'w', encoding="utf-8") as f:
+@profiled
+def save_conversations(conversations, memory_file=None):
+    memory_file = memory_file or get_memory_file()
+    # Written to a temporary file first, so a crash never leaves a truncated history
+    tmp_path = f"{memory_file}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding="utf-8") as f:
         json.dump(conversations, f, indent=4)
+    os.replace(tmp_path, memory_file)
+
+def migrate_conversation_ids(memory_file, conversations, owner):
+    """
+    Gives conversations saved with the old ``len()``-based integer ids (which
+    could collide after a delete) a uuid4 hex id, in place. The generated
+    title, search index rows and archive copy follow the new id. Returns the
+    (old id, conversation) pairs that changed; the old archive files are
+    left for the caller to delete once the conversations are saved.
+    """
+    titles = load_titles(memory_file)
+    new_titles = {}
+    migrated = []
+    for convo in conversations:
+        if isinstance(convo["id"], str):
+            continue
+        old_id = convo["id"]
+        convo["id"] = uuid4().hex
+        if str(old_id) in titles:
+            new_titles[convo["id"]] = titles[str(old_id)]
+
+        messages = convo["messages"]
+        if convo.get("archived"):
+            archived = read_archive(memory_file, old_id)
+            if archived is not None:
+                archived["id"] = convo["id"]
+                archive_conversation(memory_file, archived)
+                messages = archived["messages"]
+        # Rows of colliding ids can't be told apart, so reindex from the messages
+        remove_conversation(owner, old_id)
+        index_messages(owner, convo, messages)
+        migrated.append((old_id, convo))
+
+    if new_titles:
+        save_titles(memory_file, new_titles)
+    return migrated
 
+@profiled
 def load_conversations():
     memory_file = get_memory_file()
     if not os.path.exists(memory_file):
         return []
     with open(memory_file, 'r', encoding="utf-8") as f:
-        return json.load(f)
+        conversations = json.load(f)
+
+    migrated = migrate_conversation_ids(memory_file, conversations, cached_user_ip())
+    if migrated:
+        save_conversations(conversations)
+        for old_id, convo in migrated:
+            if convo.get("archived"):
+                delete_archive(memory_file, old_id)
+    return conversations
+
+@profiled
+def index_conversation_message(convo, msg):
+    """Mirror a newly added message into the full-text search index."""
+    index_message(cached_user_ip(), convo, msg)
+
+def unindex_conversation(convo):
+    remove_conversation(cached_user_ip(), convo["id"])
+
+def touch_conversation(convo):
+    """Records activity so the conversation stays out of the archive."""
+    convo["updated_at"] = datetime.now().isoformat()
+
+@profiled
+def ensure_conversation_loaded(convo):
+    """Restores an archived conversation's messages the first time it is opened."""
+    if convo.get("archived") and restore_conversation(get_memory_file(), convo):
+        touch_conversation(convo)
+        save_conversations(st.session_state.conversations)
+        # The hot file now holds the messages; only then drop the archive copy
+        delete_archive(get_memory_file(), convo["id"])
+
+def discard_conversation_archive(convo):
+    if convo.get("archived"):
+        delete_archive(get_memory_file(), convo["id"])
+
+def get_conversation_titles():
+    """AI-generated titles for this user's conversations ({id: title})."""
+    return load_titles(get_memory_file())
@@ -1,61 +1,119 @@
+import hashlib
+import os
+from collections import namedtuple
+from functools import lru_cache
+
 import streamlit as st
-import base64
+from core.assets import STATIC_URL, background_image_css, get_static_path
+from core.fonts import FONT_SET, font_face_css, font_stack, preload_links
+from core.profiler import profiled
 
-def get_base64_of_bin_file(bin_file):
-    with open(bin_file, 'rb') as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
+# Applied on top of every palette (the palettes only differ in their background)
+THEME_OVERRIDES = {
+    'primary': '#6366f1',
+    'primary_light': '#818cf8',
+    'primary_dark': '#4f46e5',
+    'secondary': '#ec4899',
+    'success': '#10b981',
+    'warning': '#f59e0b',
+    'danger': '#ef4444',
+    'surface': 'rgba(255,255,255,0.14)',
+    'surface_alt': 'rgba(25,25,46,0.23)',
+    'text_primary': '#fff',
+    'text_secondary': 'white',
+    'text_muted': '#a0aec0',
+    'border': 'rgba(255,255,255,0.18)',
+    'border_light': 'rgba(255,255,255,0.09)',
+    'shadow': '0 4px 32px rgba(33,40,98,0.13)',
+    'shadow_lg': '0 16px 48px rgba(99,102,241,0.12)',
+    'background_overlay': 'linear-gradient(120deg, rgba(34,37,74,0.53) 0%, rgba(34,41,79,0.68) 100%)'
+}
 
-def apply_custom_css():
-    from core.theme import get_current_theme
-    theme_config = get_current_theme()
-    theme_overrides = {
-        'primary': '#6366f1',
-        'primary_light': '#818cf8',
-        'primary_dark': '#4f46e5',
-        'secondary': '#ec4899',
-        'success': '#10b981',
-        'warning': '#f59e0b',
-        'danger': '#ef4444',
-        'surface': 'rgba(255,255,255,0.14)',
-        'surface_alt': 'rgba(25,25,46,0.23)',
-        'text_primary': '#fff',
-        'text_secondary': 'white',
-        'text_muted': '#a0aec0',
-        'border': 'rgba(255,255,255,0.18)',
-        'border_light': 'rgba(255,255,255,0.09)',
-        'shadow': '0 4px 32px rgba(33,40,98,0.13)',
-        'shadow_lg': '0 16px 48px rgba(99,102,241,0.12)',
-        'background_overlay': 'linear-gradient(120deg, rgba(34,37,74,0.53) 0%, rgba(34,41,79,0.68) 100%)'
-    }
-    theme_config.update(theme_overrides)
-    
-    background_image_path = theme_config.get('background_image', 'Background.jpg')
-    base64_image = get_base64_of_bin_file(background_image_path) if background_image_path else None
-    st.markdown(f"""
-    <style>
-        /* Font imports */
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700&display=swap');
-        @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@500;600;700&display=swap');
+FONT_SIZES = {
+    "Small": "14px",
+    "Medium": "16px",
+    "Large": "18px"
+}
+
+# CSS variable -> palette key; every theme sets these under its data-theme selector
+THEME_VARIABLES = {
+    "--primary-color": "primary",
+    "--primary-light": "primary_light",
+    "--primary-dark": "primary_dark",
+    "--secondary-color": "secondary",
+    "--success-color": "success",
+    "--warning-color": "warning",
+    "--danger-color": "danger",
+    "--surface": "surface",
+    "--surface-alt": "surface_alt",
+    "--text-primary": "text_primary",
+    "--text-secondary": "text_secondary",
+    "--text-muted": "text_muted",
+    "--border": "border",
+    "--border-light": "border_light",
+    "--shadow": "shadow",
+    "--shadow-lg": "shadow_lg",
+}
+
+CompiledCSS = namedtuple("CompiledCSS", ["css", "hash"])
+
+
+def _theme_config(theme):
+    return {**theme, **THEME_OVERRIDES}
+
+
+def _variables(theme_config, names=THEME_VARIABLES):
+    return "\n".join(f"            {name}: {theme_config[THEME_VARIABLES[name]]};" for name in names)
+
+
+def _theme_rules(base):
+    """
+    Per-theme rules keyed by ``html[data-theme]``: the variables that differ
+    from the light palette and the background. Switching theme in the
+    browser (components/theme_toggle.py) only flips the attribute.
+    """
+    from core.theme import LIGHT_THEME, THEMES, get_theme_key
+
+    default = _theme_config(LIGHT_THEME)
+    rules = []
+    for theme in THEMES:
+        theme_config = _theme_config(theme)
+        selector = f'html[data-theme="{get_theme_key(theme)}"]'
+        changed = [name for name, key in THEME_VARIABLES.items() if theme_config[key] != default[key]]
+        if changed:
+            rules.append(f"        {selector} {{\n{_variables(theme_config, changed)}\n        }}")
+        background = theme_config.get('background_image') or 'Background.jpg'
+        rules.append(background_image_css(f"{selector} .stApp", background, base=base))
+    return "\n".join(rules)
+
+
+def _render_stylesheet(root_variables, theme_rules, font_size, font_faces, body_font, heading_font):
+    return f"""
+        /* Fonts: self-hosted, Google Fonts for faces not built yet (core/fonts.py) */
+{font_faces}
+
+        /* Global font size (profile preference) */
+        .stApp {{
+            font-size: {font_size};
+        }}
+        .stMarkdown, .stText, p, div, span {{
+            font-size: {font_size} !important;
+        }}
+        .stSelectbox label, .stTextInput label, .stTextArea label {{
+            font-size: {font_size} !important;
+        }}
+        .stButton button {{
+            font-size: {font_size} !important;
+        }}
+        .stRadio label, .stCheckbox label {{
+            font-size: {font_size} !important;
+        }}
 
         /* CSS variables and root styling */
         :root {{
-            --primary-color: {theme_config['primary']};
-            --primary-light: {theme_config['primary_light']};
-            --primary-dark: {theme_config['primary_dark']};
-            --secondary-color: {theme_config['secondary']};
-            --success-color: {theme_config['success']};
-            --warning-color: {theme_config['warning']};
-            --danger-color: {theme_config['danger']};
-            --surface: {theme_config['surface']};
-            --surface-alt: {theme_config['surface_alt']};
-            --text-primary: {theme_config['text_primary']};
-            --text-secondary: {theme_config['text_secondary']};
-            --text-muted: {theme_config['text_muted']};
-            --border: {theme_config['border']};
-            --border-light: {theme_config['border_light']};
-            --shadow: {theme_config['shadow']};
-            --shadow-lg: {theme_config['shadow_lg']};
+{root_variables}
+            --font-body: {body_font};
+            --font-heading: {heading_font};
             --radius: 12px;
             --radius-lg: 22px;
             --radius-xl: 36px;
@@ -69,17 +127,19 @@ def apply_custom_css():
         
         /* Main app background and styling */
         .stApp {{
-            background-image: url("data:image/jpeg;base64,{base64_image}");
             background-size: cover;
             background-repeat: no-repeat;
             background-attachment: fixed;
             background-position: center center;
-            font-family: 'Inter', -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
+            font-family: var(--font-body);
             min-height: 100vh;
             color: var(--text-primary);
             letter-spacing: 0.01em;
         }}
 
+        /* Per-theme variables and backgrounds */
+{theme_rules}
+
         /* Background overlay */
         .stApp::before {{
             content: '';
@@ -102,7 +162,7 @@ def apply_custom_css():
 
         /* Typography styling */
         h1, h2, h3, h4 {{
-            font-family: 'Poppins', sans-serif;
+            font-family: var(--font-heading);
             font-weight: 600;
             margin-bottom: .45em;
         }}
@@ -378,31 +438,6 @@ def apply_custom_css():
             box-shadow: 0 6px 16px rgba(99, 102, 241, 0.4) !important;
         }}
 
-        /* Theme toggle button styling */
-        .stApp button[key="theme_toggle"],
-        .stApp button[key="sidebar_theme_toggle"] {{
-            white-space: nowrap !important;
-            text-overflow: ellipsis !important;
-            overflow: hidden !important;
-            min-height: 44px !important;
-            display: flex !important;
-            align-items: center !important;
-            justify-content: center !important;
-            font-size: 0.9em !important;
-            line-height: 1.2 !important;
-            word-break: keep-all !important;
-            background: var(--light-transparent-bg) !important;
-            color: var(--text-primary) !important;
-            border: 1px solid var(--light-transparent-border) !important;
-            border-radius: var(--radius) !important;
-            padding: 12px 16px !important;
-            font-weight: 600 !important;
-            transition: all 0.2s ease !important;
-            font-family: 'Inter', sans-serif !important;
-            box-shadow: 0 2px 8px var(--shadow) !important;
-            backdrop-filter: blur(5px) !important;
-        }}
-
         /* General button styling */
         button, .stButton > button, .stDownloadButton > button, .stFormSubmitButton > button {{
             background: var(--glass-effect) !important;
@@ -412,7 +447,7 @@ def apply_custom_css():
             border-radius: var(--radius) !important;
             padding: 14px 22px !important;
             font-weight: 600 !important;
-            font-family: 'Poppins',sans-serif !important;
+            font-family: var(--font-heading) !important;
             box-shadow: 0 3px 12px rgba(0,0,0,0.08) !important;
             transition: var(--transition,.21s cubic-bezier(.5,.08,.37,1.11)) !important;
         }}
@@ -490,7 +525,7 @@ def apply_custom_css():
             border-radius: var(--radius) !important;
             font-size: 1em !important;
             color: black;
-            font-family: 'Inter',sans-serif !important;
+            font-family: var(--font-body) !important;
             transition: all .18s cubic-bezier(.35,.72,.44,1.18) !important;
             backdrop-filter: blur(10px) !important;
         }}
@@ -544,7 +579,7 @@ def apply_custom_css():
         
         /* Expander header styling */
         .stExpanderHeader {{
-            font-family: 'Poppins',sans-serif !important;
+            font-family: var(--font-heading) !important;
             font-weight: 600;
             color: #dbeafe !important;
             font-size: 1.07em !important;
@@ -571,5 +606,76 @@ def apply_custom_css():
             backdrop-filter: blur(10px);
             box-shadow: 0 3px 14px rgba(0,0,0,0.07);
         }}
-    </style>
-    """, unsafe_allow_html=True)
+"""
+
+
+@lru_cache(maxsize=16)
+def compile_css(font_size, base=STATIC_URL, font_set=FONT_SET):
+    """
+    The app stylesheet for one font size, covering every theme. Built once
+    per process; the palettes in core.theme are never modified. ``base`` is
+    the URL of static/ relative to wherever the stylesheet is loaded from.
+    """
+    from core.theme import LIGHT_THEME
+
+    css = _render_stylesheet(
+        _variables(_theme_config(LIGHT_THEME)),
+        _theme_rules(base),
+        FONT_SIZES.get(font_size, "16px"),
+        font_face_css(font_set, base),
+        font_stack("body", font_set),
+        font_stack("heading", font_set)
+    )
+    return CompiledCSS(css=css, hash=hashlib.sha1(css.encode()).hexdigest()[:10])
+
+
+@lru_cache(maxsize=16)
+def publish_css(compiled):
+    """
+    Writes the stylesheet to static/css/theme-<hash>.css (once) and returns
+    its URL, or None if static/ is not writable.
+    """
+    filename = f"css/theme-{compiled.hash}.css"
+    path = get_static_path(filename)
+    if not os.path.exists(path):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(compiled.css)
+            os.replace(tmp_path, path)
+        except OSError:
+            return None
+    return f"{STATIC_URL}/{filename}"
+
+
+@profiled
+def apply_custom_css():
+    """
+    Emits the theme stylesheet. The full block is only sent when its hash
+    changes for this session; other reruns send a short @import of the
+    published (browser-cached) copy instead of ~60 KB of CSS. Theme changes
+    do not go through here at all: the stylesheet covers every theme.
+    """
+    from components.profile import get_user_font_size
+    from core.theme import get_current_theme
+
+    font_size = get_user_font_size()
+    theme = get_current_theme()
+    # Until the theme switcher has set data-theme on <html>
+    default_background = background_image_css(
+        "html:not([data-theme]) .stApp", theme.get('background_image') or 'Background.jpg'
+    )
+    url = publish_css(compile_css(font_size, base=".."))
+    if url is None:
+        st.markdown(f"{preload_links()}<style>{compile_css(font_size).css}{default_background}</style>",
+                    unsafe_allow_html=True)
+        return
+
+    compiled = compile_css(font_size)
+    st.markdown(f'{preload_links()}<style>@import url("{url}");\n{default_background}</style>',
+                unsafe_allow_html=True)
+    if st.session_state.get("theme_css_hash") != compiled.hash:
+        # Inline once so the page is styled while the browser fetches the file
+        st.markdown(f"<style>{compiled.css}</style>", unsafe_allow_html=True)
+        st.session_state.theme_css_hash = compiled.hash
@@ -0,0 +1,238 @@
+"""
+Offline image pipeline for the palette backgrounds and the logo.
+
+For every background image referenced by a palette in ``core.theme`` (plus
+the logo) this writes resized AVIF, WebP and JPEG variants to
+``static/optimized/`` and records them in ``static/optimized/manifest.json``.
+The app reads the manifest (core/assets.py) to build ``image-set()``
+backgrounds, so phones get a 640 px AVIF instead of a 1.5 MB PNG. Images with
+transparency get a PNG fallback instead of JPEG.
+
+Sources whose content hash and encoder settings match the manifest are
+skipped, so re-running is cheap; commit the output together with the
+manifest after adding or replacing an image.
+
+    python optimize_images.py             # build missing or changed variants
+    python optimize_images.py --force     # rebuild everything
+    python optimize_images.py --report    # print the size/quality report only
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import math
+import os
+
+from PIL import Image, ImageChops, ImageStat
+
+from core.assets import MANIFEST_PATH, OPTIMIZED_DIR, STATIC_DIR
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_VERSION = 1
+
+# Target widths; sources are never upscaled, the source width is always included
+BACKGROUND_WIDTHS = [640, 1280, 1920]
+LOGO_WIDTHS = [192, 512]
+
+# Preference order: the first format a browser supports wins in image-set()
+ENCODERS = {
+    "avif": {"ext": "avif", "options": {"quality": 55}},
+    "webp": {"ext": "webp", "options": {"quality": 78, "method": 6}},
+    "jpeg": {"ext": "jpg", "options": {"quality": 82, "optimize": True, "progressive": True}},
+    "png": {"ext": "png", "options": {"optimize": True}},
+}
+OPAQUE_FORMATS = ["avif", "webp", "jpeg"]
+ALPHA_FORMATS = ["avif", "webp", "png"]
+
+
+def palette_sources():
+    """Background images used by the palettes, as {name: path}."""
+    from core.theme import THEMES
+
+    sources = {}
+    for palette in THEMES:
+        name = palette.get("background_image")
+        if name:
+            sources[name] = os.path.join(STATIC_DIR, name)
+    return sources
+
+
+def default_sources():
+    """{name: (path, widths)} for everything the pipeline optimizes."""
+    sources = {name: (path, BACKGROUND_WIDTHS) for name, path in palette_sources().items()}
+    sources["TalkHealLogo.png"] = (os.path.join(ROOT, "TalkHealLogo.png"), LOGO_WIDTHS)
+    return sources
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:10]
+
+
+def settings_signature(widths, formats):
+    """Changes whenever the widths or encoder options for an image change."""
+    settings = {"widths": widths, "formats": {fmt: ENCODERS[fmt]["options"] for fmt in formats}}
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:10]
+
+
+def target_widths(source_width, widths):
+    return sorted({w for w in widths if w < source_width} | {min(source_width, max(widths))})
+
+
+def flatten(image):
+    """RGB as displayed on a white page (hidden colour under transparent pixels is ignored)."""
+    if image.mode != "RGBA":
+        return image.convert("RGB")
+    return Image.alpha_composite(Image.new("RGBA", image.size, "white"), image).convert("RGB")
+
+
+def psnr(reference, candidate):
+    """
+    Peak signal-to-noise ratio in dB (higher is closer; above ~40 is visually
+    lossless), or None for an exact match.
+    """
+    diff = ImageChops.difference(flatten(reference), flatten(candidate.convert(reference.mode)))
+    mse = sum(rms ** 2 for rms in ImageStat.Stat(diff).rms) / 3
+    return round(10 * math.log10(255 ** 2 / mse), 2) if mse else None
+
+
+def encode(image, fmt):
+    """Encodes ``image`` and returns (bytes, decoded image for quality checks)."""
+    if fmt == "jpeg" and image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt.upper(), **ENCODERS[fmt]["options"])
+    data = buffer.getvalue()
+    return data, Image.open(io.BytesIO(data))
+
+
+def build_variants(name, path, widths, output_dir=OPTIMIZED_DIR):
+    """Writes every variant of one source and returns its manifest entry."""
+    with Image.open(path) as source:
+        source.load()
+    has_alpha = source.mode in ("RGBA", "LA") or "transparency" in source.info
+    image = source.convert("RGBA" if has_alpha else "RGB")
+    formats = ALPHA_FORMATS if has_alpha else OPAQUE_FORMATS
+    stem = os.path.splitext(name)[0]
+
+    variants = []
+    for width in target_widths(image.width, widths):
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            data, decoded = encode(resized, fmt)
+            filename = f"{stem}-{width}.{ENCODERS[fmt]['ext']}"
+            with open(os.path.join(output_dir, filename), 'wb') as f:
+                f.write(data)
+            variants.append({
+                "file": os.path.relpath(os.path.join(output_dir, filename), STATIC_DIR).replace(os.sep, "/"),
+                "format": fmt,
+                "width": width,
+                "height": height,
+                "bytes": len(data),
+                "hash": hashlib.sha1(data).hexdigest()[:10],
+                "psnr": psnr(resized, decoded),
+            })
+
+    return {
+        "source_hash": file_hash(path),
+        "source_bytes": os.path.getsize(path),
+        "width": image.width,
+        "height": image.height,
+        "formats": formats,
+        "settings": settings_signature(widths, formats),
+        "variants": variants,
+    }
+
+
+def is_current(entry, path, widths, output_dir=OPTIMIZED_DIR):
+    if not entry or entry["source_hash"] != file_hash(path):
+        return False
+    if entry["settings"] != settings_signature(widths, entry["formats"]):
+        return False
+    return all(os.path.exists(os.path.join(output_dir, os.path.basename(v["file"]))) for v in entry["variants"])
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "images": {}}
+
+
+def run_pipeline(sources, output_dir=OPTIMIZED_DIR, manifest_path=MANIFEST_PATH, force=False):
+    """
+    Builds variants for ``sources`` ({name: (path, widths)}) and rewrites the
+    manifest. Returns (manifest, names that were rebuilt).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(manifest_path)
+    images = {}
+    rebuilt = []
+    for name, (path, widths) in sorted(sources.items()):
+        if not os.path.exists(path):
+            print(f"skipping {name}: {path} not found")
+            continue
+        entry = manifest["images"].get(name)
+        if force or not is_current(entry, path, widths, output_dir):
+            entry = build_variants(name, path, widths, output_dir)
+            rebuilt.append(name)
+        images[name] = entry
+
+    # Drop files no longer referenced by any entry
+    keep = {os.path.basename(v["file"]) for entry in images.values() for v in entry["variants"]}
+    keep.add(os.path.basename(manifest_path))
+    for filename in os.listdir(output_dir):
+        if filename not in keep:
+            os.remove(os.path.join(output_dir, filename))
+
+    manifest = {"version": MANIFEST_VERSION, "images": images}
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    return manifest, rebuilt
+
+
+def format_report(manifest):
+    """Size and quality table: every variant against its source."""
+    lines = [f"{'image':<22} {'variant':<10} {'size':>10} {'of source':>10} {'PSNR dB':>8}"]
+    total_source = total_smallest = 0
+    for name, entry in sorted(manifest["images"].items()):
+        source_kb = entry["source_bytes"] / 1024
+        lines.append(f"{name:<22} {'source':<10} {source_kb:>8.1f}KB {'':>10} {'':>8}")
+        for v in sorted(entry["variants"], key=lambda v: (v["width"], entry["formats"].index(v["format"]))):
+            share = v["bytes"] / entry["source_bytes"] * 100
+            lines.append(f"{'':<22} {str(v['width']) + ' ' + v['format']:<10} {v['bytes'] / 1024:>8.1f}KB "
+                         f"{share:>9.1f}% {v['psnr'] or 'exact':>8}")
+        widest = max(v["width"] for v in entry["variants"])
+        total_source += entry["source_bytes"]
+        total_smallest += min(v["bytes"] for v in entry["variants"] if v["width"] == widest)
+    if total_source:
+        lines.append(f"\nFull-width download, best format: {total_smallest / 1024:.0f} KB "
+                     f"vs {total_source / 1024:.0f} KB of sources ({total_smallest / total_source * 100:.1f}%)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build optimized image variants and the image manifest.")
+    parser.add_argument("--force", action="store_true", help="rebuild every variant")
+    parser.add_argument("--report", action="store_true", help="only print the report for the current manifest")
+    args = parser.parse_args()
+
+    if args.report:
+        print(format_report(load_manifest()))
+        return
+
+    manifest, rebuilt = run_pipeline(default_sources(), force=args.force)
+    print(f"Rebuilt: {', '.join(rebuilt) or 'nothing (all up to date)'}\n")
+    print(format_report(manifest))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 import streamlit as st
 import time
+from core.bootstrap import bootstrap_page
+
+bootstrap_page("Breathing Exercise")
 
 def breathing_exercise():
     st.markdown("<h2 style='text-align: center; color: teal;'>🧘 Breathing Exercise</h2>", unsafe_allow_html=True)
@@ -1,23 +1,20 @@
 import streamlit as st
 import sqlite3
 import datetime
-import base64
 from uuid import uuid4
+from core.bootstrap import bootstrap_page, page_background_css, run_once
 
-def get_base64_of_bin_file(bin_file_path):
-    with open(bin_file_path, 'rb') as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
+bootstrap_page("Journaling", require_login=True)
 
-def set_background(main_bg_path, sidebar_bg_path=None):
-    main_bg = get_base64_of_bin_file(main_bg_path)
-    sidebar_bg = get_base64_of_bin_file(sidebar_bg_path) if sidebar_bg_path else main_bg
+def set_background(main_bg, sidebar_bg=None):
+    main_bg_css = page_background_css(".stApp", main_bg)
+    sidebar_bg_css = page_background_css('[data-testid="stSidebar"] > div:first-child', sidebar_bg or main_bg)
 
     st.markdown(
         f"""
         <style>
+        {main_bg_css}
         .stApp {{
-            background-image: url("data:image/png;base64,{main_bg}");
             background-size: cover;
             background-attachment: fixed;
             background-repeat: no-repeat;
@@ -31,8 +28,8 @@ def set_background(main_bg_path, sidebar_bg_path=None):
             box-shadow: 4px 0 24px rgba(0,0,0,0.15);
         }}
 
+        {sidebar_bg_css}
         [data-testid="stSidebar"] > div:first-child {{
-            background-image: url("data:image/png;base64,{sidebar_bg}");
             background-size: cover;
             background-repeat: no-repeat;
             background-attachment: fixed;
@@ -132,10 +129,7 @@ def journaling_app():
         """,
         unsafe_allow_html=True
     )
-    email = st.session_state.get("user_email")
-    if not email:
-        st.warning("⚠️ Please login from the main page to access your journal.")
-        st.stop()
+    email = st.session_state["user_email"]  # bootstrap_page() stops the page for guests
 
     st.title("📝 My Journal")
     st.markdown("Write about your day, thoughts, or anything you'd like to reflect on.")
@@ -169,5 +163,5 @@ def journaling_app():
             with st.expander(f"{date} - Mood: {sentiment}"):
                 st.write(entry)
 
-init_journal_db()
+run_once("journal_db", init_journal_db)
 journaling_app()
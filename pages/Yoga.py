@@ -1,6 +1,6 @@
 import streamlit as st
-import json
-import base64
+from core.assets import load_lottie
+from core.bootstrap import bootstrap_page, page_background_css
 from streamlit_lottie import st_lottie
 from langchain_core.pydantic_v1 import BaseModel, Field
 from langchain_core.messages import HumanMessage, SystemMessage
@@ -8,33 +8,17 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.output_parsers import JsonOutputParser
 from typing import List
 
-st.set_page_config(page_title="🧘 Yoga for Mental Health", layout="centered")
+bootstrap_page("🧘 Yoga for Mental Health")
 
-def load_lottiefile(filepath: str):
-    try:
-        with open(filepath, "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        st.error(f"Lottie file not found at {filepath}.")
-        return None
-
-def get_base64_of_bin_file(bin_file):
-    try:
-        with open(bin_file, 'rb') as f:
-            data = f.read()
-        return base64.b64encode(data).decode()
-    except FileNotFoundError:
-        st.error(f"Background image not found at {bin_file}. Please check the path.")
-        return ""
-
-lottie_yoga = load_lottiefile("assets/yoga_animation.json")
-background_image_path = "lavender.png"
-base64_background_image = get_base64_of_bin_file(background_image_path)
+lottie_yoga = load_lottie("yoga_animation.json")
+if lottie_yoga is None:
+    st.error("Lottie file not found at assets/yoga_animation.json.")
+background_css = page_background_css('html, body, [data-testid="stAppViewContainer"]', "lavender.png")
 
 st.markdown(f"""
 <style>
+{background_css}
 html, body, [data-testid="stAppViewContainer"] {{
-    background-image: url("data:image/jpeg;base64,{base64_background_image}");
     background-size: cover;
     background-position: center center;
     background-repeat: no-repeat;
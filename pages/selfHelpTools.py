@@ -6,186 +6,11 @@ from core.theme import get_current_theme, toggle_theme, set_palette, PALETTES
 from components.mood_dashboard import render_mood_dashboard, MoodTracker
 from components.profile import initialize_profile_state, render_profile_section
 from components.focus_session import render_focus_session
-from streamlit_js_eval import streamlit_js_eval
-import requests
-import base64
+from core.bootstrap import bootstrap_page
+from core.resources import GLOBAL_RESOURCES, IASP_LINK, country_helplines, get_user_country, mental_health_resources_full
 
-def set_background(image_path):
-    with open(image_path, "rb") as image_file:
-        encoded_string = base64.b64encode(image_file.read()).decode()
+bootstrap_page("Self Help Tools", background="lavender.png")
 
-    st.markdown(
-        f"""
-        <style>
-        /* Entire app background */
-        html, body, [data-testid="stApp"] {{
-            background-image: url("data:image/png;base64,{encoded_string}");
-            background-size: cover;
-            background-position: center;
-            background-repeat: no-repeat;
-            background-attachment: fixed;
-        }}
-
-        /* Main content transparency */
-        .block-container {{
-            background-color: rgba(255, 255, 255, 0);
-        }}
-
-        /* Sidebar: brighter translucent background */
-        [data-testid="stSidebar"] {{
-            background-color: rgba(255, 255, 255, 0.6);  /* Brighter and translucent */
-            color: black;  /* Adjusted for light background */
-        }}
-
-        /* Header bar: fully transparent */
-        [data-testid="stHeader"] {{
-            background-color: rgba(0, 0, 0, 0);
-        }}
-
-        
-        /* Hide left/right arrow at sidebar bottom */
-        button[title="Close sidebar"],
-        button[title="Open sidebar"] {{
-            display: none !important;
-        }}
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
-
-# ✅ Set your background image
-set_background("./lavender.png")
-
-
-# --- Structured Emergency Resources ---
-GLOBAL_RESOURCES = [
-    {"name": "Befrienders Worldwide", "desc": "Emotional support to prevent suicide worldwide.",
-        "url": "https://www.befrienders.org/"},
-    {"name": "International Association for Suicide Prevention (IASP)", "desc": "Find a crisis center anywhere in the world.",
-     "url": "https://www.iasp.info/resources/Crisis_Centres/"},
-    {"name": "Crisis Text Line", "desc": "Text-based support available in the US, UK, Canada, and Ireland.",
-     "url": "https://www.crisistextline.org/"},
-    {"name": "The Trevor Project", "desc": "Crisis intervention and suicide prevention for LGBTQ young people.",
-     "url": "https://www.thetrevorproject.org/"},
-    {"name": "Child Helpline International", "desc": "A global network of child helplines for young people in need of help.",
-     "url": "https://www.childhelplineinternational.org/"}
-]
-
-
-def get_country_from_coords(lat, lon):
-    try:
-        url = f"https://geocode.maps.co/reverse?lat={lat}&lon={lon}"
-        resp = requests.get(url, timeout=5)
-        if resp.status_code == 200:
-            data = resp.json()
-            return data.get("address", {}).get("country_code", "").upper()
-    except:
-        pass
-    return None
-
-def get_user_country():
-    # 1. Try to get user's actual browser location (via JS)
-    coords = streamlit_js_eval(
-        js_expressions="""
-            new Promise((resolve, reject) => {
-                navigator.geolocation.getCurrentPosition(
-                    position => resolve({
-                        latitude: position.coords.latitude,
-                        longitude: position.coords.longitude
-                    }),
-                    error => resolve(null)
-                );
-            });
-        """,
-        key="get_coords"
-    )
-
-    if coords and "latitude" in coords and "longitude" in coords:
-        country = get_country_from_coords(coords["latitude"], coords["longitude"])
-        if country:
-            return country
-
-    # 2. Fallback to IP-based location using ipapi.co (no key required)
-    try:
-        resp = requests.get("https://ipapi.co/json/", timeout=3)
-        if resp.status_code == 200:
-            return resp.json().get("country_code", "").upper()
-    except:
-        pass
-
-    return None  # final fallback if everything fails
-
-country_helplines = {
-    "US": [
-        "National Suicide Prevention Lifeline: 988",
-        "Crisis Text Line: Text HOME to 741741",
-        "SAMHSA National Helpline: 1-800-662-4357"
-    ],
-    "IN": [
-        "AASRA: 9152987821",
-        "Sneha Foundation: 044-24640050"
-    ],
-    "GB": [
-        "Samaritans: 116 123"
-    ],
-    "AU": [
-        "Lifeline: 13 11 14"
-    ]
-}
-IASP_LINK = "https://findahelpline.com/"
-
-mental_health_resources_full = {
-    "Depression & Mood Disorders": {
-        "description": "Information on understanding and coping with depression, persistent depressive disorder, and other mood-related challenges.",
-        "links": [
-            {"label": "NIMH - Depression",
-                "url": "https://www.nimh.nih.gov/health/topics/depression"},
-            {"label": "Mayo Clinic - Depression",
-                "url": "https://www.mayoclinic.org/diseases-conditions/depression/symptoms-causes/syc-20356007"}
-        ]
-    },
-    "Anxiety & Panic Disorders": {
-        "description": "Guidance on managing generalized anxiety, social anxiety, panic attacks, and phobias.",
-        "links": [
-            {"label": "ADAA - Anxiety & Depression", "url": "https://adaa.org/"},
-            {"label": "NIMH - Anxiety Disorders",
-                "url": "https://www.nimh.nih.gov/health/topics/anxiety-disorders"}
-        ]
-    },
-    "Bipolar Disorder": {
-        "description": "Understanding the complexities of bipolar disorder, including mood swings and treatment options.",
-        "links": [
-            {"label": "NIMH - Bipolar Disorder",
-                "url": "https://www.nimh.nih.gov/health/topics/bipolar-disorder"}
-        ]
-    },
-    "PTSD & Trauma": {
-        "description": "Resources for individuals experiencing post-traumatic stress disorder and other trauma-related conditions.",
-        "links": [
-            {"label": "PTSD: National Center", "url": "https://www.ptsd.va.gov/"}
-        ]
-    },
-    "OCD & Related Disorders": {
-        "description": "Support and information for obsessive-compulsive disorder, body dysmorphic disorder, and hoarding disorder.",
-        "links": [
-            {"label": "IOCDF - OCD", "url": "https://iocdf.org/"}
-        ]
-    },
-    "Coping Skills & Self-Care": {
-        "description": "Practical strategies and techniques for stress management, emotional regulation, and daily well-being.",
-        "links": [
-            {"label": "HelpGuide - Stress Management",
-                "url": "https://www.helpguide.org/articles/stress/stress-management.htm"}
-        ]
-    },
-    "Therapy & Treatment Options": {
-        "description": "Overview of various therapeutic approaches, including CBT, DBT, and finding a therapist.",
-        "links": [
-            {"label": "APA - Finding a Therapist",
-                "url": "https://www.apa.org/helpcenter/choose-therapist"}
-        ]
-    }
-}
 st.title("🧰 Self Help Tools")
 
 # Button states
@@ -289,15 +114,16 @@ elif st.session_state.active_tool == "mental_check":
         if st.button("Get Tip & Save Entry"):
             if "mood_tracker" not in st.session_state:
                 st.session_state.mood_tracker = MoodTracker()
-            st.session_state.mood_tracker.add_mood_entry(
+            saved = st.session_state.mood_tracker.add_mood_entry(
                 st.session_state.current_mood_val,
                 st.session_state.get("mood_journal_area", ""),
                 selected_reason,
                 activities
             )
             st.session_state.mood_tip_display = tips_for_mood
-            st.session_state.mood_entry_status = f"Mood entry for '{selected_mood_label}' saved."
-            st.session_state.mood_journal_entry = ""
+            if saved:
+                st.session_state.mood_entry_status = f"Mood entry for '{selected_mood_label}' saved."
+                st.session_state.mood_journal_entry = ""
 
     with col_talk:
         if st.button("Ask TalkHeal"):
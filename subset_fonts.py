@@ -0,0 +1,115 @@
+"""
+Builds the self-hosted web fonts in static/fonts/.
+
+Takes the static TTF/OTF files of each family in core.fonts.FONT_SETS (Inter
+from https://rsms.me/inter, Poppins from Google Fonts; both SIL OFL),
+subsets them to the Latin range Google Fonts serves and writes one WOFF2
+per weight, named as core.fonts.font_file() expects. Any OFL/LICENSE text
+found next to the sources is copied alongside, as the licence requires.
+
+Needs fontTools with WOFF2 support, which the app itself does not:
+
+    pip install "fonttools[woff]"
+    python subset_fonts.py ~/Downloads/fonts     # e.g. Inter-Regular.ttf, Poppins-SemiBold.ttf
+"""
+
+import argparse
+import glob
+import os
+import shutil
+
+from core.assets import STATIC_DIR
+from core.fonts import FONT_SETS, LATIN_UNICODE_RANGE, font_file
+
+FONTS_DIR = os.path.join(STATIC_DIR, "fonts")
+
+# Style names used in the upstream file names
+WEIGHT_NAMES = {
+    100: "Thin", 200: "ExtraLight", 300: "Light", 400: "Regular", 500: "Medium",
+    600: "SemiBold", 700: "Bold", 800: "ExtraBold", 900: "Black",
+}
+
+# Layout features worth keeping for UI text; everything else is dropped
+LAYOUT_FEATURES = ["kern", "liga", "calt", "ccmp", "locl", "mark", "mkmk", "tnum"]
+
+
+def required_faces():
+    """{family: weights} across every font set."""
+    faces = {}
+    for font_set in FONT_SETS.values():
+        for font in font_set.values():
+            if font:
+                faces.setdefault(font[0], set()).update(font[1])
+    return faces
+
+
+def find_source(source_dir, family, weight):
+    for ext in ("ttf", "otf"):
+        for name in (f"{family}-{WEIGHT_NAMES[weight]}.{ext}", f"{family}{WEIGHT_NAMES[weight]}.{ext}"):
+            matches = glob.glob(os.path.join(source_dir, "**", name), recursive=True)
+            if matches:
+                return matches[0]
+    return None
+
+
+def unicodes(unicode_range):
+    """Code points for a CSS unicode-range string."""
+    points = []
+    for part in unicode_range.split(","):
+        part = part.strip()[2:]
+        start, _, end = part.partition("-")
+        points.extend(range(int(start, 16), int(end or start, 16) + 1))
+    return points
+
+
+def subset_face(source, target):
+    from fontTools import subset
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = LAYOUT_FEATURES
+    options.name_IDs = [0, 1, 2, 3, 4, 5, 6]  # keep copyright/licence names
+    options.hinting = False
+    options.desubroutinize = True
+
+    font = subset.load_font(source, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=unicodes(LATIN_UNICODE_RANGE))
+    subsetter.subset(font)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    subset.save_font(font, target, options)
+
+
+def copy_licenses(source_dir):
+    for path in glob.glob(os.path.join(source_dir, "**", "*.txt"), recursive=True):
+        name = os.path.basename(path)
+        if name.upper().startswith(("OFL", "LICENSE")):
+            family = os.path.basename(os.path.dirname(path)) or "font"
+            shutil.copy(path, os.path.join(FONTS_DIR, f"{family}-{name}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Subset web fonts into static/fonts/ as WOFF2.")
+    parser.add_argument("source_dir", help="directory containing the upstream TTF/OTF files")
+    args = parser.parse_args()
+
+    os.makedirs(FONTS_DIR, exist_ok=True)
+    missing = []
+    print(f"{'face':<24} {'source KB':>10} {'woff2 KB':>9}")
+    for family, weights in sorted(required_faces().items()):
+        for weight in sorted(weights):
+            source = find_source(args.source_dir, family, weight)
+            if not source:
+                missing.append(f"{family} {weight}")
+                continue
+            target = os.path.join(STATIC_DIR, font_file(family, weight))
+            subset_face(source, target)
+            print(f"{family + ' ' + str(weight):<24} {os.path.getsize(source) / 1024:>10.1f} "
+                  f"{os.path.getsize(target) / 1024:>9.1f}")
+    copy_licenses(args.source_dir)
+    if missing:
+        print(f"\nNo source found for: {', '.join(missing)} (those faces fall back to system fonts)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Tests for archiving stale conversations
+"""
+
+import json
+import os
+from datetime import datetime
+
+import core.archive as archive
+import core.search as search
+import core.titles as titles
+from core.utils import migrate_conversation_ids
+
+
+def write_conversations(path, conversations):
+    path.write_text(json.dumps(conversations, indent=4))
+
+
+def test_archive_and_restore(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    memory_file = tmp_path / "conversations_me.json"
+    old = {
+        "id": "old",
+        "title": "Old chat",
+        "date": "January 01, 2024",
+        "messages": [{"sender": "user", "message": "hello " * 200, "time": "9:00 AM"}]
+    }
+    recent = {
+        "id": "new",
+        "title": "New chat",
+        "date": "June 10, 2024",
+        "updated_at": "2024-06-10T12:00:00",
+        "messages": [{"sender": "user", "message": "hi", "time": "9:00 AM"}]
+    }
+    write_conversations(memory_file, [recent, old])
+
+    report = archive.archive_stale_conversations(str(memory_file), days=30, now=datetime(2024, 6, 15))
+    assert report["archived"] == 1
+    assert report["hot_bytes_after"] < report["hot_bytes_before"]
+
+    hot = json.loads(memory_file.read_text())
+    assert hot[0]["messages"] == recent["messages"]
+    stub = hot[1]
+    assert stub["archived"] and stub["messages"] == [] and stub["message_count"] == 1
+
+    assert archive.restore_conversation(str(memory_file), stub)
+    assert stub["messages"] == old["messages"]
+    assert "archived" not in stub
+    # Kept until the caller has saved the restored conversation
+    assert os.path.exists(archive.get_archive_file(str(memory_file), "old"))
+    archive.delete_archive(str(memory_file), "old")
+    assert not os.path.exists(archive.get_archive_file(str(memory_file), "old"))
+
+
+def test_restore_missing_archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    stub = {"id": "gone", "title": "t", "date": "January 01, 2024", "archived": True, "messages": []}
+    assert not archive.restore_conversation(str(tmp_path / "conversations_me.json"), stub)
+    assert stub["archived"]
+
+
+def test_legacy_integer_ids_are_migrated(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(search, "SEARCH_DIR", str(tmp_path / "search"))
+    monkeypatch.setattr(titles, "TITLES_DIR", str(tmp_path / "titles"))
+    memory_file = str(tmp_path / "conversations_me.json")
+    live = {"id": 1, "title": "t", "date": "June 10, 2024",
+            "messages": [{"sender": "user", "message": "exam stress", "time": "9:00 AM"}]}
+    old = {"id": 0, "title": "t", "date": "January 01, 2024",
+           "messages": [{"sender": "user", "message": "garden walk", "time": "9:00 AM"}]}
+    stub = archive.archive_conversation(memory_file, old)
+    titles.save_titles(memory_file, {"1": "Exam worries"})
+    conversations = [live, stub, {"id": "abc", "title": "t", "date": "June 11, 2024", "messages": []}]
+
+    migrated = migrate_conversation_ids(memory_file, conversations, "me")
+    assert [old_id for old_id, _ in migrated] == [1, 0]
+    assert all(isinstance(c["id"], str) and len(c["id"]) == 32 for c in conversations[:2])
+    assert conversations[2]["id"] == "abc"
+    assert titles.load_titles(memory_file)[live["id"]] == "Exam worries"
+    assert [r["convo_id"] for r in search.search_messages("me", "garden")] == [stub["id"]]
+
+    # The archive copy follows the new id, so restoring keeps it
+    assert archive.restore_conversation(memory_file, stub)
+    assert stub["id"] == conversations[1]["id"] and stub["messages"] == old["messages"]
+    assert migrate_conversation_ids(memory_file, conversations, "me") == []
@@ -0,0 +1,28 @@
+import json
+import os
+
+from core.assets import get_asset_path, load_json, load_lottie, minify_lottie
+
+
+def test_load_json_is_cached_until_the_file_changes(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"a": 1}))
+    first = load_json(str(path))
+    assert first == {"a": 1}
+    assert load_json(str(path)) is first
+
+    path.write_text(json.dumps({"a": 2}))
+    os.utime(path, (0, os.path.getmtime(path) + 1))
+    assert load_json(str(path)) == {"a": 2}
+    assert load_json(str(tmp_path / "missing.json")) is None
+
+
+def test_minify_lottie():
+    data = {"meta": {"g": "LottieFiles"}, "fr": 24.0, "layers": [{"mn": "ADBE", "nm": "Head", "p": [0.123456, 2.0001]}]}
+    assert minify_lottie(data) == {"fr": 24, "layers": [{"nm": "Head", "p": [0.123, 2]}]}
+
+    # The shipped animation stays valid and gets smaller
+    animation = load_lottie("yoga_animation.json")
+    assert animation["layers"] and "meta" not in animation
+    with open(get_asset_path("yoga_animation.json"), "rb") as f:
+        assert len(json.dumps(animation, separators=(",", ":"))) < len(f.read())
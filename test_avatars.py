@@ -0,0 +1,39 @@
+import io
+import os
+
+from PIL import Image
+
+from core.avatars import AVATAR_SIZES, get_avatar_path, store_avatar
+from core.profiles import load_profile, save_profile
+
+
+def png_bytes(size):
+    buffered = io.BytesIO()
+    Image.new("RGB", size, (120, 80, 200)).save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+def test_store_avatar_is_content_addressed(tmp_path):
+    data = png_bytes((400, 300))
+    digest = store_avatar(data, str(tmp_path))
+    for size in AVATAR_SIZES:
+        with Image.open(get_avatar_path(digest, size, str(tmp_path))) as image:
+            assert image.format == "WEBP"
+            assert image.size == (size, size)
+
+    # Same bytes again: same hash, files left untouched
+    path = get_avatar_path(digest, AVATAR_SIZES[0], str(tmp_path))
+    mtime = os.path.getmtime(path)
+    assert store_avatar(data, str(tmp_path)) == digest
+    assert os.path.getmtime(path) == mtime
+    assert store_avatar(png_bytes((50, 50)), str(tmp_path)) != digest
+
+
+def test_profiles_round_trip(tmp_path):
+    db_path = str(tmp_path / "profiles.db")
+    assert load_profile("a@example.com", db_path)["avatar"] is None
+
+    profile = {"name": "Ada", "join_date": "May 2025", "font_size": "Large", "avatar": "0123456789abcdef"}
+    save_profile("a@example.com", profile, db_path)
+    assert load_profile("a@example.com", db_path) == profile
+    assert load_profile("b@example.com", db_path)["name"] == ""
@@ -0,0 +1,28 @@
+import os
+
+from streamlit.testing.v1 import AppTest
+
+from core.bootstrap import page_background_css, run_once
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_run_once_and_cached_page_css():
+    calls = []
+    run_once("test_setup", lambda: calls.append(1))
+    run_once("test_setup", lambda: calls.append(1))
+    assert calls == [1]
+
+    css = page_background_css(".stApp", "mint.png")
+    assert page_background_css(".stApp", "mint.png") is css
+    assert "mint" in css
+
+
+def test_login_only_page_stops_for_guests():
+    at = AppTest.from_file(os.path.join(ROOT, "pages", "Journaling.py"))
+    at.run()
+    assert len(at.warning) == 1 and not at.title
+
+    at.session_state["user_email"] = "guest@example.com"
+    at.run()
+    assert at.title[0].value == "📝 My Journal"
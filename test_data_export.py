@@ -0,0 +1,140 @@
+"""
+Tests for the NDJSON export/import round trip
+"""
+
+import json
+import sqlite3
+import sys
+
+import pytest
+
+import core.archive as archive
+import core.data_export as data_export
+import core.search as search
+
+
+def test_export_import_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    memory_file = tmp_path / "conversations_me.json"
+    live = {
+        "id": "live",
+        "title": "Today",
+        "date": "June 10, 2024",
+        "messages": [{"sender": "user", "message": "hi", "time": "9:00 AM"}]
+    }
+    old = {
+        "id": "old",
+        "title": "Old chat",
+        "date": "January 01, 2024",
+        "messages": [{"sender": "bot", "message": "hello again", "time": "8:00 AM"}]
+    }
+    stub = archive.archive_conversation(str(memory_file), old)
+    memory_file.write_text(json.dumps([live, stub]))
+    export_file = tmp_path / "export.ndjson"
+    records = data_export.iter_export_records(
+        str(memory_file), email="a@b.c",
+        journal_db=str(tmp_path / "none.db"),
+        focus_logs=[{"date": "2024-06-10", "duration": 25, "completed": True}]
+    )
+    assert data_export.write_export(str(export_file), records) == 6
+
+    conversations = [live]
+    focus_logs = []
+    journal_db = tmp_path / "journals.db"
+    with open(export_file, encoding="utf-8") as f:
+        counts = data_export.import_records(
+            data_export.iter_import_records(f), conversations,
+            email="a@b.c", focus_logs=focus_logs, journal_db=str(journal_db)
+        )
+
+    # The conversation that already exists is skipped, the archived one comes back whole
+    assert counts["conversation"] == 1
+    assert conversations[1]["messages"] == old["messages"]
+    assert focus_logs == [{"date": "2024-06-10", "duration": 25, "completed": True}]
+
+    # Importing the same file again adds nothing
+    with open(export_file, encoding="utf-8") as f:
+        counts = data_export.import_records(
+            data_export.iter_import_records(f), conversations,
+            email="a@b.c", focus_logs=focus_logs, journal_db=str(journal_db)
+        )
+    assert counts["conversation"] == counts["focus_log"] == 0
+    assert len(conversations) == 2 and len(focus_logs) == 1
+
+
+def test_journal_round_trip(tmp_path):
+    source_db = tmp_path / "source.db"
+    conn = sqlite3.connect(source_db)
+    conn.execute("CREATE TABLE journal_entries (id TEXT PRIMARY KEY, email TEXT, entry TEXT, sentiment TEXT, date TEXT)")
+    conn.executemany("INSERT INTO journal_entries VALUES (?, ?, ?, ?, ?)", [
+        ("j1", "a@b.c", "Good day", "Positive", "2024-06-10"),
+        ("j2", "a@b.c", "Rough night", "Negative", "2024-06-11"),
+        ("j3", "other@b.c", "Not mine", "Neutral", "2024-06-11"),
+    ])
+    conn.commit()
+    conn.close()
+
+    export_file = tmp_path / "export.ndjson"
+    records = data_export.iter_export_records(str(tmp_path / "none.json"), email="a@b.c", journal_db=str(source_db))
+    assert data_export.write_export(str(export_file), records) == 3
+
+    target_db = tmp_path / "target.db"
+    for _ in range(2):
+        with open(export_file, encoding="utf-8") as f:
+            counts = data_export.import_records(
+                data_export.iter_import_records(f), [], email="new@b.c", journal_db=str(target_db)
+            )
+        assert counts["journal_entry"] == 2
+
+    conn = sqlite3.connect(target_db)
+    rows = conn.execute("SELECT id, email, entry, sentiment, date FROM journal_entries ORDER BY date").fetchall()
+    conn.close()
+    # Imported under the importing account, once
+    assert rows == [
+        ("j1", "new@b.c", "Good day", "Positive", "2024-06-10"),
+        ("j2", "new@b.c", "Rough night", "Negative", "2024-06-11"),
+    ]
+
+
+def test_cli_import_saves_and_indexes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(search, "SEARCH_DIR", str(tmp_path / "search"))
+    export_file = tmp_path / "export.ndjson"
+    export_file.write_text("\n".join(json.dumps(record) for record in [
+        {"type": "header", "format": data_export.EXPORT_FORMAT, "version": 1},
+        {"type": "conversation", "id": "c1", "title": "Exams", "date": "June 10, 2024"},
+        {"type": "message", "conversation_id": "c1", "sender": "user", "message": "exam stress", "time": "9:00 AM"},
+        {"type": "mood_entry", "timestamp": "2024-06-10T09:00:00", "mood_level": "okay"},
+    ]))
+    monkeypatch.setattr(sys, "argv", ["data_export", "import", str(export_file), "--owner", "me"])
+    data_export.main()
+
+    saved = json.loads((tmp_path / "data" / "conversations_me.json").read_text())
+    assert [c["id"] for c in saved] == ["c1"]
+    assert [r["convo_id"] for r in search.search_messages("me", "exam")] == ["c1"]
+    assert not (tmp_path / "data" / "mood_data.json").exists()
+
+
+def test_import_rejects_invalid_lines():
+    header = json.dumps({"type": "header", "format": data_export.EXPORT_FORMAT, "version": 1})
+
+    with pytest.raises(data_export.ImportValidationError, match="Line 2"):
+        list(data_export.iter_import_records([header, '{"type": "message", "sender": "user"}']))
+    with pytest.raises(data_export.ImportValidationError, match="header missing"):
+        list(data_export.iter_import_records([json.dumps({"type": "focus_log", "date": "x", "duration": 1})]))
+    with pytest.raises(data_export.ImportValidationError, match="invalid JSON"):
+        list(data_export.iter_import_records([header, "{not json"]))
+
+    # Every field is type-checked, not just present
+    bad_header = json.dumps({"type": "header", "format": data_export.EXPORT_FORMAT, "version": "1"})
+    with pytest.raises(data_export.ImportValidationError, match="Line 1: header has an invalid version"):
+        list(data_export.iter_import_records([bad_header]))
+    for line, reason in [
+        ({"type": "focus_log", "date": "2024-06-10", "duration": True}, "invalid duration"),
+        ({"type": "message", "conversation_id": "c", "sender": "user", "message": None, "time": ""}, "invalid message"),
+        ({"type": "mood_entry", "timestamp": "yesterday", "mood_level": "okay"}, "invalid timestamp"),
+        ({"type": "mood_entry", "timestamp": "2024-06-10T09:00:00", "mood_level": 3}, "invalid mood_level"),
+        ({"type": "conversation", "id": "c", "title": "t", "date": "d", "updated_at": "soon"}, "invalid updated_at"),
+    ]:
+        with pytest.raises(data_export.ImportValidationError, match=reason):
+            list(data_export.iter_import_records([header, json.dumps(line)]))
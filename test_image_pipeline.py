@@ -0,0 +1,63 @@
+import os
+
+from PIL import Image
+
+from core.assets import background_image_css
+from optimize_images import run_pipeline
+
+
+def make_image(path, size, mode="RGB"):
+    color = (120, 80, 200, 128) if mode == "RGBA" else (120, 80, 200)
+    Image.new(mode, size, color).save(path)
+
+
+def test_pipeline_builds_variants_and_skips_unchanged(tmp_path):
+    source = tmp_path / "wide.png"
+    make_image(source, (1500, 1000))
+    output = tmp_path / "optimized"
+    manifest_path = str(output / "manifest.json")
+    sources = {"wide.png": (str(source), [640, 1280, 1920])}
+
+    manifest, rebuilt = run_pipeline(sources, str(output), manifest_path)
+    entry = manifest["images"]["wide.png"]
+    assert rebuilt == ["wide.png"]
+    # Never upscaled: 1920 is replaced by the source width
+    assert sorted({v["width"] for v in entry["variants"]}) == [640, 1280, 1500]
+    assert {v["format"] for v in entry["variants"]} == {"avif", "webp", "jpeg"}
+    for variant in entry["variants"]:
+        assert os.path.getsize(output / os.path.basename(variant["file"])) == variant["bytes"]
+
+    _, rebuilt = run_pipeline(sources, str(output), manifest_path)
+    assert rebuilt == []
+
+    make_image(source, (800, 600))
+    manifest, rebuilt = run_pipeline(sources, str(output), manifest_path)
+    assert rebuilt == ["wide.png"]
+    assert sorted(os.listdir(output)) == sorted(
+        ["manifest.json"] + [os.path.basename(v["file"]) for v in manifest["images"]["wide.png"]["variants"]]
+    )
+
+
+def test_transparent_images_fall_back_to_png(tmp_path):
+    source = tmp_path / "logo.png"
+    make_image(source, (300, 300), mode="RGBA")
+    manifest, _ = run_pipeline({"logo.png": (str(source), [192])}, str(tmp_path / "out"),
+                               str(tmp_path / "out" / "manifest.json"))
+    assert manifest["images"]["logo.png"]["formats"] == ["avif", "webp", "png"]
+
+
+def test_background_css_uses_image_set_per_width(tmp_path):
+    source = tmp_path / "bg.png"
+    make_image(source, (1500, 1000))
+    manifest, _ = run_pipeline({"bg.png": (str(source), [640, 1280, 1920])}, str(tmp_path / "out"),
+                               str(tmp_path / "out" / "manifest.json"))
+
+    css = background_image_css(".stApp", "bg.png", manifest)
+    rules = css.splitlines()
+    assert len(rules) == 3
+    assert rules[0].startswith(".stApp {") and "bg-1500.avif" in rules[0]
+    assert rules[1].startswith("@media (max-width: 1280px)") and "bg-1280.webp" in rules[1]
+    assert rules[2].startswith("@media (max-width: 640px)") and 'type("image/jpeg")' in rules[2]
+
+    # Images missing from the manifest keep a plain url() (or none)
+    assert background_image_css(".stApp", "missing.png", manifest) == ".stApp { background-image: none; }"
@@ -0,0 +1,92 @@
+"""
+Import-time budget for the login page and chat view.
+
+Runs ``python -X importtime`` in a fresh interpreter over the modules
+TalkHeal.py imports at the top level and checks that view-specific heavy
+dependencies stay out of cold start. Wall-clock time varies too much between
+machines to assert by default; the total is reported (pytest -rs), and is
+checked against a budget only when TALKHEAL_IMPORT_BUDGET_MS is set, e.g. on
+a known runner. Run this file directly for a report of the slowest imports:
+
+    python test_import_time.py
+"""
+
+import ast
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Modules only some views need; importing them at startup costs seconds
+HEAVY_MODULES = ["google.generativeai", "pandas", "plotly", "pygame", "geopy"]
+# Optional cold-start import budget on top of streamlit itself, in milliseconds
+IMPORT_BUDGET_MS = os.environ.get("TALKHEAL_IMPORT_BUDGET_MS")
+
+
+def startup_modules():
+    """Modules imported at the top level of TalkHeal.py."""
+    with open(os.path.join(ROOT, "TalkHeal.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            modules.append(node.module)
+    return modules
+
+
+def import_time_report(modules):
+    """
+    Imports ``modules`` after streamlit in a fresh interpreter and returns
+    {module: (self_us, cumulative_us)} for everything imported along the way.
+    """
+    code = "import streamlit\n" + "".join(f"import {m}\n" for m in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    report = {}
+    started = False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        if line.rstrip().endswith("| streamlit"):
+            started = True
+            continue
+        if not started:
+            continue
+        try:
+            self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+            report[name] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return report
+
+
+def test_startup_skips_heavy_modules():
+    report = import_time_report(startup_modules())
+    loaded = [name for name in report
+              if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY_MODULES)]
+    assert loaded == []
+
+
+def test_startup_import_budget():
+    report = import_time_report(startup_modules())
+    total_ms = sum(self_us for self_us, _ in report.values()) / 1000
+    if IMPORT_BUDGET_MS is None:
+        pytest.skip(f"startup imports took {total_ms:.0f} ms (set TALKHEAL_IMPORT_BUDGET_MS to enforce a budget)")
+    assert total_ms < float(IMPORT_BUDGET_MS), f"startup imports took {total_ms:.0f} ms"
+
+
+if __name__ == "__main__":
+    report = import_time_report(startup_modules())
+    total_ms = sum(self_us for self_us, _ in report.values()) / 1000
+    budget = f" (budget {IMPORT_BUDGET_MS} ms)" if IMPORT_BUDGET_MS else ""
+    print(f"Startup imports beyond streamlit: {total_ms:.0f} ms{budget}")
+    slowest = sorted(report.items(), key=lambda item: item[1][1], reverse=True)[:20]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{cumulative_us / 1000:8.1f} ms  {name}")
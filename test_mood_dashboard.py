@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from components.mood_dashboard import MoodTracker
 import json
+import pytest
 
 def test_mood_tracker():
     """Test the MoodTracker class functionality"""
@@ -49,5 +50,73 @@ def test_mood_tracker():
     print("• 📝 Contextual insights from notes")
     print("• 💭 Personalized recommendations")
 
+@pytest.fixture
+def session_state():
+    """An empty st.session_state for the test; the previous contents are restored afterwards."""
+    import streamlit as st
+
+    saved = st.session_state.to_dict()
+    st.session_state.clear()
+    yield st.session_state
+    st.session_state.clear()
+    st.session_state.update(saved)
+
+def test_mood_frame_is_typed_cached_and_appended(tmp_path, monkeypatch, session_state):
+    import components.mood_dashboard as mood_dashboard
+
+    monkeypatch.setattr(mood_dashboard, "MOOD_DATA_FILE", str(tmp_path / "mood_data.json"))
+    tracker = mood_dashboard.MoodTracker()
+    tracker.add_mood_entry("low", timestamp="2000-01-03T09:30:00")
+    tracker.add_mood_entry("great")
+
+    frame = tracker.get_mood_frame()
+    assert tracker.get_mood_frame() is frame
+    assert str(frame.index.dtype).startswith("datetime64") and frame.index.is_monotonic_increasing
+    assert frame["mood_level"].dtype == "category"
+    assert frame["mood_numeric"].tolist() == [2, 5]
+    assert (frame["hour"].iloc[0], frame["weekday"].iloc[0]) == (9, 0)
+
+    # Only the recent entry falls inside the window
+    assert tracker.get_mood_dataframe(30)["mood_level"].tolist() == ["great"]
+
+    # Replacing mood_data (e.g. after an import) rebuilds the frame
+    session_state.mood_data = session_state.mood_data[:1]
+    assert len(tracker.get_mood_frame()) == 1
+
+
+def test_empty_mood_store(tmp_path, monkeypatch, session_state):
+    import components.mood_dashboard as mood_dashboard
+
+    monkeypatch.setattr(mood_dashboard, "MOOD_DATA_FILE", str(tmp_path / "mood_data.json"))
+    tracker = mood_dashboard.MoodTracker()
+    session_state.mood_data = []
+    assert tracker.get_mood_dataframe(30).empty
+
+    # The first entry is appended to the empty frame
+    tracker.add_mood_entry("okay")
+    assert tracker.get_mood_dataframe(30)["mood_numeric"].tolist() == [3]
+
+
+def test_unreadable_mood_file_is_never_overwritten(tmp_path, monkeypatch, session_state):
+    import json
+    import components.mood_dashboard as mood_dashboard
+    from core.mood_store import SCHEMA_VERSION
+
+    path = tmp_path / "mood_data.json"
+    newer = json.dumps({"schema_version": SCHEMA_VERSION + 1, "entries": [{"mood_level": "good"}]})
+    path.write_text(newer)
+    monkeypatch.setattr(mood_dashboard, "MOOD_DATA_FILE", str(path))
+
+    tracker = mood_dashboard.MoodTracker()
+    assert tracker.load_error
+    assert tracker.add_mood_entry("okay") is False
+    assert path.read_text() == newer
+
+    # Saving resumes once the file reads cleanly again
+    path.write_text("[]")
+    assert tracker.add_mood_entry("okay") is True
+    assert len(json.loads(path.read_text())["entries"]) == 1
+
+
 if __name__ == "__main__":
-    test_mood_tracker()
\ No newline at end of file
+    test_mood_tracker()
@@ -0,0 +1,38 @@
+import json
+import os
+
+import pytest
+
+from core.mood_store import SCHEMA_VERSION, MoodStoreVersionError, load_mood_entries, read_mood_file
+
+LEGACY_ENTRIES = [
+    {"timestamp": "2024-06-10T09:00:00", "mood_level": "okay"},
+    {"timestamp": "2024-06-11T09:00:00", "mood_level": "good", "activities": "Exercise"},
+]
+
+
+def test_legacy_file_is_migrated_once(tmp_path):
+    path = tmp_path / "mood_data.json"
+    path.write_text(json.dumps(LEGACY_ENTRIES))
+
+    # Read-only callers migrate in memory and leave the file alone
+    entries = load_mood_entries(str(path), persist_migration=False)
+    assert [e["context_reason"] for e in entries] == ["No specific reason"] * 2
+    assert read_mood_file(str(path))[0] == 0
+
+    entries = load_mood_entries(str(path))
+    assert all(e["activities"] == [] for e in entries)
+    assert read_mood_file(str(path)) == (SCHEMA_VERSION, entries)
+
+    # Current-version loads are read-only
+    os.utime(path, (0, 0))
+    assert load_mood_entries(str(path)) == entries
+    assert os.path.getmtime(path) == 0
+
+
+def test_newer_schema_is_refused(tmp_path):
+    path = tmp_path / "mood_data.json"
+    path.write_text(json.dumps({"schema_version": SCHEMA_VERSION + 1, "entries": []}))
+    with pytest.raises(MoodStoreVersionError):
+        load_mood_entries(str(path))
+    assert load_mood_entries(str(tmp_path / "missing.json")) == []
@@ -0,0 +1,38 @@
+from streamlit.testing.v1 import AppTest
+
+import core.profiler as profiler
+
+
+def profiled_app():
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    from core.profiler import profile_span
+
+    st.session_state.profiling_enabled = True
+    if st.session_state.get("no_enqueue_hook"):
+        get_script_run_ctx()._enqueue = None
+    with profile_span("write"):
+        st.write("hello")
+
+
+def test_recording_needs_the_server_flag(monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILER_PANEL_ENABLED", False)
+    at = AppTest.from_function(profiled_app)
+    at.run()
+    assert "profiler_runs" not in at.session_state
+
+    monkeypatch.setattr(profiler, "PROFILER_PANEL_ENABLED", True)
+    at.run()
+    span = at.session_state["profiler_runs"][-1]["spans"][0]
+    assert span["name"] == "write" and span["elements"] == 1
+
+
+def test_timing_only_without_the_enqueue_hook(monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILER_PANEL_ENABLED", True)
+    at = AppTest.from_function(profiled_app)
+    at.session_state["no_enqueue_hook"] = True
+    at.run()
+    assert not at.exception
+    span = at.session_state["profiler_runs"][-1]["spans"][0]
+    assert span["ms"] >= 0 and span["elements"] is None
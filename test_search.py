@@ -0,0 +1,87 @@
+"""
+Tests for the conversation full-text search index
+"""
+
+import json
+
+import core.search as search
+
+
+def make_convo(convo_id, *messages):
+    return {
+        "id": convo_id,
+        "title": "Test",
+        "date": "January 01, 2025",
+        "messages": [{"sender": "user", "message": m, "time": "9:00 AM"} for m in messages]
+    }
+
+
+def test_index_and_search(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_DIR", str(tmp_path))
+    convo = make_convo("abc", "I feel anxious about my exam", "Slept badly again")
+    for msg in convo["messages"]:
+        search.index_message("owner1", convo, msg)
+
+    results = search.search_messages("owner1", "exam")
+    assert [r["convo_id"] for r in results] == ["abc"]
+    assert "**exam**" in results[0]["snippet"]
+
+    # Other owners never see these messages
+    assert search.search_messages("owner2", "exam") == []
+
+    search.remove_conversation("owner1", "abc")
+    assert search.search_messages("owner1", "exam") == []
+
+
+def test_search_requires_every_term(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_DIR", str(tmp_path))
+    convo = make_convo(1, "work stress", "family stress", "work was fine")
+    for msg in convo["messages"]:
+        search.index_message("me", convo, msg)
+
+    results = search.search_messages("me", "work stress")
+    assert len(results) == 1
+    assert results[0]["convo_id"] == "1"
+
+
+def test_query_syntax_is_escaped(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_DIR", str(tmp_path))
+    assert search.search_messages("me", '" OR NEAR(') == []
+    assert search.build_match_query(search.query_terms("Hello, World")) == '"hello" "world"'
+
+
+def test_rebuild_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_DIR", str(tmp_path / "search"))
+    memory_file = tmp_path / "conversations_1.2.3.4.json"
+    memory_file.write_text(json.dumps([
+        make_convo("a", "breathing helped today"),
+        make_convo("b", "could not sleep", "breathing again")
+    ]))
+
+    assert search.rebuild_index(str(tmp_path / "conversations_*.json")) == 3
+    results = search.search_messages("1.2.3.4", "breathing")
+    assert sorted(r["convo_id"] for r in results) == ["a", "b"]
+
+
+def test_rebuild_index_includes_archived_conversations(tmp_path, monkeypatch):
+    import core.archive as archive
+
+    monkeypatch.setattr(search, "SEARCH_DIR", str(tmp_path / "search"))
+    monkeypatch.setattr(archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    memory_file = tmp_path / "conversations_me.json"
+    stub = archive.archive_conversation(str(memory_file), make_convo("old", "breathing by the sea"))
+    memory_file.write_text(json.dumps([make_convo("new", "breathing at work"), stub]))
+
+    assert search.rebuild_index(str(memory_file)) == 2
+    assert sorted(r["convo_id"] for r in search.search_messages("me", "breathing")) == ["new", "old"]
+
+
+def test_indexing_without_fts5_is_a_no_op(monkeypatch):
+    def no_fts5(owner):
+        raise search.sqlite3.OperationalError("no such module: fts5")
+
+    monkeypatch.setattr(search, "_connect", no_fts5)
+    convo = make_convo("abc", "hello")
+    search.index_message("me", convo, convo["messages"][0])
+    search.remove_conversation("me", "abc")
+    assert search.search_messages("me", "hello") == []
@@ -0,0 +1,94 @@
+import copy
+
+from streamlit.testing.v1 import AppTest
+
+from core.theme import THEMES
+from css.styles import compile_css
+
+
+def test_compile_css_is_memoized_and_leaves_palettes_alone():
+    themes_before = copy.deepcopy(THEMES)
+
+    compiled = compile_css("Medium")
+    assert compile_css("Medium") is compiled
+    assert "font-size: 16px" in compiled.css
+    assert compile_css("Large").hash != compiled.hash
+    assert THEMES == themes_before
+
+
+def test_stylesheet_covers_every_theme():
+    css = compile_css("Medium").css
+    assert 'html[data-theme="calm-blue"] .stApp' in css and "blue-" in css
+    assert 'html[data-theme="dark"] .stApp' in css and "dark-" in css
+    # Published copies live in static/css/, so their URLs are relative to it
+    assert '"../optimized/' in compile_css("Medium", base="..").css
+
+
+def styled_app():
+    from css.styles import apply_custom_css
+
+    apply_custom_css()
+
+
+def stylesheet_sizes(at):
+    return [len(m.value) for m in at.markdown if "<style>" in m.value]
+
+
+def test_full_stylesheet_is_only_sent_when_its_hash_changes():
+    at = AppTest.from_function(styled_app)
+    at.run()
+    first = stylesheet_sizes(at)
+    assert len(first) == 2 and max(first) > 10_000
+
+    at.run()
+    assert len(stylesheet_sizes(at)) == 1 and stylesheet_sizes(at)[0] < 5_000
+
+    at.session_state["global_font_size"] = "Large"
+    at.run()
+    assert len(stylesheet_sizes(at)) == 2
+
+
+def switcher_app():
+    import streamlit as st
+    from components.theme_toggle import persist_theme_choice
+
+    persist_theme_choice(st.session_state.pop("reported_choice", {}))
+
+
+def test_switcher_choice_is_persisted_in_session_state():
+    at = AppTest.from_function(switcher_app)
+    at.session_state["palette_name"] = "Light"
+    at.session_state["reported_choice"] = {"dark_mode": False, "palette": "calm-blue"}
+    at.run()
+    assert at.session_state["palette_name"] == "Calm Blue"
+    assert at.session_state["dark_mode"] is False
+
+    at.session_state["reported_choice"] = {"dark_mode": True, "palette": "calm-blue"}
+    at.run()
+    assert at.session_state["dark_mode"] is True
+    assert at.session_state["palette_name"] == "Calm Blue"
+
+
+def test_fonts_are_self_hosted_with_swap(tmp_path, monkeypatch):
+    import core.assets
+    from core.fonts import font_face_css, preload_links
+
+    assert font_face_css("system") == "" and preload_links("system") == ""
+
+    monkeypatch.setattr(core.assets, "STATIC_DIR", str(tmp_path))
+    (tmp_path / "fonts").mkdir()
+    (tmp_path / "fonts" / "inter-400-latin.woff2").write_bytes(b"wOF2")
+
+    imports, rules = [], []
+    for line in font_face_css("default").splitlines():
+        (imports if line.startswith("@import") else rules).append(line)
+    # Faces with a file are declared locally, the rest still come from Google Fonts
+    assert len(rules) == 1
+    assert "font-family: 'Inter'" in rules[0] and "font-display: swap" in rules[0]
+    assert 'url("app/static/fonts/inter-400-latin.woff2?v=' in rules[0]
+    assert imports == [
+        "@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;600;700;800&display=swap');",
+        "@import url('https://fonts.googleapis.com/css2?family=Poppins:wght@500;600;700&display=swap');",
+    ]
+    assert font_face_css("default").startswith("@import")
+    assert preload_links("default").count('rel="preload"') == 1
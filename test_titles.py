@@ -0,0 +1,83 @@
+"""
+Tests for batched conversation title generation
+"""
+
+import json
+import threading
+
+import core.titles as titles
+
+
+class FakeModel:
+    def __init__(self):
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        count = prompt.count("### Conversation")
+
+        class Response:
+            text = "```json\n" + json.dumps({str(n): f"Title {n}" for n in range(1, count + 1)}) + "\n```"
+        return Response()
+
+
+def make_convo(convo_id, message_count):
+    return {
+        "id": convo_id,
+        "title": "first words...",
+        "date": "January 01, 2025",
+        "messages": [{"sender": "user" if i % 2 == 0 else "bot", "message": f"m{i}", "time": ""}
+                     for i in range(message_count)]
+    }
+
+
+def test_generate_titles_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(titles, "TITLES_DIR", str(tmp_path / "titles"))
+    (tmp_path / "conversations_a.json").write_text(json.dumps([make_convo("1", 2), make_convo("2", 1)]))
+    (tmp_path / "conversations_b.json").write_text(json.dumps([make_convo(str(n), 2) for n in range(3, 6)]))
+    pattern = str(tmp_path / "conversations_*.json")
+
+    model = FakeModel()
+    assert titles.generate_titles(model, pattern, batch_size=2) == 4
+    assert len(model.prompts) == 2
+
+    saved = titles.load_titles(str(tmp_path / "conversations_a.json"))
+    assert saved == {"1": "Title 1"}
+    assert titles.get_display_title(make_convo("2", 1), saved) == "first words..."
+
+    # Nothing left to title on the next run
+    assert titles.collect_untitled(pattern) == []
+
+
+def test_parse_titles_tolerates_bad_replies():
+    assert titles.parse_titles("no json here", 2) == [None, None]
+    assert titles.parse_titles('{"1": "Calm evening", "2": ""}', 2) == ["Calm evening", None]
+
+
+def test_title_worker_survives_a_failed_pass(monkeypatch):
+    passes = []
+    stop = threading.Event()
+
+    def flaky_generate_titles(model):
+        passes.append(model)
+        if len(passes) == 1:
+            raise json.JSONDecodeError("Expecting value", "", 0)
+        stop.set()
+
+    monkeypatch.setattr(titles, "generate_titles", flaky_generate_titles)
+    worker = titles.start_title_worker("model", interval=0, stop_event=stop)
+    worker.join(5)
+    assert not worker.is_alive()
+    assert len(passes) == 2
+
+
+def test_failed_batches_are_logged(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(titles, "TITLES_DIR", str(tmp_path / "titles"))
+    (tmp_path / "conversations_a.json").write_text(json.dumps([make_convo("1", 2)]))
+
+    class BrokenModel:
+        def generate_content(self, prompt):
+            raise RuntimeError("API key not valid")
+
+    assert titles.generate_titles(BrokenModel(), str(tmp_path / "conversations_*.json")) == 0
+    assert "API key not valid" in caplog.text